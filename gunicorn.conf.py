@@ -0,0 +1,24 @@
+"""gunicorn settings for serving nums_api, e.g.:
+
+    gunicorn --config gunicorn.conf.py nums_api:app
+"""
+
+import os
+
+
+def post_worker_init(worker):
+    """Load the in-memory fact caches before the worker takes requests."""
+
+    from nums_api.cache.base import warm_caches
+
+    with worker.wsgi.app_context():
+        warm_caches()
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's live gauges from the shared metrics."""
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,49 +1,81 @@
-from flask import Flask, request
+from flask import Flask
 from flask_cors import CORS
 
-from nums_api.config import DATABASE_URL
+from nums_api.config import (
+    DATABASE_URL,
+    SQLALCHEMY_ECHO,
+    REQUEST_TIMING,
+    SLOW_QUERY_MS,
+    SLOW_QUERY_LOG_INTERVAL,
+    FACT_CACHE_MAX_AGE,
+    FACT_INDEX_MAX_BYTES,
+    MAX_BATCH_SIZE,
+    LIKE_FLUSH_INTERVAL,
+    TRENDING_HALF_LIFE,
+    LIKE_ROLLUP_INTERVAL,
+    RATELIMIT_STORAGE_URI,
+    RATELIMIT_STRATEGY,
+    RATELIMIT_API,
+    RATELIMIT_DEFAULT,
+)
 from nums_api.database import connect_db
 from nums_api.trivia.routes import trivia
 from nums_api.maths.routes import math
 from nums_api.dates.routes import dates
 from nums_api.years.routes import years
 from nums_api.root.routes import root
-from nums_api.limiter import limiter
+from nums_api.random_facts.routes import random_facts
+from nums_api.limiter import limiter, api_rate_limit
+from nums_api.timing import request_timing
+from nums_api.metrics import metrics, metrics_route
+from nums_api.slow_queries import slow_query_log
+from nums_api.batch import BatchConverter, DateBatchConverter
 
 # create app and add configuration
 app = Flask(__name__)
 app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.config["SQLALCHEMY_ECHO"] = True
+app.config["SQLALCHEMY_ECHO"] = SQLALCHEMY_ECHO
+app.config["REQUEST_TIMING"] = REQUEST_TIMING
+app.config["SLOW_QUERY_MS"] = SLOW_QUERY_MS
+app.config["SLOW_QUERY_LOG_INTERVAL"] = SLOW_QUERY_LOG_INTERVAL
+app.config["FACT_CACHE_MAX_AGE"] = FACT_CACHE_MAX_AGE
+app.config["FACT_INDEX_MAX_BYTES"] = FACT_INDEX_MAX_BYTES
+app.config["MAX_BATCH_SIZE"] = MAX_BATCH_SIZE
+app.config["LIKE_FLUSH_INTERVAL"] = LIKE_FLUSH_INTERVAL
+app.config["TRENDING_HALF_LIFE"] = TRENDING_HALF_LIFE
+app.config["LIKE_ROLLUP_INTERVAL"] = LIKE_ROLLUP_INTERVAL
+app.config["RATELIMIT_STORAGE_URI"] = RATELIMIT_STORAGE_URI
+app.config["RATELIMIT_STRATEGY"] = RATELIMIT_STRATEGY
+app.config["RATELIMIT_API"] = RATELIMIT_API
+app.config["RATELIMIT_DEFAULT"] = RATELIMIT_DEFAULT
+
+# converters must be in place before blueprints add their routes
+app.url_map.converters["batch"] = BatchConverter
+app.url_map.converters["datebatch"] = DateBatchConverter
 
 # register blueprints
 app.register_blueprint(trivia, url_prefix="/api/trivia")
 app.register_blueprint(math, url_prefix="/api/math")
 app.register_blueprint(dates, url_prefix="/api/dates")
 app.register_blueprint(years, url_prefix="/api/years")
+app.register_blueprint(random_facts, url_prefix="/api/random")
 app.register_blueprint(root, url_prefix="/")
 
-limiter.init_app(app)
-
+# every fact API route gets its own RATELIMIT_API counter per client; the
+# docs page is exempt (static files are never limited)
+for blueprint in (trivia, math, dates, years, random_facts):
+    limiter.limit(api_rate_limit)(blueprint)
+limiter.exempt(root)
 
-def is_testing_env():
-    """ Return bool of whether config['TESTING'] is true """
-    return app.config["TESTING"]
-
-
-@app.before_request
-def set_API_rate_limit():
-    """ Setting API rate limit for each route
-        Per endpoint, limit is 200 per day.
-        When in a testing environment, per endpoint, limit is 5 per minute
-    """
-    if not is_testing_env():
-        if request.path != '/':
-            limiter.limit("200 per day")(lambda: None)()
-    else:
-        if request.path != '/':
-            limiter.limit("5 per minute")(lambda: None)()
+# scraped every few seconds, so not limited either
+limiter.exempt(metrics_route)
 
+# before the limiter, so its rejections are timed too
+metrics.init_app(app)
+limiter.init_app(app)
+request_timing.init_app(app)
+slow_query_log.init_app(app)
 
 # allow CORS and connect app to database
 CORS(app)
@@ -0,0 +1,108 @@
+from decimal import Decimal, InvalidOperation
+
+from flask import current_app
+from werkzeug.routing import BaseConverter
+
+# digits a Postgres numeric can have before and after the decimal point
+NUMERIC_MAX_DIGITS = 131072
+NUMERIC_MAX_SCALE = 16383
+
+
+class BatchConverter(BaseConverter):
+    """Matches a list of numbers and ranges like "1,2,3" or "1..10,20".
+
+    A single number doesn't match, so it's left to the single lookup routes.
+    Weighted like the int converter, so it's tried before a plain string
+    rule such as math's "/<number>".
+    """
+
+    regex = r"[^/]*(?:,|\.\.)[^/]*"
+    weight = 50
+
+
+class DateBatchConverter(BaseConverter):
+    """Matches a list of dates and ranges like "1/1,2/14" or "1/1..1/31"."""
+
+    regex = r"\d+/\d+(?:(?:,|\.\.)\d+/\d+)+"
+    part_isolating = False
+
+
+def parse_int(item):
+    """Parse one batch item as an integer."""
+
+    try:
+        return int(item)
+    except ValueError:
+        raise ValueError(f"{item} is not an integer")
+
+
+def parse_decimal(item):
+    """Parse one batch item as an exact, finite decimal number.
+
+    Unlike float(), "0.1" is exactly 0.1 and "nan"/"inf" are rejected.
+    """
+
+    try:
+        number = Decimal(item)
+    except InvalidOperation:
+        raise ValueError(f"{item} is not an integer or decimal")
+
+    if not number.is_finite():
+        raise ValueError(f"{item} is not a finite number")
+
+    # beyond what a Postgres numeric can hold
+    if (
+        number.adjusted() >= NUMERIC_MAX_DIGITS or
+        number.as_tuple().exponent < -NUMERIC_MAX_SCALE
+    ):
+        raise ValueError(f"{item} is out of range")
+
+    return number
+
+
+def format_keys(keys):
+    """Return list of the labels of keys, for parse_batch."""
+
+    return [str(key) for key in keys]
+
+
+def parse_batch(spec, parse_key, format_keys=format_keys):
+    """Parse a batch spec into a dict of label -> key, in request order.
+
+    spec is comma separated; each item is a key, or a range of keys written
+    "start..end" (inclusive). parse_key turns one item into a key and raises
+    ValueError if it's invalid. Range endpoints must parse to whole numbers;
+    the keys in a range are labelled all at once by format_keys, which
+    takes the range and returns a list of labels.
+
+    Raises ValueError for invalid items and for batches bigger than
+    MAX_BATCH_SIZE.
+
+        >>> parse_batch("1..3,7", int)
+        {'1': 1, '2': 2, '3': 3, '7': 7}
+    """
+
+    max_size = current_app.config["MAX_BATCH_SIZE"]
+    keys = {}
+
+    for item in spec.split(","):
+        if ".." in item:
+            (start, end) = (parse_key(part) for part in item.split("..", 1))
+
+            whole = float(start).is_integer() and float(end).is_integer()
+            if not whole or start > end:
+                raise ValueError(f"{item} is an invalid range")
+
+            # check before expanding, so "1..1000000000" isn't built
+            if len(keys) + end - start + 1 > max_size:
+                raise ValueError(f"Batch exceeds {max_size} keys")
+
+            expanded = range(int(start), int(end) + 1)
+            keys.update(zip(format_keys(expanded), expanded))
+        else:
+            keys[item] = parse_key(item)
+
+        if len(keys) > max_size:
+            raise ValueError(f"Batch exceeds {max_size} keys")
+
+    return keys
@@ -0,0 +1,106 @@
+"""Benchmark converting between dates and days of the year.
+
+Compares the conversions Date used to do (rebuilding dicts on every call,
+walking the months) against the precomputed tables, one call at a time and
+batched. Doesn't touch the database.
+
+    python -m nums_api.benchmarks.bench_dates
+"""
+
+import timeit
+
+from nums_api.dates.models import Date, MONTH_AND_DAY
+
+DAYS_OF_YEAR = list(range(1, 367))
+DATES = MONTH_AND_DAY[1:]
+ROUNDS = 200
+
+
+def old_date_to_day_of_year(month, day):
+    """Date.date_to_day_of_year before the lookup tables."""
+
+    valid_days_for_months = {
+        1: 31, 2: 29, 3: 31, 4: 30, 5: 31, 6: 30,
+        7: 31, 8: 31, 9: 30, 10: 31, 11: 30, 12: 31,
+    }
+    month_to_first_day_of_year = {
+        1: 1, 2: 32, 3: 61, 4: 92, 5: 122, 6: 153,
+        7: 183, 8: 214, 9: 245, 10: 275, 11: 306, 12: 336,
+    }
+
+    if not(isinstance(month, int) and isinstance(day, int)):
+        raise TypeError("Invalid data types")
+    if not valid_days_for_months.get(month, None):
+        raise ValueError(f"{month} is an invalid month")
+    if day > valid_days_for_months[month] or day < 1:
+        raise ValueError(f"{day} is an invalid day")
+
+    return month_to_first_day_of_year[month] + day - 1
+
+
+def old_date_from_day_of_year(day_of_year):
+    """Date.date_from_day_of_year before the lookup tables."""
+
+    day_of_year_to_month = {
+        1: 1, 32: 2, 61: 3, 92: 4, 122: 5, 153: 6,
+        183: 7, 214: 8, 245: 9, 275: 10, 306: 11, 336: 12,
+    }
+
+    if not isinstance(day_of_year, int):
+        raise TypeError("Invalid data type")
+    if day_of_year < 1 or day_of_year > 366:
+        raise ValueError(f"{day_of_year} is out of range")
+
+    first_of_each_month = list(day_of_year_to_month.keys())
+
+    for index, first in enumerate(first_of_each_month):
+        month = day_of_year_to_month[first]
+        day = day_of_year + 1 - first_of_each_month[index]
+
+        if day_of_year is first:
+            return (month, 1)
+        if index is len(day_of_year_to_month) - 1:
+            return (month, day)
+        if day_of_year > first and day_of_year < first_of_each_month[index+1]:
+            return (month, day)
+
+
+def conversions_per_second(func):
+    """Return how many dates func converts per second, all 366 per run."""
+
+    seconds = min(timeit.repeat(func, number=ROUNDS, repeat=5))
+    return len(DAYS_OF_YEAR) * ROUNDS / seconds
+
+
+def main():
+    cases = [
+        (
+            "date -> day of year, old",
+            lambda: [old_date_to_day_of_year(m, d) for (m, d) in DATES],
+        ),
+        (
+            "date -> day of year, table",
+            lambda: [Date.date_to_day_of_year(m, d) for (m, d) in DATES],
+        ),
+        (
+            "day of year -> date, old",
+            lambda: [old_date_from_day_of_year(n) for n in DAYS_OF_YEAR],
+        ),
+        (
+            "day of year -> date, table",
+            lambda: [Date.date_from_day_of_year(n) for n in DAYS_OF_YEAR],
+        ),
+        (
+            "day of year -> date, batched",
+            lambda: Date.dates_from_days_of_year(DAYS_OF_YEAR),
+        ),
+    ]
+
+    print(f"{'conversion':<32} {'per second':>14}")
+
+    for (name, func) in cases:
+        print(f"{name:<32} {conversions_per_second(func):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark rate limit checks: per storage, and per request.
+
+First compares a limit check against memory:// (per process) and the shared
+SQLite file, for the fixed and moving window strategies. Each hit is a new
+client, like a stream of requests from many addresses. Uses a throwaway
+file, not the app's.
+
+Then measures what limiting adds to a request through a small Flask app:
+no limiter, a limit built by a before_request hook on every request (how
+the app used to do it), and a limit declared once on the blueprint.
+
+    python -m nums_api.benchmarks.bench_limiter
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from flask import Blueprint, Flask
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter
+
+# importing it registers the sqlite:// scheme
+import nums_api.limiter_storage  # noqa: F401
+
+HITS = 5000
+ITEM = RateLimitItemPerMinute(200)
+REQUESTS = 2000
+
+# high enough that no benchmark request is turned away
+REQUEST_LIMIT = "1000000 per day"
+
+
+def microseconds_per_hit(limiter):
+    """Return the mean microseconds of limiter.hit, over HITS clients."""
+
+    start = time.perf_counter()
+
+    for client in range(HITS):
+        limiter.hit(ITEM, str(client))
+
+    return (time.perf_counter() - start) / HITS * 1e6
+
+
+def make_app(limiting):
+    """Return a Flask app with one route, limited as limiting says."""
+
+    app = Flask(__name__)
+    app.config["RATELIMIT_STORAGE_URI"] = "memory://"
+    api = Blueprint("api", __name__)
+
+    @api.get("/fact")
+    def fact():
+        return {"fact": "is a number"}
+
+    if limiting == "declared":
+        limiter = Limiter(key_func=get_remote_address)
+        limiter.limit(REQUEST_LIMIT)(api)
+        limiter.init_app(app)
+    elif limiting == "per request":
+        # default limits checked too, as they were, but as high as the other
+        limiter = Limiter(
+            key_func=get_remote_address,
+            default_limits=[REQUEST_LIMIT, "1000000 per hour"],
+        )
+
+        @app.before_request
+        def set_rate_limit():
+            limiter.limit(REQUEST_LIMIT)(lambda: None)()
+
+        limiter.init_app(app)
+
+    app.register_blueprint(api)
+    return app
+
+
+def microseconds_per_request(app):
+    """Return the mean microseconds of a GET /fact, over REQUESTS."""
+
+    client = app.test_client()
+    client.get("/fact")
+    start = time.perf_counter()
+
+    for _ in range(REQUESTS):
+        client.get("/fact")
+
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def storages():
+    with tempfile.TemporaryDirectory() as directory:
+        uris = [
+            ("memory", "memory://"),
+            ("sqlite", f"sqlite:///{Path(directory) / 'limits.sqlite3'}"),
+        ]
+        strategies = [
+            ("fixed-window", FixedWindowRateLimiter),
+            ("moving-window", MovingWindowRateLimiter),
+        ]
+
+        print(f"{'storage':<10} {'strategy':<16} {'us per hit':>12}")
+
+        for (name, uri) in uris:
+            for (strategy, limiter_class) in strategies:
+                storage = storage_from_string(uri)
+                storage.reset()
+                limiter = limiter_class(storage)
+
+                print(
+                    f"{name:<10} {strategy:<16} "
+                    f"{microseconds_per_hit(limiter):>12.1f}"
+                )
+
+
+def requests():
+    print(f"{'limiting':<16} {'us per request':>16}")
+
+    for limiting in ["none", "per request", "declared"]:
+        app = make_app(limiting)
+        print(f"{limiting:<16} {microseconds_per_request(app):>16.1f}")
+
+
+def main():
+    storages()
+    print()
+    requests()
+
+
+if __name__ == "__main__":
+    main()
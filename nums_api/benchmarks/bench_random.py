@@ -0,0 +1,93 @@
+"""Benchmark picking a random fact as the years table grows.
+
+Compares loading the whole table and calling random.choice (what the random
+routes used to do) against RandomFactSampler. Runs against the test database,
+which it wipes.
+
+    python -m nums_api.benchmarks.bench_random
+"""
+
+import random
+import time
+
+from sqlalchemy import insert
+
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.years.models import Year, YearLikeCounter
+from nums_api.cache.sampler import RandomFactSampler
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["SQLALCHEMY_ECHO"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+TABLE_SIZES = [1_000, 10_000, 100_000]
+
+
+def seed_years(start, stop):
+    """Insert fake year facts numbered start..stop-1."""
+
+    rows = [
+        {
+            "year": n % 2100,
+            "fact_fragment": f"the year of benchmark fact {n}",
+            "fact_statement": f"{n % 2100} is the year of benchmark fact {n}.",
+            "was_submitted": False,
+        }
+        for n in range(start, stop)
+    ]
+    db.session.execute(insert(Year.__table__), rows)
+    db.session.commit()
+
+
+def time_per_call(func, calls):
+    """Return the mean seconds per call of func over calls runs.
+
+    The session is thrown away after each call, like at the end of a request,
+    so nothing is served from the identity map.
+    """
+
+    start = time.perf_counter()
+    for i in range(calls):
+        func()
+        db.session.remove()
+    return (time.perf_counter() - start) / calls
+
+
+def load_all_and_choose():
+    return random.choice(Year.query.all())
+
+
+def main():
+    YearLikeCounter.query.delete()
+    Year.query.delete()
+    db.session.commit()
+
+    sampler = RandomFactSampler(Year)
+
+    print(f"{'rows':>10} {'query.all() ms':>16} {'sampler ms':>12}")
+
+    seeded = 0
+    for size in TABLE_SIZES:
+        seed_years(seeded, size)
+        seeded = size
+        sampler.invalidate()
+        sampler.ensure_loaded()
+
+        old = time_per_call(load_all_and_choose, 5)
+        new = time_per_call(sampler.sample, 1000)
+
+        print(f"{size:>10} {old * 1000:>16.3f} {new * 1000:>12.3f}")
+
+    YearLikeCounter.query.delete()
+    Year.query.delete()
+    db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""Benchmark every route and the loader, through the test client and a
+real server, at one or more database sizes.
+
+For each of --rows, wipes the test database and loads it through the ingest
+path (facts_dump.scripts.dump_data) with a synthetic corpus of that many
+facts per category (see facts_dump/synthetic.py), timing the load. Then
+sends each of ENDPOINTS --requests times, one request at a time:
+
+- "client": through Flask's test client, so just the app;
+- "server": over HTTP to the app in werkzeug's threaded WSGI server, on a
+  kept-alive connection, so request parsing and sockets count too.
+
+and prints each route's requests per second and latency percentiles, so
+several sizes give each route's scaling curve. With --save the results
+become the baseline; with --check each route's median (and the loader's
+rows per second) is compared to the baseline's at the same size, and the
+run exits with status 1 if any is more than --threshold worse.
+
+Baselines only mean something on the machine that made them, so none is
+committed: on a fresh checkout (or a new CI machine) run with --save first,
+on the machine that will --check, at the same --rows, and keep the file
+(BASELINE_PATH by default, or --baseline) between runs.
+
+    python -m nums_api.benchmarks.bench_routes --rows 10000 100000 --save
+    python -m nums_api.benchmarks.bench_routes --rows 10000 100000 --check
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import select
+from werkzeug.serving import make_server
+
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.maths.models import Math
+from nums_api.trivia.models import Trivia
+from nums_api.years.models import Year
+from nums_api.dates.models import MONTH_AND_DAY
+from nums_api.cache.base import invalidate_caches
+from nums_api.facts_dump import synthetic
+from nums_api.facts_dump.scripts import CATEGORIES, dump_data
+from nums_api.__init__ import limiter
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["SQLALCHEMY_ECHO"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+BASELINE_PATH = Path(__file__).with_name("bench_routes_baseline.json")
+PERCENTILES = (50, 90, 99)
+WARMUP_REQUESTS = 20
+
+# (month, day) of every day of the year
+DATES = MONTH_AND_DAY[1:]
+
+# how many of each category's keys the endpoints pick from
+SAMPLED_KEYS = 10_000
+
+# (name, method, path(rng, keys)), keys being the loaded ones, see load()
+ENDPOINTS = [
+    ("root", "GET", lambda rng, k: "/"),
+    ("trivia lookup", "GET",
+     lambda rng, k: f"/api/trivia/{rng.choice(k['trivia'])}"),
+    ("trivia miss", "GET",
+     lambda rng, k: f"/api/trivia/{k['trivia_miss'] + rng.randrange(100)}"),
+    ("trivia batch", "GET", lambda rng, k: batch_path(rng, k)),
+    ("trivia random", "GET", lambda rng, k: "/api/trivia/random"),
+    ("trivia top", "GET", lambda rng, k: "/api/trivia/top"),
+    ("trivia trending", "GET", lambda rng, k: "/api/trivia/trending"),
+    ("trivia like", "POST",
+     lambda rng, k: f"/api/trivia/like/{rng.choice(k['trivia_ids'])}"),
+    ("math lookup", "GET",
+     lambda rng, k: f"/api/math/{rng.choice(k['math'])}"),
+    ("math random", "GET", lambda rng, k: "/api/math/random"),
+    ("year lookup", "GET",
+     lambda rng, k: f"/api/years/{rng.choice(k['years'])}"),
+    ("year random", "GET", lambda rng, k: "/api/years/random"),
+    ("date lookup", "GET",
+     lambda rng, k: "/api/dates/{0}/{1}".format(*rng.choice(DATES))),
+    ("date random", "GET", lambda rng, k: "/api/dates/random"),
+    ("random", "GET", lambda rng, k: "/api/random"),
+]
+
+
+def batch_path(rng, keys):
+    """Return the path of a batch lookup of 10 trivia numbers."""
+
+    first = rng.choice(keys["trivia"])
+    return f"/api/trivia/{first}..{first + 9}"
+
+
+def wipe():
+    for table in reversed(db.metadata.sorted_tables):
+        db.session.execute(table.delete())
+    db.session.commit()
+
+
+def sample(column):
+    """Return list of up to SAMPLED_KEYS distinct values of column."""
+
+    return db.session.execute(
+        select(column).distinct().limit(SAMPLED_KEYS)
+    ).scalars().all()
+
+
+def load(rows):
+    """Wipe the database and load a synthetic corpus of rows facts per
+    category through the ingest path.
+
+    Returns (loader result like measure()'s, keys the endpoints pick from).
+    """
+
+    wipe()
+
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic.write_dumps(directory, CATEGORIES, facts=rows)
+
+        start = time.perf_counter()
+        inserted = dump_data(
+            CATEGORIES,
+            database_url=DATABASE_URL_TEST,
+            force=True,
+            directory=directory,
+        )
+        elapsed = time.perf_counter() - start
+
+    # the workers loaded it in other processes, so ours can't know
+    for mapper in db.Model.registry.mappers:
+        invalidate_caches(mapper.class_)
+
+    trivia = sample(Trivia.number)
+    keys = {
+        "trivia": trivia,
+        "trivia_miss": max(trivia) + 1,
+        "trivia_ids": sample(Trivia.id),
+        "math": sample(Math.number),
+        "years": sample(Year.year),
+    }
+    loaded = {"rps": round(sum(inserted.values()) / elapsed, 1)}
+
+    return (loaded, keys)
+
+
+def client_sender():
+    client = app.test_client()
+
+    def send(method, path):
+        return client.open(path, method=method).status_code
+
+    return send
+
+
+def server_sender(port):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+
+    def send(method, path):
+        connection.request(method, path)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+
+    return send
+
+
+def percentile(latencies, p):
+    """Return the p-th percentile of the sorted latencies (nearest rank)."""
+
+    return latencies[min(len(latencies) - 1, len(latencies) * p // 100)]
+
+
+def measure(send, method, path_for, requests):
+    """Return dict of requests per second and latency percentiles (ms)."""
+
+    rng = random.Random(0)
+
+    for _ in range(WARMUP_REQUESTS):
+        send(method, path_for(rng))
+
+    latencies = []
+    start = time.perf_counter()
+
+    for _ in range(requests):
+        path = path_for(rng)
+        sent = time.perf_counter()
+        status = send(method, path)
+        latencies.append(time.perf_counter() - sent)
+
+        if status >= 500:
+            raise RuntimeError(f"{method} {path} answered {status}")
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    return {
+        "rps": round(requests / elapsed, 1),
+        **{
+            f"p{p}_ms": round(percentile(latencies, p) * 1000, 3)
+            for p in PERCENTILES
+        },
+    }
+
+
+def run(sizes, requests):
+    """Load each size of corpus and time the loader and every endpoint both
+    ways.
+
+    Returns dict of "<rows> loader" -> load() result and
+    "<rows> <driver> <endpoint>" -> measure() result.
+    """
+
+    limiter.enabled = False
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    results = {}
+
+    try:
+        for rows in sizes:
+            (loaded, keys) = load(rows)
+            results[f"{rows} loader"] = loaded
+
+            print(
+                f"\n{rows} facts per category, "
+                f"loaded at {loaded['rps']:.0f} rows/s\n"
+                f"{'route':<24} {'req/s':>9} "
+                + " ".join(f"{f'p{p} ms':>9}" for p in PERCENTILES)
+            )
+
+            drivers = [
+                ("client", client_sender()),
+                ("server", server_sender(server.server_port)),
+            ]
+
+            for (driver, send) in drivers:
+                for (name, method, path) in ENDPOINTS:
+                    result = measure(
+                        send, method, lambda rng: path(rng, keys), requests
+                    )
+                    results[f"{rows} {driver} {name}"] = result
+
+                    print(
+                        f"{f'{driver} {name}':<24} {result['rps']:>9.1f} "
+                        + " ".join(
+                            f"{result[f'p{p}_ms']:>9.3f}"
+                            for p in PERCENTILES
+                        )
+                    )
+    finally:
+        server.shutdown()
+        wipe()
+
+    return results
+
+
+def regressions(results, baseline, threshold):
+    """Return list of (name, measure, baseline value, value) for routes
+    whose median latency is more than threshold (a fraction) above the
+    baseline's, and loads whose rows per second are that much below it.
+
+    Results missing from the baseline (e.g. other sizes) are skipped.
+    """
+
+    worse = []
+
+    for (name, result) in results.items():
+        before = baseline.get(name)
+
+        if not before:
+            continue
+
+        if "p50_ms" in result:
+            if result["p50_ms"] > before["p50_ms"] * (1 + threshold):
+                worse.append(
+                    (name, "p50 ms", before["p50_ms"], result["p50_ms"])
+                )
+        elif result["rps"] * (1 + threshold) < before["rps"]:
+            worse.append((name, "rows/s", before["rps"], result["rps"]))
+
+    return worse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark every route, against the test database."
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000],
+                        help="facts loaded per category; several sizes "
+                             "give scaling curves (default: 10000)")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="requests timed per route (default: 500)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true",
+                        help="store the results as the baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="fail if a route or the loader is slower "
+                             "than the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="slowdown that fails --check "
+                             "(default: 0.25, i.e. 25%%)")
+    args = parser.parse_args()
+
+    rows = " ".join(str(size) for size in args.rows)
+    save_command = (
+        f"python -m nums_api.benchmarks.bench_routes --rows {rows} --save"
+    )
+
+    if args.baseline != BASELINE_PATH:
+        save_command += f" --baseline {args.baseline}"
+
+    if args.check:
+        if not args.baseline.exists():
+            parser.error(
+                f"no baseline at {args.baseline}. Baselines only mean "
+                f"something on the machine that made them, so none is "
+                f"committed; make one on this machine first with\n\n"
+                f"    {save_command}"
+            )
+
+        stored = json.loads(args.baseline.read_text())
+        unsaved = [
+            size for size in args.rows
+            if f"{size} loader" not in stored["results"]
+        ]
+
+        if unsaved:
+            parser.error(
+                f"the baseline at {args.baseline} has no results for "
+                f"--rows {' '.join(map(str, unsaved))}; save them with\n\n"
+                f"    {save_command}"
+            )
+
+    results = run(args.rows, args.requests)
+
+    if args.save:
+        args.baseline.write_text(json.dumps(
+            {"results": results}, indent=2
+        ) + "\n")
+        print(f"\nsaved baseline to {args.baseline}")
+
+    if args.check:
+        worse = regressions(results, stored["results"], args.threshold)
+
+        for (name, measure_name, before, after) in worse:
+            print(
+                f"REGRESSION {name}: {measure_name} "
+                f"{before:.3f} -> {after:.3f}"
+            )
+
+        if worse:
+            sys.exit(1)
+
+        print(f"\nnothing over {args.threshold:.0%} worse than the baseline")
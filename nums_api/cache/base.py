@@ -0,0 +1,209 @@
+"""In-process caches over the fact tables, kept in sync with committed writes.
+
+Every cache is tied to one model. Rows added or deleted through the ORM are
+collected when the session flushes and handed to that model's caches once the
+transaction commits. Bulk statements (like ``Math.query.delete()``) can't be
+tracked row by row, so they mark the caches stale and the next reader reloads
+them. Writes made by other processes are picked up when a cache gets older
+than ``FACT_CACHE_MAX_AGE`` seconds.
+
+Readers only wait for a cache that has nothing to serve yet (never loaded,
+or marked stale by a bulk write). A cache that merely got old is rebuilt by
+the first request to notice, into new structures swapped in once they're
+complete, while every other reader keeps using the old ones.
+"""
+
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# maps model class -> list of caches built over that model's table
+_caches = {}
+
+
+class FactCache:
+    """Base class for an in-process cache over one model's table.
+
+    Subclasses implement ``load`` to read everything from the database, and
+    ``add`` / ``remove`` to apply a single committed row. Rows are passed as
+    dicts of column values, e.g. {"id": 1, "number": 5, ...}.
+
+    ``load`` must not touch the cache's attributes: it returns a dict of
+    attribute name -> new value, installed all at once under ``lock``.
+    Changes applied while it runs (see ``apply``) are replayed on the new
+    values, so ``add`` and ``remove`` must be safe to repeat.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.loaded_at = None
+        self.lock = threading.RLock()
+        # held while loading, so only one thread loads at a time
+        self.loading = threading.Lock()
+        # changes applied since the running load started, else None
+        self.replay = None
+        # bumped by invalidate, so a load that started before doesn't count
+        self.generation = 0
+        _caches.setdefault(model, []).append(self)
+
+    def load(self):
+        """Return dict of attribute name -> value, read from the database."""
+
+        raise NotImplementedError
+
+    def add(self, row):
+        raise NotImplementedError
+
+    def remove(self, row):
+        raise NotImplementedError
+
+    @property
+    def is_loaded(self):
+        return self.loaded_at is not None
+
+    def is_stale(self):
+        """Return True if the cache must be (re)loaded before use."""
+
+        if self.loaded_at is None:
+            return True
+
+        max_age = current_app.config.get("FACT_CACHE_MAX_AGE")
+        return bool(max_age) and time.monotonic() - self.loaded_at > max_age
+
+    def invalidate(self):
+        """Mark the cache stale; it is rebuilt the next time it's used."""
+
+        self.loaded_at = None
+        self.generation += 1
+
+    def ensure_loaded(self):
+        """Load the cache from the database if it is missing or stale.
+
+        Waits for the load only if the cache isn't loaded; an old cache is
+        reloaded by one caller while the others go on using it.
+        """
+
+        if self.loaded_at is None:
+            with self.loading:
+                if self.loaded_at is None:
+                    self.reload()
+
+        elif self.is_stale() and self.loading.acquire(blocking=False):
+            try:
+                if self.is_stale():
+                    self.reload()
+            finally:
+                self.loading.release()
+
+    def reload(self):
+        """Read the cache from the database and swap it in."""
+
+        with self.lock:
+            self.replay = []
+            generation = self.generation
+
+        try:
+            loaded = self.load()
+
+            with self.lock:
+                vars(self).update(loaded)
+
+                for (action, args) in self.replay:
+                    getattr(self, action)(*args)
+
+                if self.generation == generation:
+                    self.loaded_at = time.monotonic()
+        finally:
+            self.replay = None
+
+    def apply(self, action, *args):
+        """Call the method named action (e.g. "add") for a committed change.
+
+        Skipped while the cache isn't loaded, as the next load reads the
+        change from the database, and kept for replay while a load runs, as
+        it may have read the table before the change.
+        """
+
+        with self.lock:
+            if self.is_loaded:
+                getattr(self, action)(*args)
+
+            if self.replay is not None:
+                self.replay.append((action, args))
+
+
+def warm_caches():
+    """Load every cache now, rather than on first use.
+
+    Run in an app context at worker start (see gunicorn.conf.py), so the
+    first requests don't pay for loading.
+    """
+
+    for caches in list(_caches.values()):
+        for cache in caches:
+            cache.ensure_loaded()
+
+
+def invalidate_caches(model):
+    """Mark every cache over model as stale.
+
+    Call this after writing to the model's table without going through the
+    ORM unit of work (bulk inserts, raw SQL, ...).
+    """
+
+    for cache in _caches.get(model, []):
+        cache.invalidate()
+
+
+def _snapshot(obj):
+    """Return a dict of the column values currently loaded on obj."""
+
+    state = inspect(obj)
+    return {
+        attr.key: state.dict.get(attr.key)
+        for attr in state.mapper.column_attrs
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    """Remember rows written by this flush until the transaction ends."""
+
+    changes = session.info.setdefault("fact_cache_changes", [])
+
+    for obj in session.new:
+        if type(obj) in _caches:
+            changes.append((type(obj), "add", _snapshot(obj)))
+
+    for obj in session.deleted:
+        if type(obj) in _caches:
+            changes.append((type(obj), "remove", _snapshot(obj)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    """Hand committed rows to the caches that are currently loaded."""
+
+    for (model, action, row) in session.info.pop("fact_cache_changes", []):
+        for cache in _caches[model]:
+            cache.apply(action, row)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    """Forget rows from a transaction that was rolled back."""
+
+    session.info.pop("fact_cache_changes", None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(orm_execute_state):
+    """Mark caches stale when a bulk UPDATE or DELETE hits their table."""
+
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            invalidate_caches(mapper.class_)
@@ -0,0 +1,225 @@
+import logging
+import random
+import sys
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from nums_api.cache.base import FactCache
+from nums_api.database import db
+
+logger = logging.getLogger(__name__)
+
+# rough size of one indexed fact, not counting its text: the payload dict, the
+# (id, payload) tuple, ints and the list slot holding it
+FACT_OVERHEAD_BYTES = 600
+
+
+class FactIndex(FactCache):
+    """Maps a lookup key (number, year, day of year) to its serialized facts.
+
+    With the index loaded, looking up a fact is a dict hit and a random pick
+    instead of a database round trip. Each key holds a list of
+    (id, payload) tuples, where payload is the model's ``serialize()``.
+
+    The whole table has to fit in ``FACT_INDEX_MAX_BYTES``; if it doesn't, the
+    index stays empty and lookups go to the database, except for keys the
+    optional ``keys`` set (see nums_api.cache.keys) says have no facts.
+
+    The index is built on first use in each worker, unless it's warmed at
+    worker start: gunicorn.conf.py's ``post_worker_init`` hook loads every
+    cache (see nums_api.cache.base.warm_caches) before serving traffic.
+    """
+
+    def __init__(self, model, key_column, normalize_key=None, keys=None):
+        """Create an index of model's facts keyed by key_column.
+
+        normalize_key, if given, is applied to column values and lookup keys
+        alike, so both hash the same (e.g. Decimal and float for math).
+
+        keys, a FactKeys over the same column, is checked before going to
+        the database when the index isn't enabled.
+        """
+
+        super().__init__(model)
+        self.key_column = key_column
+        self.normalize_key = normalize_key or (lambda key: key)
+        self.keys = keys
+        self.facts = {}
+        self.size = 0
+        self.enabled = False
+
+    def load(self):
+        """Build a new index from the table, unless it's over budget."""
+
+        disabled = {"facts": {}, "size": 0, "enabled": False}
+
+        max_bytes = current_app.config.get("FACT_INDEX_MAX_BYTES")
+        if not max_bytes:
+            return disabled
+
+        estimate = self._estimate_size()
+        if estimate > max_bytes:
+            logger.warning(
+                "Not indexing %s: about %d bytes needed, budget is %d",
+                self.model.__tablename__, estimate, max_bytes,
+            )
+            return disabled
+
+        facts = {}
+        size = 0
+
+        query = select(self.model).execution_options(yield_per=1000)
+        for fact in db.session.execute(query).scalars():
+            size += self._add_fact(facts, fact)
+
+        return {"facts": facts, "size": size, "enabled": True}
+
+    def _estimate_size(self):
+        """Estimate the bytes needed to index the table, without loading it."""
+
+        text_length = (
+            func.length(self.model.fact_fragment) +
+            func.length(self.model.fact_statement)
+        )
+        query = select(func.count(), func.coalesce(func.sum(text_length), 0))
+        (count, total_length) = db.session.execute(
+            query.select_from(self.model)
+        ).one()
+
+        return count * FACT_OVERHEAD_BYTES + int(total_length)
+
+    def _add_fact(self, facts, fact):
+        """Add fact to facts (key -> list); return its size in bytes."""
+
+        payload = fact.serialize()
+        key = self.normalize_key(getattr(fact, self.key_column.key))
+
+        facts.setdefault(key, []).append((fact.id, payload))
+        return FACT_OVERHEAD_BYTES + sum(
+            sys.getsizeof(value) for value in payload.values()
+        )
+
+    def add(self, row):
+        """Index a committed row, unless the index already has it.
+
+        It does if the index loaded after the row was flushed, or while the
+        commit waited for the lock.
+        """
+
+        if not self.enabled:
+            return
+
+        key = self.normalize_key(row[self.key_column.key])
+        facts = self.facts.get(key, [])
+
+        if all(fact_id != row["id"] for (fact_id, _) in facts):
+            self.size += self._add_fact(self.facts, self.model(**row))
+
+    def remove(self, row):
+        """Drop a deleted row from the index."""
+
+        if not self.enabled:
+            return
+
+        # the key may not have been loaded on the deleted row; if so, look
+        # through every key for the id
+        key = row.get(self.key_column.key)
+        keys = [self.normalize_key(key)] if key is not None else self.facts
+
+        for key in list(keys):
+            facts = self.facts.get(key, [])
+            remaining = [fact for fact in facts if fact[0] != row["id"]]
+
+            if len(remaining) != len(facts):
+                if remaining:
+                    self.facts[key] = remaining
+                else:
+                    del self.facts[key]
+                return
+
+    def facts_for(self, key):
+        """Return list of (id, payload) for every fact with this key."""
+
+        self.ensure_loaded()
+        key = self.normalize_key(key)
+
+        if self.enabled:
+            return self.facts.get(key, [])
+
+        if self.keys is not None and key not in self.keys:
+            return []
+
+        facts = self.model.query.filter(self.key_column == key).all()
+        return [(fact.id, fact.serialize()) for fact in facts]
+
+    def choice(self, key, like_counts=None):
+        """Return a random serialized fact for key, or None if there is none.
+
+        With like_counts (the category's LikeCounts), the fact is picked in
+        proportion to its likes, unless none of key's facts has any.
+        """
+
+        facts = self.facts_for(key)
+
+        if not facts:
+            return None
+
+        if like_counts is not None and len(facts) > 1:
+            weights = [like_counts.likes(fact_id) for (fact_id, _) in facts]
+
+            if any(weights):
+                ((fact_id, payload), ) = random.choices(facts, weights)
+                return payload
+
+        (fact_id, payload) = random.choice(facts)
+        return payload
+
+    def keys_between(self, low=None, high=None, limit=None):
+        """Return sorted list of the keys from low to high (inclusive).
+
+        Either bound may be None for no bound. Runs as a range scan of the
+        key column's index, so a big table isn't read to answer it.
+        """
+
+        query = select(self.key_column).distinct().order_by(self.key_column)
+
+        if low is not None:
+            query = query.where(self.key_column >= low)
+        if high is not None:
+            query = query.where(self.key_column <= high)
+
+        return [
+            self.normalize_key(key)
+            for key in db.session.execute(query.limit(limit)).scalars()
+        ]
+
+    def choices(self, keys):
+        """Return dict of key -> random serialized fact, for many keys at once.
+
+        Keys without a fact are left out. When the index isn't enabled, all
+        keys are looked up with a single IN query.
+        """
+
+        self.ensure_loaded()
+        normalized = {key: self.normalize_key(key) for key in keys}
+
+        if self.enabled:
+            facts = self.facts
+        else:
+            facts = {}
+            wanted = set(normalized.values())
+
+            if self.keys is not None:
+                wanted = {key for key in wanted if key in self.keys}
+
+            query = self.model.query.filter(self.key_column.in_(wanted))
+            for fact in (query if wanted else []):
+                key = self.normalize_key(getattr(fact, self.key_column.key))
+                facts.setdefault(key, []).append((fact.id, fact.serialize()))
+
+        return {
+            key: random.choice(facts[normalized_key])[1]
+            for (key, normalized_key) in normalized.items()
+            if facts.get(normalized_key)
+        }
@@ -0,0 +1,215 @@
+"""Sets of the keys that have facts, for answering misses without a query.
+
+Most of the number space has no facts, so most lookups of an arbitrary
+number are misses. When a table is too big for its FactIndex, each of those
+would be a database round trip ending in a 404; checking one of these first
+answers them from memory.
+
+Both kinds only ever err towards "maybe": a deleted fact's key stays in the
+set until the next reload, which just costs one query that finds nothing
+(SortedFactKeys.closest_fact skips such keys).
+A key is never reported missing while it has a fact (writes from other
+processes show up after ``FACT_CACHE_MAX_AGE``, like every cache here).
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+from sqlalchemy import func, select
+
+from nums_api.cache.base import FactCache
+from nums_api.database import db
+
+# ways SortedFactKeys.closest can pick a key for a number without facts
+CLOSEST_MODES = ("floor", "ceil", "nearest")
+
+
+class FactKeys(FactCache):
+    """Base class for the set of distinct key_column values in a table."""
+
+    def __init__(self, model, key_column, normalize_key=None):
+        """Track model's distinct key_column values.
+
+        normalize_key, if given, is applied to column values and lookup keys
+        alike, as for FactIndex.
+        """
+
+        super().__init__(model)
+        self.key_column = key_column
+        self.normalize_key = normalize_key or (lambda key: key)
+
+    def distinct_keys(self):
+        """Yield every distinct key in the table, in order, normalized."""
+
+        query = select(self.key_column).distinct().order_by(self.key_column)
+        query = query.execution_options(yield_per=10000)
+
+        for key in db.session.execute(query).scalars():
+            yield self.normalize_key(key)
+
+    def remove(self, row):
+        """Keep the key: other facts may share it, and a stale key is safe."""
+
+    def __contains__(self, key):
+        """Return whether key may have facts (False means it has none)."""
+
+        self.ensure_loaded()
+        return self._contains(self.normalize_key(key))
+
+    def _contains(self, key):
+        raise NotImplementedError
+
+
+class SortedFactKeys(FactKeys):
+    """The keys as a sorted array, searched by bisection.
+
+    Suits sparse, unbounded keys like trivia and math numbers. With a
+    typecode (e.g. "q" for integers) the keys are packed in an
+    ``array.array``, 8 bytes each; without one they're a list, for keys like
+    Decimal that an array can't hold.
+    """
+
+    def __init__(self, model, key_column, normalize_key=None, typecode=None):
+        super().__init__(model, key_column, normalize_key)
+        self.typecode = typecode
+        self.keys = self._new_keys()
+
+    def _new_keys(self, keys=()):
+        if self.typecode:
+            return array(self.typecode, keys)
+        return list(keys)
+
+    def load(self):
+        return {"keys": self._new_keys(self.distinct_keys())}
+
+    def add(self, row):
+        key = self.normalize_key(row[self.key_column.key])
+
+        if not self._contains(key):
+            insort(self.keys, key)
+
+    def _contains(self, key):
+        i = bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+    def closest(self, key, mode):
+        """Return the key with facts closest to key, or None if there's none.
+
+        mode is one of CLOSEST_MODES: "floor" is the largest key <= key,
+        "ceil" the smallest key >= key and "nearest" whichever of the two is
+        closer (floor on a tie).
+        """
+
+        return next(self.candidates(key, mode), None)
+
+    def closest_fact(self, key, mode, fact_for):
+        """Return fact_for of the closest key it finds a fact for, or None.
+
+        Like closest, but a key whose facts have all been deleted since the
+        last load (fact_for returns a falsy value for it) is skipped for the
+        next key in the same direction, rather than ending in a 404.
+        """
+
+        for candidate in self.candidates(key, mode):
+            fact = fact_for(candidate)
+
+            if fact:
+                return fact
+
+        return None
+
+    def candidates(self, key, mode):
+        """Yield the keys in the order closest would pick them for mode."""
+
+        self.ensure_loaded()
+        key = self.normalize_key(key)
+        keys = self.keys
+
+        i = bisect_left(keys, key)
+        j = bisect_right(keys, key)
+
+        if i < j:
+            yield keys[i]
+
+        below = (keys[n] for n in range(i - 1, -1, -1))
+        above = (keys[n] for n in range(j, len(keys)))
+
+        if mode == "floor":
+            yield from below
+            return
+        if mode == "ceil":
+            yield from above
+            return
+
+        (floor, ceil) = (next(below, None), next(above, None))
+
+        while floor is not None or ceil is not None:
+            if ceil is None or floor is not None and key - floor <= ceil - key:
+                yield floor
+                floor = next(below, None)
+            else:
+                yield ceil
+                ceil = next(above, None)
+
+
+class FactKeyBitmap(FactKeys):
+    """The keys as one bit per integer from the smallest key to the largest.
+
+    Suits dense, bounded keys like days of the year or years: 366 days fit
+    in 46 bytes. Adding a key outside the range grows the bitmap.
+    """
+
+    def __init__(self, model, key_column, normalize_key=None):
+        super().__init__(model, key_column, normalize_key)
+        self.low = 0
+        self.bits = bytearray()
+
+    def load(self):
+        (low, high) = db.session.execute(
+            select(func.min(self.key_column), func.max(self.key_column))
+        ).one()
+
+        if low is None:
+            return {"low": 0, "bits": bytearray()}
+
+        low = self.normalize_key(low)
+        bits = bytearray((self.normalize_key(high) - low) // 8 + 1)
+
+        for key in self.distinct_keys():
+            offset = key - low
+            bits[offset >> 3] |= 1 << (offset & 7)
+
+        return {"low": low, "bits": bits}
+
+    def _grow(self, key):
+        """Widen the bitmap so it covers key."""
+
+        if key < self.low:
+            # re-base on a byte boundary, so existing bits only shift bytes
+            shift = -((key - self.low) // 8)
+            self.bits[0:0] = bytes(shift)
+            self.low -= shift * 8
+
+        offset = key - self.low
+        if offset >= len(self.bits) * 8:
+            self.bits.extend(bytes(offset // 8 + 1 - len(self.bits)))
+
+    def _set(self, key):
+        offset = key - self.low
+        self.bits[offset >> 3] |= 1 << (offset & 7)
+
+    def add(self, row):
+        key = self.normalize_key(row[self.key_column.key])
+
+        if not self.bits:
+            self.low = key
+        self._grow(key)
+        self._set(key)
+
+    def _contains(self, key):
+        offset = key - self.low
+
+        if offset < 0 or offset >= len(self.bits) * 8:
+            return False
+
+        return bool(self.bits[offset >> 3] & (1 << (offset & 7)))
@@ -0,0 +1,219 @@
+import heapq
+import random
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+from sqlalchemy import select
+
+from nums_api.cache.base import FactCache
+from nums_api.database import db
+
+# the alias table is rebuilt once the likes added since it was built are more
+# than this fraction of the likes in it, so rebuilds get rarer as it grows
+REBUILD_FRACTION = 0.25
+
+# how many of the most liked facts are kept ranked
+TOP_SIZE = 100
+
+
+class LikeCounts(FactCache):
+    """The like count of every liked fact in a category, and their total.
+
+    A cache over a ``*LikeCounter`` table, so choosing or weighting facts by
+    likes doesn't join or sum that table on each request. The category's
+    LikeRecorder adds likes as it writes them; anything else (ORM updates
+    of a counter, likes from other processes) shows up on the next reload.
+    Likes added while a reload reads the table are replayed on it, so the
+    few written just before that read are counted twice until the next.
+
+    ``sample`` picks a fact id in proportion to its likes in O(1), from a
+    Walker/Vose alias table over the counts. Rather than rebuilding the
+    table on every like, likes that arrive after it was built are kept
+    aside with their running total and sampled from separately, by
+    bisection, in proportion to their share of the total. The table is
+    only rebuilt once they're REBUILD_FRACTION of the likes in it, so the
+    O(facts) rebuild is paid for by as many likes.
+
+    ``top`` reads the most liked facts off ``ranking``, the TOP_SIZE most
+    liked as (-likes, fact id) in order, which each like moves its fact up.
+    Counts only go up between reloads, so a fact outside the ranking only
+    has to be compared with the last one in it to see if it gets in.
+    """
+
+    def __init__(self, like_model):
+        super().__init__(like_model)
+
+        (self.fact_id_column, ) = [
+            column for column in like_model.__table__.c if column.foreign_keys
+        ]
+        self.counts = {}
+        self.total = 0
+        self.ranking = []
+        self._reset_table()
+
+    def _reset_table(self):
+        # (fact ids, probabilities, aliases, total likes) or None
+        self.table = None
+        # fact ids liked since the table was built, with the running total
+        # of the likes added up to and including each
+        self.added_ids = array("q")
+        self.added_cumulative = array("q")
+        self.added_total = 0
+
+    def load(self):
+        """Read the count of every fact with likes."""
+
+        counters = self.model.__table__
+        query = (
+            select(self.fact_id_column, counters.c.num_likes)
+            .where(counters.c.num_likes > 0)
+        )
+
+        counts = dict(db.session.execute(query).all())
+
+        return {
+            "counts": counts,
+            "total": sum(counts.values()),
+            "ranking": self._rank_all(counts),
+            "table": None,
+            "added_ids": array("q"),
+            "added_cumulative": array("q"),
+            "added_total": 0,
+        }
+
+    def _rank_all(self, counts):
+        return heapq.nsmallest(
+            TOP_SIZE,
+            ((-likes, fact_id) for (fact_id, likes) in counts.items()),
+        )
+
+    def add(self, row):
+        """Take a new counter row's count."""
+
+        self._incr(row[self.fact_id_column.name], row["num_likes"] or 0)
+
+    def remove(self, row):
+        """Drop a deleted counter row's count."""
+
+        self._discard(row[self.fact_id_column.name])
+
+    def discard(self, fact_id):
+        """Forget the fact's likes, e.g. once it's found to be deleted."""
+
+        self.apply("_discard", fact_id)
+
+    def _discard(self, fact_id):
+        if fact_id in self.counts:
+            self.total -= self.counts.pop(fact_id)
+            self.ranking = self._rank_all(self.counts)
+            self._reset_table()
+
+    def incr(self, fact_id, amount=1):
+        """Add amount likes to the fact's count."""
+
+        if amount:
+            self.apply("_incr", fact_id, amount)
+
+    def _incr(self, fact_id, amount):
+        likes = self.counts.get(fact_id, 0)
+        self.counts[fact_id] = likes + amount
+        self.total += amount
+        self._rerank(fact_id, likes, likes + amount)
+
+        if self.table is not None:
+            self.added_total += amount
+            self.added_ids.append(fact_id)
+            self.added_cumulative.append(self.added_total)
+
+    def _rerank(self, fact_id, old_likes, new_likes):
+        """Move the fact to its place in the ranking, if it's in the top."""
+
+        ranking = self.ranking
+        i = bisect_left(ranking, (-old_likes, fact_id))
+
+        if i < len(ranking) and ranking[i] == (-old_likes, fact_id):
+            del ranking[i]
+        elif len(ranking) >= TOP_SIZE and (-new_likes, fact_id) > ranking[-1]:
+            return
+
+        insort(ranking, (-new_likes, fact_id))
+        del ranking[TOP_SIZE:]
+
+    def top(self, limit):
+        """Return list of (fact id, likes) of the limit most liked facts.
+
+        Most liked first, and by id among facts with as many likes. limit
+        can be at most TOP_SIZE.
+        """
+
+        self.ensure_loaded()
+        return [
+            (fact_id, -likes) for (likes, fact_id) in self.ranking[:limit]
+        ]
+
+    def likes(self, fact_id):
+        """Return the fact's number of likes."""
+
+        self.ensure_loaded()
+        return self.counts.get(fact_id, 0)
+
+    def total_likes(self):
+        """Return the number of likes of every fact in the category."""
+
+        self.ensure_loaded()
+        return self.total
+
+    def _build_table(self):
+        """Build the alias table over the current counts (Vose's method)."""
+
+        ids = array("q", self.counts)
+        size = len(ids)
+        scaled = [self.counts[fact_id] * size / self.total for fact_id in ids]
+        probabilities = array("d", [1.0]) * size
+        aliases = array("q", range(size))
+
+        small = [i for (i, p) in enumerate(scaled) if p < 1]
+        large = [i for (i, p) in enumerate(scaled) if p >= 1]
+
+        while small and large:
+            (i, j) = (small.pop(), large.pop())
+            probabilities[i] = scaled[i]
+            aliases[i] = j
+            scaled[j] += scaled[i] - 1
+            (small if scaled[j] < 1 else large).append(j)
+
+        self.table = (ids, probabilities, aliases, self.total)
+        self.added_ids = array("q")
+        self.added_cumulative = array("q")
+        self.added_total = 0
+
+    def sample(self):
+        """Return a fact id picked in proportion to its likes.
+
+        Returns None if no fact in the category has likes.
+        """
+
+        self.ensure_loaded()
+
+        with self.lock:
+            if not self.total:
+                return None
+
+            if (
+                self.table is None
+                or self.added_total > self.table[3] * REBUILD_FRACTION
+            ):
+                self._build_table()
+
+            (ids, probabilities, aliases, table_total) = self.table
+            pick = random.random() * self.total
+
+            if pick >= table_total:
+                i = bisect_right(self.added_cumulative, pick - table_total)
+                return self.added_ids[min(i, len(self.added_ids) - 1)]
+
+            i = random.randrange(len(ids))
+
+            if random.random() < probabilities[i]:
+                return ids[i]
+            return ids[aliases[i]]
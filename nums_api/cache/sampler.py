@@ -0,0 +1,99 @@
+import random
+from array import array
+from bisect import bisect_left, insort
+
+from sqlalchemy import select
+
+from nums_api.cache.base import FactCache
+from nums_api.database import db
+
+
+class RandomFactSampler(FactCache):
+    """Picks a uniformly random fact from a model's table.
+
+    Keeps a sorted array of the table's ids (8 bytes per fact) so a random
+    pick is a single primary key lookup, however large the table grows.
+    """
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.ids = array("q")
+
+    def load(self):
+        """Read every id in the table, in order."""
+
+        query = select(self.model.id).order_by(self.model.id)
+        return {"ids": array("q", db.session.execute(query).scalars())}
+
+    def add(self, row):
+        """Insert the row's id, keeping the array sorted and unique."""
+
+        fact_id = row["id"]
+
+        if not self.ids or fact_id > self.ids[-1]:
+            self.ids.append(fact_id)
+        elif not self._contains(fact_id):
+            insort(self.ids, fact_id)
+
+    def remove(self, row):
+        """Drop the row's id if it's in the array."""
+
+        fact_id = row["id"]
+        index = bisect_left(self.ids, fact_id)
+
+        if index < len(self.ids) and self.ids[index] == fact_id:
+            del self.ids[index]
+
+    def _contains(self, fact_id):
+        index = bisect_left(self.ids, fact_id)
+        return index < len(self.ids) and self.ids[index] == fact_id
+
+    def __contains__(self, fact_id):
+        self.ensure_loaded()
+        return self._contains(fact_id)
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self.ids)
+
+    def sample(self):
+        """Return a random instance of the model, or None if there are none.
+
+        Ids whose row has disappeared (deleted by another process) are
+        dropped from the array and another id is tried.
+        """
+
+        self.ensure_loaded()
+
+        while True:
+            with self.lock:
+                if not self.ids:
+                    return None
+                fact_id = self.ids[random.randrange(len(self.ids))]
+
+            fact = db.session.get(self.model, fact_id)
+
+            if fact is not None:
+                return fact
+
+            self.apply("remove", {"id": fact_id})
+
+    def sample_liked(self, like_counts):
+        """Return a random instance, picked in proportion to its likes.
+
+        like_counts is the category's LikeCounts. Returns None if no fact
+        has likes; facts found to be deleted are dropped from it.
+        """
+
+        while True:
+            fact_id = like_counts.sample()
+
+            if fact_id is None:
+                return None
+
+            fact = db.session.get(self.model, fact_id)
+
+            if fact is not None:
+                return fact
+
+            like_counts.discard(fact_id)
@@ -0,0 +1,146 @@
+from unittest import TestCase
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.cache.index import FactIndex
+from nums_api.cache.base import warm_caches
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+class FactIndexTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+
+        self.t1 = Trivia(
+            number=1,
+            fact_fragment="the number for this t1 test fact fragment",
+            fact_statement="1 is the number for this t1 test fact statement.",
+            was_submitted=False
+        )
+
+        self.t2 = Trivia(
+            number=1,
+            fact_fragment="the number for this t2 test fact fragment",
+            fact_statement="1 is the number for this t2 test fact statement.",
+            was_submitted=False
+        )
+
+        db.session.add_all([self.t1, self.t2])
+        db.session.commit()
+
+        self.index = FactIndex(Trivia, Trivia.number)
+
+        self.max_bytes = app.config["FACT_INDEX_MAX_BYTES"]
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+        app.config["FACT_INDEX_MAX_BYTES"] = self.max_bytes
+
+    def test_lookup(self):
+        """Makes sure facts are found by key"""
+
+        self.assertIn(
+            self.index.choice(1),
+            [self.t1.serialize(), self.t2.serialize()]
+        )
+        self.assertIsNone(self.index.choice(2))
+
+        self.assertTrue(self.index.enabled)
+        self.assertEqual(
+            sorted(fact_id for (fact_id, payload) in self.index.facts[1]),
+            [self.t1.id, self.t2.id]
+        )
+
+    def test_tracks_inserts_and_deletes(self):
+        """Makes sure committed ORM writes update the index without a reload"""
+
+        self.index.ensure_loaded()
+
+        t3 = Trivia(
+            number=3,
+            fact_fragment="the number for this t3 test fact fragment",
+            fact_statement="3 is the number for this t3 test fact statement.",
+            was_submitted=False
+        )
+        db.session.add(t3)
+        db.session.commit()
+
+        self.assertEqual(self.index.facts_for(3), [(t3.id, t3.serialize())])
+
+        db.session.delete(self.t1)
+        db.session.commit()
+
+        self.assertEqual(
+            self.index.facts_for(1),
+            [(self.t2.id, self.t2.serialize())]
+        )
+
+        db.session.delete(t3)
+        db.session.commit()
+
+        self.assertNotIn(3, self.index.facts)
+
+    def test_over_budget_uses_database(self):
+        """Makes sure a table over the memory budget is not indexed"""
+
+        app.config["FACT_INDEX_MAX_BYTES"] = 100
+
+        self.assertEqual(
+            sorted(fact_id for (fact_id, payload) in self.index.facts_for(1)),
+            [self.t1.id, self.t2.id]
+        )
+        self.assertFalse(self.index.enabled)
+        self.assertEqual(self.index.facts, {})
+
+    def test_choices(self):
+        """Makes sure many keys are looked up at once, indexed or not"""
+
+        facts = self.index.choices([1, 2])
+
+        self.assertEqual(list(facts), [1])
+        self.assertIn(facts[1], [self.t1.serialize(), self.t2.serialize()])
+
+        app.config["FACT_INDEX_MAX_BYTES"] = 100
+        self.index.invalidate()
+
+        self.assertEqual(self.index.choices([1, 2]).keys(), facts.keys())
+        self.assertFalse(self.index.enabled)
+
+    def test_row_indexed_once(self):
+        """Makes sure a row is indexed once when the index loads after it
+        was flushed but before it was committed"""
+
+        t3 = Trivia(
+            number=7,
+            fact_fragment="the number for this t3 test fact fragment",
+            fact_statement="7 is the number for this t3 test fact statement.",
+            was_submitted=False
+        )
+        db.session.add(t3)
+        db.session.flush()
+
+        self.assertEqual(self.index.facts_for(7), [(t3.id, t3.serialize())])
+
+        db.session.commit()
+
+        self.assertEqual(self.index.facts_for(7), [(t3.id, t3.serialize())])
+
+    def test_warm_caches(self):
+        with app.app_context():
+            warm_caches()
+
+        self.assertTrue(self.index.is_loaded)
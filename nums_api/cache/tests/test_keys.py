@@ -0,0 +1,221 @@
+from unittest import TestCase
+from sqlalchemy import event
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.years.models import Year, YearLikeCounter
+from nums_api.cache.index import FactIndex
+from nums_api.cache.keys import SortedFactKeys, FactKeyBitmap
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+def make_trivia(number, n=1):
+    return Trivia(
+        number=number,
+        fact_fragment=f"the number for this {number} test fact fragment {n}",
+        fact_statement=f"{number} is the number for this test fact {n}.",
+        was_submitted=False
+    )
+
+
+def make_year(year, n=1):
+    return Year(
+        year=year,
+        fact_fragment=f"the year of this {year} test fact fragment {n}",
+        fact_statement=f"{year} is the year of this test fact {n}.",
+        was_submitted=False
+    )
+
+
+class SortedFactKeysTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+
+        db.session.add_all([
+            make_trivia(5), make_trivia(-3), make_trivia(1000000),
+            make_trivia(5, 2),
+        ])
+        db.session.commit()
+
+        self.keys = SortedFactKeys(Trivia, Trivia.number, typecode="q")
+        self.max_bytes = app.config["FACT_INDEX_MAX_BYTES"]
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+        app.config["FACT_INDEX_MAX_BYTES"] = self.max_bytes
+
+    def test_membership(self):
+        """Makes sure keys with facts are found, and only those"""
+
+        for number in [5, -3, 1000000]:
+            self.assertIn(number, self.keys)
+
+        for number in [0, 4, 6, -4, 999999, 10 ** 12]:
+            self.assertNotIn(number, self.keys)
+
+        self.assertEqual(list(self.keys.keys), [-3, 5, 1000000])
+
+    def test_closest(self):
+        """Makes sure the closest key is found each way"""
+
+        cases = [
+            (5, ("floor", 5), ("ceil", 5), ("nearest", 5)),
+            (0, ("floor", -3), ("ceil", 5), ("nearest", -3)),
+            (1, ("floor", -3), ("ceil", 5), ("nearest", -3)),
+            (2, ("floor", -3), ("ceil", 5), ("nearest", 5)),
+            (-10, ("floor", None), ("ceil", -3), ("nearest", -3)),
+            (10 ** 7, ("floor", 10 ** 6), ("ceil", None), ("nearest", 10 ** 6)),
+        ]
+
+        for (key, *expected) in cases:
+            for (mode, closest) in expected:
+                self.assertEqual(self.keys.closest(key, mode), closest)
+
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+        db.session.commit()
+
+        for mode in ["floor", "ceil", "nearest"]:
+            self.assertIsNone(self.keys.closest(1, mode))
+
+    def test_closest_fact_skips_deleted(self):
+        """Makes sure keys whose facts were deleted are skipped each way"""
+
+        index = FactIndex(Trivia, Trivia.number, keys=self.keys)
+        self.keys.ensure_loaded()
+        index.ensure_loaded()
+
+        for t in Trivia.query.filter_by(number=5).all():
+            db.session.delete(t)
+        db.session.commit()
+
+        self.assertIn(5, self.keys)
+
+        def number(key, mode):
+            fact = self.keys.closest_fact(key, mode, index.choice)
+            return fact and fact["number"]
+
+        self.assertEqual(number(5, "floor"), -3)
+        self.assertEqual(number(4, "ceil"), 1000000)
+        self.assertEqual(number(6, "nearest"), -3)
+        self.assertIsNone(number(-4, "floor"))
+
+    def test_tracks_inserts(self):
+        """Makes sure committed facts are added, deleted ones kept"""
+
+        self.keys.ensure_loaded()
+
+        t = make_trivia(7)
+        db.session.add(t)
+        db.session.commit()
+
+        self.assertIn(7, self.keys)
+        self.assertEqual(list(self.keys.keys), [-3, 5, 7, 1000000])
+
+        db.session.delete(t)
+        db.session.commit()
+
+        # a stale key only costs a query; it is dropped on the next load
+        self.assertIn(7, self.keys)
+        self.keys.invalidate()
+        self.assertNotIn(7, self.keys)
+
+    def test_index_misses_skip_database(self):
+        """Makes sure an unindexed lookup of a missing key runs no query"""
+
+        app.config["FACT_INDEX_MAX_BYTES"] = 0
+        index = FactIndex(Trivia, Trivia.number, keys=self.keys)
+        self.keys.ensure_loaded()
+        index.ensure_loaded()
+
+        queries = []
+
+        def capture(conn, cursor, statement, parameters, context, many):
+            queries.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            self.assertIsNone(index.choice(6))
+            self.assertEqual(index.choices([6, 7, 8]), {})
+            self.assertEqual(queries, [])
+
+            self.assertIsNotNone(index.choice(5))
+            self.assertEqual(list(index.choices([5, 6])), [5])
+            self.assertEqual(len(queries), 2)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+
+
+class FactKeyBitmapTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        YearLikeCounter.query.delete()
+        Year.query.delete()
+
+        db.session.add_all([
+            make_year(1969), make_year(2001), make_year(1969, 2),
+        ])
+        db.session.commit()
+
+        self.keys = FactKeyBitmap(Year, Year.year)
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+
+    def test_membership(self):
+        """Makes sure keys with facts are found, and only those"""
+
+        self.assertIn(1969, self.keys)
+        self.assertIn(2001, self.keys)
+
+        for year in [1968, 1970, 2000, 2002, -500, 10000]:
+            self.assertNotIn(year, self.keys)
+
+        # one bit per year from 1969 to 2001
+        self.assertEqual(len(self.keys.bits), 5)
+
+    def test_grows_for_inserts(self):
+        """Makes sure committed facts outside the range widen the bitmap"""
+
+        self.keys.ensure_loaded()
+
+        db.session.add_all([make_year(y) for y in [-44, 1970, 2500]])
+        db.session.commit()
+
+        for year in [-44, 1969, 1970, 2001, 2500]:
+            self.assertIn(year, self.keys)
+
+        for year in [-45, -43, 1971, 2499, 2501]:
+            self.assertNotIn(year, self.keys)
+
+    def test_empty_table(self):
+        """Makes sure an empty table has no keys, until one is added"""
+
+        YearLikeCounter.query.delete()
+        Year.query.delete()
+        db.session.commit()
+
+        self.assertNotIn(1969, self.keys)
+        self.assertEqual(self.keys.bits, bytearray())
+
+        db.session.add(make_year(1969))
+        db.session.commit()
+
+        self.assertIn(1969, self.keys)
+        self.assertNotIn(1968, self.keys)
@@ -0,0 +1,169 @@
+import random
+from collections import Counter
+from unittest import TestCase
+from unittest.mock import patch
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.cache.likes import LikeCounts
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+SAMPLES = 4000
+
+
+class LikeCountsTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+
+        self.facts = [
+            Trivia(
+                number=n,
+                fact_fragment=f"the number for this t{n} test fact fragment",
+                fact_statement=f"{n} is the number for this t{n} test fact.",
+                was_submitted=False
+            )
+            for n in range(1, 4)
+        ]
+        db.session.add_all(self.facts)
+        db.session.commit()
+
+        # likes 1, 3 and none
+        (self.t1, self.t2, self.t3) = [fact.id for fact in self.facts]
+        db.session.add_all([
+            TriviaLikeCounter(trivia_id=self.t1, num_likes=1),
+            TriviaLikeCounter(trivia_id=self.t2, num_likes=3),
+            TriviaLikeCounter(trivia_id=self.t3, num_likes=0),
+        ])
+        db.session.commit()
+
+        self.counts = LikeCounts(TriviaLikeCounter)
+        random.seed(1)
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+
+    def shares(self):
+        """Return dict of fact id -> share of SAMPLES it was picked."""
+
+        picks = Counter(self.counts.sample() for _ in range(SAMPLES))
+        return {fact_id: n / SAMPLES for (fact_id, n) in picks.items()}
+
+    def test_load(self):
+        """Makes sure counts and the total are read from the counters"""
+
+        self.assertEqual(self.counts.total_likes(), 4)
+        self.assertEqual(self.counts.likes(self.t2), 3)
+        self.assertEqual(self.counts.likes(self.t3), 0)
+        self.assertNotIn(self.t3, self.counts.counts)
+
+    def test_sample_in_proportion(self):
+        """Makes sure facts are sampled in proportion to their likes"""
+
+        shares = self.shares()
+
+        self.assertEqual(shares.keys(), {self.t1, self.t2})
+        self.assertAlmostEqual(shares[self.t2], 0.75, delta=0.03)
+
+    def test_likes_added_after_build(self):
+        """Makes sure likes since the table was built are sampled too"""
+
+        self.counts.sample()
+        self.counts.incr(self.t3)
+
+        self.assertEqual(list(self.counts.added_ids), [self.t3])
+
+        # 1/5, 3/5 and 1/5 of the likes, without rebuilding the table
+        shares = self.shares()
+
+        self.assertEqual(self.counts.table[3], 4)
+        self.assertAlmostEqual(shares[self.t3], 0.2, delta=0.03)
+        self.assertAlmostEqual(shares[self.t2], 0.6, delta=0.03)
+
+    def test_rebuild(self):
+        """Makes sure the table is rebuilt once enough likes are added"""
+
+        self.counts.sample()
+        self.counts.incr(self.t3)
+        self.counts.incr(self.t1)
+        self.counts.sample()
+
+        self.assertEqual(self.counts.table[3], 6)
+        self.assertEqual(list(self.counts.added_ids), [])
+
+    def test_many_added_facts_no_rebuild(self):
+        """Makes sure likes spread over many facts don't force a rebuild
+        while they're a small share of the table"""
+
+        self.counts.ensure_loaded()
+        self.counts.incr(self.t2, 996)
+        self.counts.sample()
+
+        for fact_id in range(1000, 1200):
+            self.counts.incr(fact_id)
+
+        shares = self.shares()
+
+        self.assertEqual(self.counts.table[3], 1000)
+        self.assertEqual(len(self.counts.added_ids), 200)
+        self.assertAlmostEqual(
+            sum(shares.get(fact_id, 0) for fact_id in range(1000, 1200)),
+            200 / 1200,
+            delta=0.03
+        )
+        self.assertAlmostEqual(shares[self.t2], 999 / 1200, delta=0.03)
+
+    def test_discard_and_empty(self):
+        """Makes sure discarded facts aren't sampled, and none is None"""
+
+        self.counts.ensure_loaded()
+        self.counts.discard(self.t2)
+
+        self.assertEqual(self.counts.total_likes(), 1)
+        self.assertEqual(set(self.shares()), {self.t1})
+
+        self.counts.discard(self.t1)
+        self.assertIsNone(self.counts.sample())
+
+    def test_top(self):
+        """Makes sure the ranking follows likes as they're added"""
+
+        self.assertEqual(self.counts.top(10), [(self.t2, 3), (self.t1, 1)])
+        self.assertEqual(self.counts.top(1), [(self.t2, 3)])
+
+        self.counts.incr(self.t1, 2)
+        self.counts.incr(self.t3)
+
+        # ties are broken by id
+        self.assertEqual(
+            self.counts.top(10),
+            [(self.t1, 3), (self.t2, 3), (self.t3, 1)]
+        )
+
+    def test_top_when_full(self):
+        """Makes sure a fact outside a full ranking gets in once it's liked"""
+
+        with patch("nums_api.cache.likes.TOP_SIZE", 1):
+            self.assertEqual(self.counts.top(10), [(self.t2, 3)])
+
+            self.counts.incr(self.t3, 3)
+            self.assertEqual(self.counts.top(10), [(self.t2, 3)])
+
+            self.counts.incr(self.t3)
+            self.assertEqual(self.counts.top(10), [(self.t3, 4)])
+
+            self.counts.discard(self.t3)
+            self.assertEqual(self.counts.top(10), [(self.t2, 3)])
@@ -0,0 +1,172 @@
+from unittest import TestCase
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.years.models import Year, YearLikeCounter
+from nums_api.cache.sampler import RandomFactSampler
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+class RandomFactSamplerTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        YearLikeCounter.query.delete()
+        Year.query.delete()
+
+        self.y1 = Year(
+            year=2019,
+            fact_fragment="the year for this y1 test fact fragment",
+            fact_statement="2019 is the year for this y1 test fact statement.",
+            was_submitted=False
+        )
+
+        self.y2 = Year(
+            year=2020,
+            fact_fragment="the year for this y2 test fact fragment",
+            fact_statement="2020 is the year for this y2 test fact statement.",
+            was_submitted=False
+        )
+
+        db.session.add_all([self.y1, self.y2])
+        db.session.commit()
+
+        self.sampler = RandomFactSampler(Year)
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+
+    def test_sample(self):
+        """Makes sure samples come from the table"""
+
+        self.assertEqual(len(self.sampler), 2)
+
+        for i in range(10):
+            self.assertIn(self.sampler.sample(), [self.y1, self.y2])
+
+    def test_sample_empty_table(self):
+        """Makes sure an empty table samples as None"""
+
+        Year.query.delete()
+        db.session.commit()
+
+        self.assertIsNone(self.sampler.sample())
+
+    def test_tracks_inserts_and_deletes(self):
+        """Makes sure committed ORM writes update the ids without a reload"""
+
+        self.sampler.ensure_loaded()
+        loaded_at = self.sampler.loaded_at
+
+        y3 = Year(
+            year=2021,
+            fact_fragment="the year for this y3 test fact fragment",
+            fact_statement="2021 is the year for this y3 test fact statement.",
+            was_submitted=False
+        )
+        db.session.add(y3)
+        db.session.commit()
+
+        self.assertIn(y3.id, self.sampler)
+
+        db.session.delete(self.y1)
+        db.session.commit()
+
+        self.assertNotIn(self.y1.id, self.sampler)
+        self.assertEqual(list(self.sampler.ids), [self.y2.id, y3.id])
+        self.assertEqual(self.sampler.loaded_at, loaded_at)
+
+    def test_ignores_rolled_back_inserts(self):
+        """Makes sure rows from a rolled back transaction are not tracked"""
+
+        self.sampler.ensure_loaded()
+
+        y3 = Year(
+            year=2021,
+            fact_fragment="the year for this y3 test fact fragment",
+            fact_statement="2021 is the year for this y3 test fact statement.",
+            was_submitted=False
+        )
+        db.session.add(y3)
+        db.session.flush()
+        y3_id = y3.id
+        db.session.rollback()
+
+        self.assertNotIn(y3_id, self.sampler)
+
+    def test_bulk_delete_invalidates(self):
+        """Makes sure a bulk delete marks the sampler stale"""
+
+        self.sampler.ensure_loaded()
+
+        Year.query.filter(Year.year == 2019).delete()
+        db.session.commit()
+
+        self.assertFalse(self.sampler.is_loaded)
+        self.assertEqual(len(self.sampler), 1)
+        self.assertEqual(list(self.sampler.ids), [self.y2.id])
+
+    def test_drops_missing_ids(self):
+        """Makes sure ids deleted behind the sampler's back are skipped"""
+
+        self.sampler.ensure_loaded()
+
+        db.session.execute(
+            Year.__table__.delete().where(Year.id == self.y1.id)
+        )
+        db.session.commit()
+
+        for i in range(10):
+            self.assertEqual(self.sampler.sample().id, self.y2.id)
+
+        self.assertEqual(list(self.sampler.ids), [self.y2.id])
+
+    def test_old_ids_served_while_reloading(self):
+        """Makes sure an old cache is used, not waited on, while reloading"""
+
+        self.sampler.ensure_loaded()
+        self.sampler.loaded_at -= app.config["FACT_CACHE_MAX_AGE"] + 1
+
+        # another thread is reloading
+        with self.sampler.loading:
+            self.assertEqual(len(self.sampler), 2)
+
+        self.assertTrue(self.sampler.is_stale())
+        self.assertEqual(len(self.sampler), 2)
+        self.assertFalse(self.sampler.is_stale())
+
+    def test_changes_during_reload_kept(self):
+        """Makes sure rows committed while reloading make it into the ids"""
+
+        self.sampler.ensure_loaded()
+        load = self.sampler.load
+
+        y3 = Year(
+            year=2021,
+            fact_fragment="the year for this y3 test fact fragment",
+            fact_statement="2021 is the year for this y3 test fact statement.",
+            was_submitted=False
+        )
+
+        def load_then_commit():
+            loaded = load()
+            db.session.add(y3)
+            db.session.commit()
+            return loaded
+
+        self.sampler.load = load_then_commit
+        self.sampler.reload()
+
+        self.assertEqual(
+            list(self.sampler.ids), [self.y1.id, self.y2.id, y3.id]
+        )
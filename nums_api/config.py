@@ -6,3 +6,66 @@ load_dotenv()
 
 DATABASE_URL = os.environ['DATABASE_URL']
 DATABASE_URL_TEST = os.environ['DATABASE_URL_TEST']
+
+# log every SQL statement the app runs (SQLALCHEMY_ECHO=1, for debugging)
+SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO', '0') == '1'
+
+# time each request's SQL and handler, sent back in a Server-Timing header
+# and added up per route at /timing (REQUEST_TIMING=1)
+REQUEST_TIMING = os.environ.get('REQUEST_TIMING', '0') == '1'
+
+# SQL statements slower than this many ms are logged with their query plan
+# (0 turns the slow query log off)
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 500))
+
+# seconds before the same slow statement is logged (and explained) again
+SLOW_QUERY_LOG_INTERVAL = float(
+    os.environ.get('SLOW_QUERY_LOG_INTERVAL', 300)
+)
+
+# seconds before in-process fact caches are reloaded, to pick up writes made
+# by other processes (0 disables reloading)
+FACT_CACHE_MAX_AGE = int(os.environ.get('FACT_CACHE_MAX_AGE', 300))
+
+# bytes each per-category fact index may use; a table that doesn't fit is
+# looked up in the database instead (0 disables the indexes)
+FACT_INDEX_MAX_BYTES = int(
+    os.environ.get('FACT_INDEX_MAX_BYTES', 64 * 1024 * 1024)
+)
+
+# most keys a batch lookup like /api/trivia/1..100 may ask for
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 100))
+
+# seconds to buffer likes in memory before writing them in one batch
+# (0 writes every like as it arrives)
+LIKE_FLUSH_INTERVAL = float(os.environ.get('LIKE_FLUSH_INTERVAL', 0))
+
+# hours after which a like counts half as much towards trending facts
+TRENDING_HALF_LIFE = float(os.environ.get('TRENDING_HALF_LIFE', 24))
+
+# seconds between a process rolling the like event log up into hourly
+# buckets (also done by `python -m nums_api.likes.trending`, e.g. from cron)
+LIKE_ROLLUP_INTERVAL = float(os.environ.get('LIKE_ROLLUP_INTERVAL', 300))
+
+# where rate limit counters are kept; the default SQLite file is shared by
+# every worker process on the host (memory:// counts per process), in a
+# directory only the user running the app can open
+RATELIMIT_STORAGE_URI = os.environ.get(
+    'RATELIMIT_STORAGE_URI',
+    "sqlite:///" + os.path.join(
+        os.environ.get('XDG_RUNTIME_DIR') or os.path.expanduser('~/.cache'),
+        'nums_api',
+        'ratelimits.sqlite3',
+    ),
+)
+
+# how requests are counted against a limit: "moving-window" (sliding, no
+# burst at a window boundary), "fixed-window" or "fixed-window-elastic-expiry"
+RATELIMIT_STRATEGY = os.environ.get('RATELIMIT_STRATEGY', 'moving-window')
+
+# limit on each fact API route, per client address (e.g. "200 per day" or
+# "10/minute;200/day"); the docs page and static files aren't limited
+RATELIMIT_API = os.environ.get('RATELIMIT_API', '200 per day')
+
+# limit on any other route that doesn't declare its own
+RATELIMIT_DEFAULT = os.environ.get('RATELIMIT_DEFAULT', '200/day;50/hour')
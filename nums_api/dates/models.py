@@ -1,6 +1,33 @@
 from datetime import datetime
 from nums_api.database import db
 
+# days of each month in a leap year, so every date (February 29th too) has
+# the same day of the year every year
+DAYS_IN_MONTH = {
+    1: 31,
+    2: 29,
+    3: 31,
+    4: 30,
+    5: 31,
+    6: 30,
+    7: 31,
+    8: 31,
+    9: 30,
+    10: 31,
+    11: 30,
+    12: 31,
+}
+
+# month -> its first day of the year
+FIRST_DAY_OF_MONTH = {}
+
+# day of the year -> (month, day); index 0 is unused so days index directly
+MONTH_AND_DAY = [None]
+
+for (month, days) in DAYS_IN_MONTH.items():
+    FIRST_DAY_OF_MONTH[month] = len(MONTH_AND_DAY)
+    MONTH_AND_DAY.extend((month, day) for day in range(1, days + 1))
+
 
 class Date (db.Model):
     """Date facts."""
@@ -21,11 +48,13 @@ class Date (db.Model):
     day_of_year = db.Column(
         db.Integer,
         nullable=False,
+        index=True,
     )
 
     year = db.Column(
         db.Integer,
         nullable=False,
+        index=True,
     )
 
     # fact with no prefix, first word lowercase, no punctuation at the end
@@ -51,6 +80,34 @@ class Date (db.Model):
         nullable=False,
     )
 
+    # digest of the fact's content when loaded from the facts dump, so a
+    # re-run of the loader can tell unchanged facts from changed ones
+    content_hash = db.Column(
+        db.String(32),
+        unique=True,
+    )
+
+    # dump file the fact was loaded from, like "years/wikipedia_1_100.txt",
+    # so facts taken out of it can be deleted when it's loaded again
+    source = db.Column(
+        db.String(200),
+        index=True,
+    )
+
+    def serialize(self):
+        """Serialize to dictionary."""
+
+        (month, day) = Date.date_from_day_of_year(self.day_of_year)
+
+        return {
+            "fragment": self.fact_fragment,
+            "statement": self.fact_statement,
+            "month": month,
+            "day": day,
+            "year": self.year,
+            "type": "date",
+        }
+
     @classmethod
     def date_to_day_of_year(cls, month, day):
         """
@@ -58,51 +115,18 @@ class Date (db.Model):
 
         Returns day of the year.
         """
-        # This maps valid days for each month
-        valid_days_for_months = {
-            1: 31,
-            2: 29,
-            3: 31,
-            4: 30,
-            5: 31,
-            6: 30,
-            7: 31,
-            8: 31,
-            9: 30,
-            10: 31,
-            11: 30,
-            12: 31,
-        }
-
-        # This maps the months to their respective first day of the year
-        month_to_first_day_of_year = {
-            1: 1,
-            2: 32,
-            3: 61,
-            4: 92,
-            5: 122,
-            6: 153,
-            7: 183,
-            8: 214,
-            9: 245,
-            10: 275,
-            11: 306,
-            12: 336,
-        }
 
         if not(isinstance(month, int) and isinstance(day, int)):
             raise TypeError("Invalid data types")
 
-        if not valid_days_for_months.get(month, None):
+        if month not in FIRST_DAY_OF_MONTH:
             raise ValueError(f"{month} is an invalid month")
 
-        if day > valid_days_for_months[month] or day < 1:
+        if day > DAYS_IN_MONTH[month] or day < 1:
             raise ValueError(f"{day} is an invalid day")
 
         # Subtract 1 since days are 1-indexed
-        day_of_year = month_to_first_day_of_year[month] + day - 1
-
-        return day_of_year
+        return FIRST_DAY_OF_MONTH[month] + day - 1
 
     @classmethod
     def date_from_day_of_year(cls, day_of_year):
@@ -112,21 +136,6 @@ class Date (db.Model):
             Returns (month:int, day:int)
         """
 
-        day_of_year_to_month = {
-            1: 1,
-            32: 2,
-            61: 3,
-            92: 4,
-            122: 5,
-            153: 6,
-            183: 7,
-            214: 8,
-            245: 9,
-            275: 10,
-            306: 11,
-            336: 12,
-        }
-
         if not isinstance(day_of_year, int):
             raise TypeError("Invalid data type")
 
@@ -135,20 +144,32 @@ class Date (db.Model):
                 f"""{day_of_year} is out of range, does not exists
                 in current calendar""")
 
-        first_of_each_month = list(day_of_year_to_month.keys())
+        return MONTH_AND_DAY[day_of_year]
 
-        for index, first in enumerate(first_of_each_month):
-            month = day_of_year_to_month[first]
-            day = day_of_year + 1 - first_of_each_month[index]
+    @classmethod
+    def dates_from_days_of_year(cls, days_of_year):
+        """
+            Converts many days of the year at once, like
+            date_from_day_of_year, checking the whole list up front.
 
-            if day_of_year is first:
-                return (month, 1)
-            if index is len(day_of_year_to_month) - 1:
-                return (month, day)
-            if day_of_year > first and day_of_year < first_of_each_month[index+1]:
-                return (month, day)
+            Returns list of (month:int, day:int)
+        """
+
+        days_of_year = list(days_of_year)
+
+        if not days_of_year:
+            return []
+
+        if not all(isinstance(day, int) for day in days_of_year):
+            raise TypeError("Invalid data type")
+
+        for day_of_year in (min(days_of_year), max(days_of_year)):
+            if day_of_year < 1 or day_of_year > 366:
+                raise ValueError(
+                    f"""{day_of_year} is out of range, does not exists
+                in current calendar""")
 
-        raise Exception("Should not get here - encountered unexpected error.")
+        return [MONTH_AND_DAY[day_of_year] for day_of_year in days_of_year]
 
 
 class DateLikeCounter(db.Model):
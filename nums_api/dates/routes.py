@@ -1,11 +1,21 @@
 from flask import Blueprint, jsonify
 from nums_api.dates.models import Date, DateLikeCounter
-import random
+from nums_api.cache.sampler import RandomFactSampler
+from nums_api.cache.index import FactIndex
+from nums_api.cache.keys import FactKeyBitmap
+from nums_api.likes.recorder import LikeRecorder
+from nums_api.likes.weighted import like_weights
+from nums_api.likes.ranking import top_facts, trending_facts
+from nums_api.batch import parse_batch
 from werkzeug.exceptions import BadRequest
-from nums_api.database import db
 
 dates = Blueprint("dates", __name__)
 
+date_sampler = RandomFactSampler(Date)
+date_likes = LikeRecorder(Date, DateLikeCounter, date_sampler)
+date_keys = FactKeyBitmap(Date, Date.day_of_year)
+date_index = FactIndex(Date, Date.day_of_year, keys=date_keys)
+
 
 @dates.get("/<int:month>/<int:day>")
 def get_date_fact(month, day):
@@ -26,6 +36,9 @@ def get_date_fact(month, day):
             }
         }
 
+        With query string weighted=likes, a date with several facts gets
+        one picked in proportion to their likes.
+
         OR If date is not found...
         Output: JSON like
         {
@@ -42,9 +55,10 @@ def get_date_fact(month, day):
         (error_msg, ) = e.args
         raise BadRequest(error_msg)
 
-    date_facts = Date.query.filter(Date.day_of_year == day_of_year).all()
+    like_counts = like_weights(date_likes)
+    fact_data = date_index.choice(day_of_year, like_counts)
 
-    if not date_facts:
+    if not fact_data:
         error = {
             "message": f"A date fact for {month}/{day} not found",
             "status": 404
@@ -52,20 +66,77 @@ def get_date_fact(month, day):
 
         return (jsonify(error=error), 404)
 
-    fact = random.choice(date_facts)
-    (month_num, day_num) = Date.date_from_day_of_year(fact.day_of_year)
+    return jsonify(fact=fact_data)
+
+
+def parse_date(date):
+    """Converts "month/day" (str) to day of the year (1-366) (int)"""
+
+    (month, day) = date.split("/")
+    return Date.date_to_day_of_year(int(month), int(day))
+
 
+def format_dates(days_of_year):
+    """Converts days of the year (1-366) (ints) to list of "month/day" (str)"""
 
-    fact_data = {
-        "fragment": fact.fact_fragment,
-        "statement": fact.fact_statement,
-        "month": month_num,
-        "day": day_num,
-        "year": fact.year,
-        "type": "date",
+    return [
+        f"{month}/{day}"
+        for (month, day) in Date.dates_from_days_of_year(days_of_year)
+    ]
+
+
+@dates.get("/<datebatch:dates_list>")
+def get_date_facts_batch(dates_list):
+    """
+    Get date facts about many dates in one request
+        Input: dates_list (str) like "1/1,2/14" or "1/1..1/31"
+        Output: JSON like
+        {
+            "facts": {
+                "1/1": {
+                    "fragment": "the test case",
+                    "statement": "January 1st is the test case.",
+                    "month": 1,
+                    "day" : 1,
+                    "year": 2023,
+                    "type": "date"
+                },
+                "2/14": {...}
+            }
+        }
+
+        Dates without a fact are left out.
+
+        OR If none of the dates are found...
+        Output: JSON like
+        {
+            error: {
+                "message": "No date facts for 1/1..1/31 found",
+                "status": 404
+            }
+        }
+    """
+
+    try:
+        keys = parse_batch(dates_list, parse_date, format_dates)
+    except ValueError as e:
+        (error_msg, ) = e.args
+        raise BadRequest(error_msg)
+
+    facts = date_index.choices(keys.values())
+    facts_data = {
+        label: facts[key] for (label, key) in keys.items() if key in facts
     }
 
-    return jsonify(fact=fact_data)
+    if not facts_data:
+        error = {
+            "message": f"No date facts for {dates_list} found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts_data)
 
 
 @dates.get("/random")
@@ -83,22 +154,122 @@ def get_date_fact_random():
                 "type": "date"
             }
         }
+
+        With query string weighted=likes, facts are picked in proportion to
+        their likes, so only liked facts are picked, unless none has likes
+        yet.
     """
 
-    date_facts = Date.query.all()
-    fact = random.choice(date_facts)
-    (month_num, day_num) = Date.date_from_day_of_year(fact.day_of_year)
-
-    fact_data = {
-        "fragment": fact.fact_fragment,
-        "statement": fact.fact_statement,
-        "month": month_num,
-        "day": day_num,
-        "year": fact.year,
-        "type": "date",
-    }
+    like_counts = like_weights(date_likes)
 
-    return jsonify(fact=fact_data)
+    fact = None
+
+    if like_counts is not None:
+        fact = date_sampler.sample_liked(like_counts)
+
+    if fact is None:
+        # none has likes yet, so any fact will do
+        fact = date_sampler.sample()
+
+    if not fact:
+        error = {
+            "message": "No date facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(fact=fact.serialize())
+
+
+@dates.get("/top")
+def get_date_facts_top():
+    """
+    Get the most liked date facts
+        Input: optional query string limit, how many (default 10, at most
+            100), like "?limit=3"
+        Output: JSON like
+        {
+            "facts": [
+                {
+                    "fragment": "...",
+                    "statement": "...",
+                    "month": 1,
+                    "day": 1,
+                    "year": 2023,
+                    "type": "date",
+                    "likes": 12
+                },
+                {...}
+            ]
+        }
+
+        OR If no date fact has likes...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No liked date facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    facts = top_facts(date_likes)
+
+    if not facts:
+        error = {
+            "message": "No liked date facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts)
+
+
+@dates.get("/trending")
+def get_date_facts_trending():
+    """
+    Get the trending date facts, scored by recent likes
+        Input: optional query string limit, how many (default 10, at most
+            100), like "?limit=3"
+        Output: JSON like
+        {
+            "facts": [
+                {
+                    "fragment": "...",
+                    "statement": "...",
+                    "month": 1,
+                    "day": 1,
+                    "year": 2023,
+                    "type": "date",
+                    "score": 7.5
+                },
+                {...}
+            ]
+        }
+
+        OR If no date fact has likes lately...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No trending date facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    facts = trending_facts(date_likes)
+
+    if not facts:
+        error = {
+            "message": "No trending date facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts)
 
 
 @dates.post("/like/<int:id>")
@@ -118,23 +289,11 @@ def add_date_like(id):
         }
     """
 
-    fact = Date.query.get(id)
-
-    if not fact:
+    if not date_likes.record(id):
         error = {
             "message": f"A date fact for id { id } not found",
             "status": 404
         }
         return (jsonify(error), 404)
 
-    like_counter = DateLikeCounter.query.filter_by(date_id=fact.id).first()
-
-    if not like_counter:
-        like_counter = DateLikeCounter(date_id=id)
-        db.session.add(like_counter)
-        db.session.commit()
-
-    like_counter.increment_likes()
-    db.session.commit()
-
     return ("You have liked this fact.", 200)
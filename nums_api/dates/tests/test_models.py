@@ -56,6 +56,17 @@ class DateModelTestCase(TestCase):
             .day_of_year, 60
         )
 
+    def test_serialize(self):
+        """Test serializing to dictionary, with the day of year as a date"""
+        self.assertEqual(self.d1.serialize(), {
+            "fragment": "the number for this d1 test fact fragment",
+            "statement": "60 is the number for this d1 test fact statement",
+            "month": 2,
+            "day": 29,
+            "year": 2000,
+            "type": "date",
+        })
+
     def test_date_to_day_of_year(self):
         """ Test to check correct day of year is given from class method
             date_from_day_of_year
@@ -145,6 +156,37 @@ class DateModelTestCase(TestCase):
         self.assertEqual(month, 2)
         self.assertEqual(day, 29)
 
+    def test_date_from_day_of_year_round_trip(self):
+        """ Test that every day of the year converts to a date and back,
+            including the first of October, November and December
+        """
+
+        for day_of_year in range(1, 367):
+            (month, day) = Date.date_from_day_of_year(day_of_year)
+            self.assertEqual(
+                Date.date_to_day_of_year(month, day),
+                day_of_year
+            )
+
+        self.assertEqual(Date.date_from_day_of_year(int("275")), (10, 1))
+        self.assertEqual(Date.date_from_day_of_year(int("306")), (11, 1))
+        self.assertEqual(Date.date_from_day_of_year(int("336")), (12, 1))
+
+    def test_dates_from_days_of_year(self):
+        """ Test converting many days of the year at once """
+
+        self.assertEqual(
+            Date.dates_from_days_of_year([60, 1, 366]),
+            [(2, 29), (1, 1), (12, 31)]
+        )
+        self.assertEqual(Date.dates_from_days_of_year([]), [])
+
+        with self.assertRaises(TypeError):
+            Date.dates_from_days_of_year([1, "2"])
+
+        with self.assertRaises(ValueError):
+            Date.dates_from_days_of_year([1, 367])
+
     def test_invalid_type_date_from_day_of_year(self):
         """ Test to check correct error response is given when invalid data type
             is used as input
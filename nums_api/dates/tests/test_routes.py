@@ -152,3 +152,38 @@ class DateRouteTestCase(DateBaseRouteTestCase):
 
             resp = c.post(f"api/dates/like/{-1}")
             self.assertEqual(resp.status_code, 404)
+
+    def test_get_date_facts_batch(self):
+        with self.client as c:
+
+            expected_resp = {
+                "facts": {
+                    "1/1": {
+                        "fragment": "the test case",
+                        "statement": "January 1st is the test case.",
+                        "month": 1,
+                        "day": 1,
+                        "year": 2023,
+                        "type": "date"
+                    }
+                }
+            }
+
+            resp = c.get("/api/dates/1/1..1/31")
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json, expected_resp)
+
+            resp = c.get("/api/dates/2/14,1/1")
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json, expected_resp)
+
+    def test_get_date_facts_batch_invalid(self):
+        with self.client as c:
+
+            resp = c.get("/api/dates/1/1..13/2")
+            html = resp.get_data(as_text=True)
+
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn("13 is an invalid month", html)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from nums_api.database import db
+
+
+class IngestSource(db.Model):
+    """A facts dump file that has been loaded, and what it contained."""
+
+    __tablename__ = "ingest_sources"
+
+    # path relative to the dump directory, like "years/wikipedia_1_100.txt"
+    path = db.Column(
+        db.String(200),
+        primary_key=True,
+    )
+
+    # digest of the file's bytes when it was last loaded
+    content_hash = db.Column(
+        db.String(64),
+        nullable=False,
+    )
+
+    loaded_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+    )
@@ -0,0 +1,130 @@
+"""Read facts dumps one fact at a time.
+
+A dump is a JSON object of lists of facts::
+
+    {"24": [{"text": "...", "self": false, "pos": "N"}, ...], ...}
+
+``read_facts`` walks that structure itself and only hands single values (a
+key, a fact) to ``json.JSONDecoder.raw_decode``, so at most one chunk of the
+file and one fact are held in memory, however big the dump is.
+"""
+
+import json
+
+# characters read from the file at a time
+CHUNK_SIZE = 64 * 1024
+
+
+class DumpReader:
+    """Reads JSON values one by one from a text file, chunk by chunk."""
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read another chunk, dropping what's been parsed already.
+
+        Returns False at the end of the file.
+        """
+
+        if self.eof:
+            return False
+
+        chunk = self.file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+
+        return not self.eof
+
+    def peek(self):
+        """Return the next non-whitespace character, "" at the end."""
+
+        while True:
+            buffer = self.buffer
+            while self.pos < len(buffer) and buffer[self.pos].isspace():
+                self.pos += 1
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        """Consume the next character, which must be one of chars."""
+
+        char = self.peek()
+
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Expecting one of {chars!r}", self.buffer, self.pos
+            )
+
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """Decode the next value, reading more of the file if it's cut off."""
+
+        self.peek()
+
+        while True:
+            try:
+                (value, end) = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def read_facts(file, chunk_size=CHUNK_SIZE):
+    """
+    Yields the facts of a dump, in file order
+
+    Input:
+        - file: text file object of a dump like:
+            {
+                "24": [{
+                        "text": "Text.",
+                        "self": false,
+                        "pos": "N",
+                    }, ...], ...
+            }
+
+    Output: generator of (key, fact) like ("24", {"text": "Text.", ...})
+    """
+
+    reader = DumpReader(file, chunk_size)
+    reader.expect("{")
+
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.decode()
+        reader.expect(":")
+        reader.expect("[")
+
+        if reader.peek() == "]":
+            reader.expect("]")
+        else:
+            while True:
+                yield (key, reader.decode())
+
+                if reader.expect(",]") == "]":
+                    break
+
+        if reader.expect(",}") == "}":
+            return
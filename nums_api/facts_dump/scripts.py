@@ -4,114 +4,110 @@ from nums_api.dates.models import Date
 from nums_api.years.models import Year
 from nums_api.maths.models import Math
 from nums_api.trivia.models import Trivia
-from nums_api.database import db
+from nums_api.facts_dump.models import IngestSource
+from nums_api.config import DATABASE_URL
+from nums_api.cache.base import invalidate_caches
+from nums_api.facts_dump.reader import read_facts
+from sqlalchemy import (
+    String, all_, bindparam, column, create_engine, delete, exists, func,
+    select, update, values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+import argparse
 import datetime
+import hashlib
+import time
 
-def format_text_to_csv(directory):
-    """
-    Creates/Edits readable CSV files from text files
-
-    Separates values by "*"
+# the category directories (dates/, math/, ...) live next to this file
+DUMP_DIRECTORY = Path(__file__).parent
 
-    Input:
-        - directory (string)
-    """
+CATEGORIES = ["math", "trivia", "years", "dates"]
 
-    files = os.listdir(f"./{directory}")
 
-    for file in files:
-        (filename, extension) = os.path.splitext(file)
+def dump_files(category, directory=None):
+    """
+    Returns paths of the category's *.txt dump files
 
-        result = None
+    Input:
+        - category (string)
+        - directory (Path): holding a subdirectory per category, defaults
+            to DUMP_DIRECTORY
 
-        if extension == ".txt":
-            with open(f"./{directory}/{file}") as f:
-                text = f.read()
-                result = json.loads(text)
+    Output: list of Path
+    """
 
-            with open(f"./{directory}/{filename}.csv", "w") as f:
-                for key in result.keys():
-                    for fact in result[key]:
-                        f.write("%s*%s\n"%(key, fact))
+    return sorted(Path(directory or DUMP_DIRECTORY, category).glob("*.txt"))
 
 
-def normalize_data(data):
+def format_text_to_csv(category):
     """
-    Converts lists of facts into the right format to insert into our database
-
-    Input:
-        - data like:
-            {
-                "24": [{
-                        "text": "Text.",
-                        "self": false,
-                        "pos": "N",
-                    }, ...], ...
-            }
+    Creates/Edits readable CSV files from text files
 
-    Output:
-        normalized data like:
-            {
-                "24": [{
-                        "number": 24,
-                        "fact_fragment": "text",
-                        "fact_statement": "text.",
-                        "was_submitted": False,
-                    }, ...], ...
-            }
+    Separates values by "*"
 
+    Input:
+        - category (string)
     """
 
-    clean_data = filter_data(data)
+    for path in dump_files(category):
+        with open(path) as dump, open(path.with_suffix(".csv"), "w") as f:
+            for (key, fact) in read_facts(dump):
+                f.write("%s*%s\n"%(key, fact))
 
-    for key in clean_data:
-        normalized_facts = []
 
-        for fact in clean_data[key]:
-            result = normalize_fact(key, fact)
+def filter_facts(facts):
+    """
+    Drops unwanted facts (those with "self": true)
 
-            if result:
-                normalized_facts.append(result)
+    Input:
+        - facts: iterable of (key, fact) like
+            ("24", {"text": "Text.", "self": false, "pos": "N"})
 
-        clean_data[key] = normalized_facts
+    Output: generator of the same (key, fact) pairs, minus unwanted ones
+    """
 
-    return clean_data
+    for (key, fact) in facts:
+        if fact["self"] == False:
+            yield (key, fact)
 
 
-def filter_data(data):
+def normalize_facts(category, facts):
     """
-    Cleans data of unwanted facts and empty lists
+    Converts facts into the right format to insert into our database
+
+    Facts with grammar we don't support are dropped.
 
     Input:
-        - data like:
-            {
-                "24": [{
-                        "text": "Text.",
-                        "self": false,
-                        "pos": "N",
-                    }, ...], ...
-            }
+        - category (string)
+        - facts: iterable of (key, fact) like
+            ("24", {"text": "Text.", "self": false, "pos": "N"})
 
     Output:
-        same data without elements with "self": true and without empty lists
+        generator of normalized facts like:
+            {
+                "number": 24,
+                "fact_fragment": "text",
+                "fact_statement": "text.",
+                "was_submitted": False,
+            }
     """
 
-    # Filtering out dicts with "self": true
-    for key in data:
-        filtered_facts = [fact for fact in data[key] if fact["self"] == False]
-        data[key] = filtered_facts
+    for (key, fact) in facts:
+        result = normalize_fact(category, key, fact)
 
-    # Filtering out empty lists
-    filtered_data = {key: data[key] for key in data if data[key] != []}
+        if result:
+            yield result
 
-    return filtered_data
 
-
-def normalize_fact(number, fact):
+def normalize_fact(category, number, fact):
     """
     Converts original data into a data shape we can input into the database
 
     Input:
+        - category (string)
         - number (string)
         - fact like:
             {
@@ -165,24 +161,41 @@ def normalize_fact(number, fact):
     ):
         return None
 
-    prefix = get_prefix(number, fact)
+    prefix = get_prefix(category, number, fact)
 
     normalized_fact["number"] = int(number)
     normalized_fact["fact_fragment"] = text
     normalized_fact["fact_statement"] = f"{prefix} {text}."
     normalized_fact["was_submitted"] = False
 
-    if direc == "dates":
+    if category == "dates":
         normalized_fact["year"] = fact["year"]
 
     return normalized_fact
 
 
-def get_prefix(number, fact):
+MONTH_NAMES = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+
+
+def get_prefix(category, number, fact):
     """
     Concatenates numbers with a prefix that is used for fact_statements
 
     Input:
+        - category (string)
         - number (string)
         - fact like:
             {
@@ -196,24 +209,10 @@ def get_prefix(number, fact):
     """
 
     number = int(number)
-    MONTH_NAMES = [
-        "January",
-        "February",
-        "March",
-        "April",
-        "May",
-        "June",
-        "July",
-        "August",
-        "September",
-        "October",
-        "November",
-        "December",
-    ]
 
-    if direc == "math" or direc == "trivia":
+    if category == "math" or category == "trivia":
         return f"{number} is"
-    elif direc == "dates":
+    elif category == "dates":
         (month_num, day_num) = Date.date_from_day_of_year(number)
         month_name = MONTH_NAMES[month_num - 1]
         num_ordinal_suff = get_ordinal_suffix(day_num)
@@ -226,7 +225,7 @@ def get_prefix(number, fact):
             return (
                 f"{month_name} {num_ordinal_suff} is the day in {fact['year']} that"
             )
-    elif direc == "years":
+    elif category == "years":
         curr_year = datetime.date.today().year
 
         if number < 0:
@@ -268,106 +267,599 @@ def get_ordinal_suffix(num):
         return f"{number}th"
 
 
-def insert_data(facts):
+# facts are sent to the database in multi-row INSERTs of this many rows
+BATCH_SIZE = 1000
+
+MODELS = {
+    "math": Math,
+    "trivia": Trivia,
+    "years": Year,
+    "dates": Date,
+}
+
+# the column each category's facts are looked up by
+KEY_COLUMNS = {
+    "math": "number",
+    "trivia": "number",
+    "years": "year",
+    "dates": "day_of_year",
+}
+
+
+def fact_to_row(category, fact):
     """
-    Inserts number and their corresponding facts into PSQL database
+    Converts a normalized fact into a row of the category's table
 
     Input:
-        -facts like:
-            [{
+        -category (string)
+        -fact like:
+            {
                 "number",
                 "fact_fragment",
                 "fact_statement",
                 "was_submitted",
                 "year", (for Date model)
-            }, ...]
+            }
+
+    Output: dict of column name -> value
     """
 
-    for fact in facts:
-        if direc == "math":
-            data = Math(
-                number=fact["number"],
-                fact_fragment=fact["fact_fragment"],
-                fact_statement=fact["fact_statement"],
-                was_submitted=fact["was_submitted"]
-            )
+    row = {
+        "fact_fragment": fact["fact_fragment"],
+        "fact_statement": fact["fact_statement"],
+        "was_submitted": fact["was_submitted"],
+    }
+
+    if category == "math" or category == "trivia":
+        row["number"] = fact["number"]
+    elif category == "years":
+        row["year"] = fact["number"]
+    elif category == "dates":
+        row["day_of_year"] = fact["number"]
+        row["year"] = fact["year"]
+
+    row["content_hash"] = fact_hash(row)
+
+    return row
+
+
+def fact_hash(row):
+    """
+    Returns the hex digest of a row's content, the same in every process
+
+    Input:
+        -row: dict of column name -> value
+
+    Output: string of 32 hex digits
+    """
+
+    content = json.dumps(row, sort_keys=True).encode()
+
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def file_hash(path):
+    """
+    Returns the hex digest of a file's bytes, read a chunk at a time
+
+    Input:
+        -path (Path)
+
+    Output: string of 64 hex digits
+    """
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def row_digest(value):
+    """Returns a short digest of value, to remember it without keeping it"""
+
+    return hashlib.blake2b(repr(value).encode(), digest_size=16).digest()
+
+
+def insertable_rows(rows, table):
+    """
+    Drops rows the table would reject, so a batch doesn't fail on them:
+        - rows with a value too long for its column
+        - rows that would break one of the table's unique constraints against
+          an earlier row (tables without unique columns only drop exact
+          duplicates)
+
+    Input:
+        -rows: iterable of dicts of column name -> value
+        -table: SQLAlchemy Table
+
+    Only a digest of each row's unique values is remembered, so rows can
+    be streamed through without keeping them all.
+
+    Output: generator of rows
+    """
+
+    max_lengths = {
+        column.name: column.type.length
+        for column in table.c
+        if getattr(column.type, "length", None)
+    }
+    unique_columns = [column.name for column in table.c if column.unique]
+    seen = {name: set() for name in unique_columns}
+    seen_rows = set()
+
+    for row in rows:
+        if any(
+            len(row[name]) > length
+            for (name, length) in max_lengths.items()
+            if name in row
+        ):
+            continue
+
+        if unique_columns:
+            digests = {name: row_digest(row[name]) for name in unique_columns}
+            if any(digests[name] in seen[name] for name in unique_columns):
+                continue
+            for name in unique_columns:
+                seen[name].add(digests[name])
+        else:
+            digest = row_digest(sorted(row.items()))
+            if digest in seen_rows:
+                continue
+            seen_rows.add(digest)
+
+        yield row
+
+
+def upsert_statement(table, rows, key_column):
+    """
+    Builds the INSERT ... ON CONFLICT statement writing a batch of rows
+
+    Only new or changed facts are written:
+        - where fact fragments are unique, a fact whose fragment is already
+          in the table under the same key is updated, if its content hash
+          or source differs (facts submitted through the API are left
+          alone); the same fragment under another key is a duplicate, and
+          skipped
+        - otherwise (dates) facts are matched by content hash, and ones
+          already in the table only get their source updated
+
+    A fact whose text changed doesn't match its old row, so it's written
+    as a new one; delete_missing_facts then deletes the old one.
+
+    Input:
+        -table: SQLAlchemy Table
+        -rows: list of dicts of column name -> value
+        -key_column: SQLAlchemy Column the facts are looked up by
+
+    Output: SQLAlchemy Insert
+    """
 
-        elif direc == "trivia":
-            data = Trivia(
-                number=fact["number"],
-                fact_fragment=fact["fact_fragment"],
-                fact_statement=fact["fact_statement"],
-                was_submitted=fact["was_submitted"]
+    statement = insert(table).values(rows)
+    changed = table.c.content_hash.is_distinct_from(
+        statement.excluded.content_hash
+    )
+
+    if "source" in rows[0]:
+        moved = table.c.source.is_distinct_from(statement.excluded.source)
+    else:
+        moved = None
+
+    if not table.c.fact_fragment.unique:
+        if moved is None:
+            return statement.on_conflict_do_nothing(
+                index_elements=[table.c.content_hash]
             )
 
-        elif direc == "years":
-            data = Year(
-                year=fact["number"],
-                fact_fragment=fact["fact_fragment"],
-                fact_statement=fact["fact_statement"],
-                was_submitted=fact["was_submitted"]
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.content_hash],
+            set_={"source": statement.excluded.source},
+            where=moved,
+        )
+
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.fact_fragment],
+        set_={
+            name: statement.excluded[name]
+            for name in rows[0]
+            if name != "fact_fragment"
+        },
+        where=(
+            (key_column == statement.excluded[key_column.name]) &
+            (changed if moved is None else changed | moved) &
+            (table.c.was_submitted == False)
+        ),
+    )
+
+
+def match_unhashed_facts(table, rows, connection):
+    """
+    Gives facts written before content hashes the hash (and source) of the
+    same fact among rows, so upsert_statement matches them rather than
+    inserting them again
+
+    Only for tables matched by content hash (dates): migrations 0002 and
+    0005 leave existing rows' content_hash and source NULL. A row matches
+    on its key, year and fact fragment; facts submitted through the API
+    are left alone.
+
+    Input:
+        -table: SQLAlchemy Table
+        -rows: list of dicts of column name -> value
+        -connection: SQLAlchemy Connection, in a transaction
+
+    Output: number of facts matched (int)
+    """
+
+    names = [name for name in rows[0] if name != "was_submitted"]
+    loaded = values(
+        *[column(name, table.c[name].type) for name in names],
+        name="loaded",
+    ).data([tuple(row[name] for name in names) for row in rows])
+
+    matched = ["day_of_year", "year", "fact_fragment"]
+    unhashed = table.alias("unhashed")
+    # the oldest, if the same fact was written more than once
+    first_unhashed = (
+        select(func.min(unhashed.c.id))
+        .where(
+            unhashed.c.content_hash.is_(None),
+            unhashed.c.was_submitted == False,
+            *[unhashed.c[name] == loaded.c[name] for name in matched],
+        )
+        .scalar_subquery()
+    )
+    hashed = table.alias("hashed")
+    already_hashed = exists().where(
+        hashed.c.content_hash == loaded.c.content_hash
+    )
+
+    statement = (
+        update(table)
+        .values({
+            name: loaded.c[name]
+            for name in names
+            if name not in matched
+        })
+        .where(
+            *[table.c[name] == loaded.c[name] for name in matched],
+            table.c.id == first_unhashed,
+            ~already_hashed,
+        )
+    )
+
+    return connection.execute(statement).rowcount
+
+
+def has_unhashed_facts(table, connection):
+    """
+    Returns whether the table has facts loaded before content hashes, which
+    match_unhashed_facts has to match
+
+    Input:
+        -table: SQLAlchemy Table
+        -connection: SQLAlchemy Connection
+
+    Output: bool
+    """
+
+    return connection.execute(
+        select(
+            exists().where(
+                table.c.content_hash.is_(None),
+                table.c.was_submitted == False,
             )
+        )
+    ).scalar()
+
+
+def delete_missing_facts(table, source, content_hashes, connection):
+    """
+    Deletes the facts loaded from source that it no longer has, with their
+    like counters
+
+    Input:
+        -table: SQLAlchemy Table
+        -source (string): like "years/wikipedia_1_100.txt"
+        -content_hashes: set of the content hashes of source's facts
+        -connection: SQLAlchemy Connection, not in a transaction
 
-        elif direc == "dates":
-            data = Date(
-                day_of_year=fact["number"],
-                year=fact["year"],
-                fact_fragment=fact["fact_fragment"],
-                fact_statement=fact["fact_statement"],
-                was_submitted=fact["was_submitted"]
+    Output: number of facts deleted (int)
+    """
+
+    hashes = bindparam("hashes", list(content_hashes), type_=ARRAY(String))
+    missing = select(table.c.id).where(
+        (table.c.source == source) &
+        (table.c.content_hash != all_(hashes))
+    )
+    referencing = [
+        foreign_key.parent
+        for other in table.metadata.sorted_tables
+        for foreign_key in other.foreign_keys
+        if foreign_key.column.table is table
+    ]
+
+    with connection.begin():
+        for fact_id_column in referencing:
+            connection.execute(
+                delete(fact_id_column.table)
+                .where(fact_id_column.in_(missing))
             )
-        try:
-            db.session.add(data)
-            db.session.commit()
-        except Exception as e:
-            print(e)
-            db.session.rollback()
 
+        return connection.execute(
+            delete(table).where(table.c.id.in_(missing))
+        ).rowcount
+
+
+def insert_data(category, facts, connection, source=None):
+    """
+    Inserts or updates numbers and their corresponding facts in PSQL database
+
+    Facts that are too long or duplicated are dropped before they're sent,
+    then the rest are upserted BATCH_SIZE at a time (see upsert_statement),
+    so facts already in the table are skipped without failing the batch and
+    only new or changed ones are written. Facts are read lazily, so only one
+    batch is held in memory.
+
+    Each batch is committed on its own and sorted by its unique columns, so
+    workers loading overlapping files take row locks in the same order and
+    can't deadlock.
+
+    With a source, the facts are recorded as loaded from it, and facts
+    loaded from it before but not among these are deleted, so a source's
+    facts match it after each load.
+
+    Date facts written before content hashes are matched to the loaded
+    ones first (see match_unhashed_facts), so they aren't written twice.
+
+    Input:
+        -category (string)
+        -facts: iterable (e.g. generator) of facts like:
+            {
+                "number",
+                "fact_fragment",
+                "fact_statement",
+                "was_submitted",
+                "year", (for Date model)
+            }
+        -connection: SQLAlchemy Connection, not in a transaction
+        -source (string): the dump file, like "years/wikipedia_1_100.txt"
+
+    Output: number of facts inserted, updated or deleted (int)
+    """
+
+    model = MODELS[category]
+    table = model.__table__
+    rows = (fact_to_row(category, fact) for fact in facts)
+
+    if source is not None:
+        rows = (dict(row, source=source) for row in rows)
+
+    rows = insertable_rows(rows, table)
+    unique_columns = [column.name for column in table.c if column.unique]
+    content_hashes = set()
+    inserted = 0
+
+    # facts written before content hashes are matched to rows by their text
+    with connection.begin():
+        unhashed = (
+            not table.c.fact_fragment.unique
+            and has_unhashed_facts(table, connection)
+        )
+
+    while True:
+        batch = list(islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+
+        batch.sort(key=lambda row: [row[name] for name in unique_columns])
+        content_hashes.update(row["content_hash"] for row in batch)
+
+        statement = upsert_statement(
+            table,
+            batch,
+            table.c[KEY_COLUMNS[category]],
+        )
+
+        with connection.begin():
+            if unhashed:
+                inserted += match_unhashed_facts(table, batch, connection)
+
+            inserted += connection.execute(statement).rowcount
+
+    if source is not None:
+        inserted += delete_missing_facts(
+            table, source, content_hashes, connection
+        )
+
+    # rows went in without the ORM, so in-process caches can't track them
+    if inserted:
+        invalidate_caches(model)
+
+    return inserted
+
+
+# each worker process opens its own connections with this engine
+_engine = None
+
+
+def init_worker(database_url):
+    """Creates the worker process's engine (run once per worker)"""
+
+    global _engine
+    _engine = create_engine(database_url)
+
+
+def record_source(connection, source, content_hash):
+    """Records that the dump file source, with this content, was loaded"""
+
+    statement = insert(IngestSource.__table__).values(
+        path=source,
+        content_hash=content_hash,
+        loaded_at=datetime.datetime.utcnow(),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[IngestSource.path],
+        set_={
+            "content_hash": statement.excluded.content_hash,
+            "loaded_at": statement.excluded.loaded_at,
+        },
+    )
 
-def dump_data(directory):
+    with connection.begin():
+        connection.execute(statement)
+
+
+def load_file(category, path, force=False):
+    """
+    Normalizes and inserts one dump file; runs in a worker process.
+
+    The file is streamed through read -> filter -> normalize -> insert, so
+    memory use doesn't grow with the size of the file.
+
+    A file whose content hash matches the one recorded when it was last
+    loaded is skipped, unless force is set. The hash is recorded only once
+    the whole file is in, so a failed load is retried on the next run.
+
+    Input:
+        -category (string)
+        -path (Path)
+        -force (bool)
+
+    Output: (category, number of facts inserted, updated or deleted, or
+        None if the file was skipped)
+    """
+
+    source = f"{category}/{path.name}"
+    content_hash = file_hash(path)
+
+    with _engine.connect() as connection:
+        loaded_hash = connection.execute(
+            select(IngestSource.content_hash)
+            .where(IngestSource.path == source)
+        ).scalar()
+
+        if loaded_hash == content_hash and not force:
+            return (category, None)
+
+        with open(path) as f:
+            facts = normalize_facts(category, filter_facts(read_facts(f)))
+            inserted = insert_data(category, facts, connection, source)
+
+        record_source(connection, source, content_hash)
+
+    return (category, inserted)
+
+
+def dump_data(
+    categories=CATEGORIES,
+    workers=None,
+    database_url=DATABASE_URL,
+    force=False,
+    directory=None,
+):
     """
     Controller function that normalizes and inserts data into PSQL database.
 
+    Every dump file of every category is loaded in parallel, in a pool of
+    worker processes that each have their own database connection. Files
+    unchanged since they were last loaded are skipped, unless force is set.
+
+    Prints how many facts were inserted, updated or deleted and how fast.
+
     Input:
-        -directory (string)
+        -categories (list of strings)
+        -workers (int): number of processes, defaults to the number of CPUs
+        -database_url (string)
+        -force (bool): reload every file
+        -directory (Path): where the dumps are, defaults to DUMP_DIRECTORY
+            (e.g. synthetic dumps, see synthetic.py)
+
+    Output: dict of category -> number of facts inserted, updated or deleted
     """
 
-    global direc
-    direc = directory
+    start_time = time.perf_counter()
+    inserted = {category: 0 for category in categories}
+    skipped = 0
 
-    files = os.listdir(f"./{directory}")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(database_url,),
+    ) as pool:
+        tasks = [
+            pool.submit(load_file, category, path, force)
+            for category in categories
+            for path in dump_files(category, directory)
+        ]
 
-    for file in files:
-        (filename, extension) = os.path.splitext(file)
+        for task in tasks:
+            (category, count) = task.result()
 
-        result = None
+            if count is None:
+                skipped += 1
+            else:
+                inserted[category] += count
 
-        if extension == ".txt":
-            with open(f"./{directory}/{file}") as f:
-                text = f.read()
-                result = json.loads(text)
+    elapsed = time.perf_counter() - start_time
+    total = sum(inserted.values())
 
-            normalized_data = normalize_data(result)
+    for category in categories:
+        print(f"{category}: wrote {inserted[category]} facts")
+    print(f"skipped {skipped} unchanged files")
+    print(
+        f"wrote {total} facts in {elapsed:.2f}s "
+        f"({total / elapsed:.0f} rows/s)"
+    )
 
-            for key in normalized_data:
-                insert_data(normalized_data[key])
+    return inserted
 
 
 def format_all_text_to_csv():
     """Formats dates, math, trivia, and years txt files into csv files"""
-    format_text_to_csv("dates")
-    format_text_to_csv("math")
-    format_text_to_csv("trivia")
-    format_text_to_csv("years")
+    for category in CATEGORIES:
+        format_text_to_csv(category)
 
 
-def dump_all_data():
+def dump_all_data(workers=None):
     """Dumps dates, math, trivia, and years data into PSQL database"""
-    dump_data("math")
-    dump_data("trivia")
-    dump_data("years")
-    dump_data("dates")
-
-
-# format_all_text_to_csv()
-dump_all_data()
+    dump_data(CATEGORIES, workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load the facts dumps into the database."
+    )
+    parser.add_argument(
+        "categories",
+        nargs="*",
+        default=CATEGORIES,
+        help=f"any of {', '.join(CATEGORIES)} (default: all)",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--directory",
+        type=Path,
+        help="load the dumps in this directory's category subdirectories "
+             "(default: the shipped ones)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="reload files even if they haven't changed since the last run",
+    )
+    args = parser.parse_args()
+
+    for category in args.categories:
+        if category not in CATEGORIES:
+            parser.error(f"unknown category {category}")
+
+    # format_all_text_to_csv()
+    dump_data(
+        args.categories,
+        args.workers,
+        force=args.force,
+        directory=args.directory,
+    )
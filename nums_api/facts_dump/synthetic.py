@@ -0,0 +1,330 @@
+"""Generate synthetic facts dumps, for trying the API and loader at scale.
+
+The shipped dumps hold a few MB of facts. ``write_dumps`` makes up any
+number of facts per category in the same format::
+
+    {"24": [{"text": "...", "self": false, "pos": "N"}, ...], ...}
+
+(with a "year" on dates facts), so they're loaded through the real ingest
+path, ``scripts.dump_data``::
+
+    python -m nums_api.facts_dump.synthetic /tmp/corpus --facts 10000000
+    python -m nums_api.facts_dump.synthetic /tmp/corpus --facts 100000 --load
+
+Like the real dumps:
+    - facts are spread over keys unevenly: the key of rank r gets facts in
+      proportion to 1 / r ** skew (Zipf's law; skew 0 spreads them evenly).
+      Small numbers and recent years rank first, days of the year in a
+      random order
+    - some facts are about the number itself ("self": true), which the
+      loader filters out
+    - a share of facts repeat an earlier fact's text (under the same key or
+      another), which the loader drops as duplicates
+    - each category is split into files over consecutive keys, which the
+      loader reads in parallel
+
+Facts are written as they're made up, so memory use is one count per key,
+however many facts there are. The same seed makes the same dumps.
+"""
+
+import datetime
+import json
+import random
+from collections import deque
+from pathlib import Path
+
+from nums_api.facts_dump.scripts import CATEGORIES, get_ordinal_suffix
+
+# share of facts about the number itself, dropped when loading
+SELF_SHARE = 0.1
+
+# how many recent facts a duplicate may repeat
+RECENT_FACTS = 1000
+
+ADJECTIVES = [
+    "ancient", "famous", "little-known", "northern", "largest", "oldest",
+    "southern", "first", "second", "last", "official", "historic",
+]
+
+NOUNS = [
+    "bridge", "highway", "river", "treaty", "cathedral", "railway",
+    "university", "lighthouse", "festival", "expedition", "academy", "fort",
+]
+
+PLACES = [
+    "Portugal", "Quebec", "Bavaria", "Kerala", "Patagonia", "Anatolia",
+    "Tasmania", "Saxony", "Bohemia", "Andalusia", "Manitoba", "Hokkaido",
+]
+
+PEOPLE = [
+    "Anselm of Canterbury", "Queen Berengaria", "Simon de Montfort",
+    "Pope Lucius", "Richard of Cornwall", "Eleanor of Aquitaine",
+    "King Casimir", "Emperor Basil", "Duke Godfrey", "Countess Matilda",
+]
+
+MATH_KINDS = [
+    "prime", "palindromic number", "repdigit", "Catalan number",
+    "Harshad number", "triangular number", "happy number", "Smith number",
+]
+
+# (pos, template) of each category's facts; {serial} keeps texts unique
+TEMPLATES = {
+    "math": [
+        ("DET", "The {ordinal} {kind} in base {base}."),
+        ("DET", "A {kind} whose digits add up to {serial}."),
+        ("N", "{Kind} {serial} of the {adjective} sequence."),
+    ],
+    "trivia": [
+        ("NP", "Route {serial} in {place} is a {adjective} {noun}."),
+        ("DET", "The number of the {adjective} {noun} {serial} in {place}."),
+        ("DET", "The number of steps up the {noun} of {place} ({serial})."),
+    ],
+    "years": [
+        ("NP", "{person} founds the {adjective} {noun} {serial} in {place}."),
+        ("DET", "The {adjective} {noun} {serial} of {place} is completed."),
+        ("NP", "{person} becomes ruler of {place} (charter {serial})."),
+    ],
+    "dates": [
+        ("NP", "{person} opens the {adjective} {noun} {serial} in {place}."),
+        ("DET", "The {noun} of {place} {serial} is signed."),
+        ("DET", "The {adjective} {noun} {serial} opens in {place}."),
+    ],
+}
+
+
+def default_keys(category, facts):
+    """Return how many distinct keys the category's facts are spread over.
+
+    Numbers get one key per 10 facts; years and days of the year are
+    bounded.
+    """
+
+    if category == "years":
+        return datetime.date.today().year
+    if category == "dates":
+        return 366
+
+    return max(100, facts // 10)
+
+
+def key_order(category, keys, rng):
+    """Return list of the category's keys, most facts first."""
+
+    if category == "years":
+        this_year = datetime.date.today().year
+        return [this_year - rank for rank in range(keys)]
+
+    if category == "dates":
+        days = list(range(1, keys + 1))
+        rng.shuffle(days)
+        return days
+
+    return list(range(keys))
+
+
+def key_counts(facts, keys, skew, rng):
+    """Return list of how many facts each key rank gets, summing to facts."""
+
+    weights = [1 / (rank + 1) ** skew for rank in range(keys)]
+    total = sum(weights)
+    counts = [int(facts * weight / total) for weight in weights]
+
+    # hand out what rounding down left, in proportion too
+    for rank in rng.choices(range(keys), weights, k=facts - sum(counts)):
+        counts[rank] += 1
+
+    return counts
+
+
+class FactMaker:
+    """Makes up facts for one category."""
+
+    def __init__(self, category, duplicates, rng):
+        self.category = category
+        self.templates = TEMPLATES[category]
+        self.duplicates = duplicates
+        self.rng = rng
+        self.serial = 0
+        self.recent = deque(maxlen=RECENT_FACTS)
+
+    def fact(self):
+        """Return a new fact, or a repeat of a recent one's text."""
+
+        rng = self.rng
+
+        if self.recent and rng.random() < self.duplicates:
+            (pos, text) = rng.choice(self.recent)
+        else:
+            self.serial += 1
+            (pos, template) = rng.choice(self.templates)
+            kind = rng.choice(MATH_KINDS)
+            text = template.format(
+                serial=self.serial,
+                ordinal=get_ordinal_suffix(self.serial),
+                kind=kind,
+                Kind=kind[0].upper() + kind[1:],
+                base=rng.randint(2, 36),
+                adjective=rng.choice(ADJECTIVES),
+                noun=rng.choice(NOUNS),
+                place=rng.choice(PLACES),
+                person=rng.choice(PEOPLE),
+            )
+            self.recent.append((pos, text))
+
+        fact = {"text": text, "self": rng.random() < SELF_SHARE, "pos": pos}
+
+        if self.category == "dates":
+            fact["year"] = rng.randint(1, datetime.date.today().year)
+
+        return fact
+
+
+def write_dumps(
+    directory,
+    categories=CATEGORIES,
+    facts=10_000,
+    keys=None,
+    skew=1.0,
+    duplicates=0.01,
+    files=4,
+    seed=0,
+):
+    """
+    Writes synthetic dump files, like the shipped ones, into directory
+
+    Input:
+        - directory (Path): gets a subdirectory per category, as
+            scripts.DUMP_DIRECTORY has
+        - categories (list of strings)
+        - facts (int): facts per category, before the loader drops any
+        - keys (int): distinct numbers math and trivia facts are spread
+            over (default: see default_keys)
+        - skew (float): Zipf exponent of facts per key (0: even)
+        - duplicates (float): share of facts repeating an earlier text
+        - files (int): files per category, at most
+        - seed (int)
+
+    Output: dict of category -> list of Paths written
+    """
+
+    rng = random.Random(seed)
+    written = {}
+
+    for category in categories:
+        if keys and category in ("math", "trivia"):
+            count = keys
+        else:
+            count = default_keys(category, facts)
+
+        counts = dict(zip(
+            key_order(category, count, rng),
+            key_counts(facts, count, skew, rng),
+        ))
+        ordered = sorted(key for key in counts if counts[key])
+        maker = FactMaker(category, duplicates, rng)
+
+        category_directory = Path(directory, category)
+        category_directory.mkdir(parents=True, exist_ok=True)
+        written[category] = []
+
+        # consecutive keys per file, about as many facts in each
+        per_file = facts / files
+        start = 0
+
+        while start < len(ordered):
+            end = start
+            in_file = 0
+
+            while end < len(ordered) and (in_file < per_file or end == start):
+                in_file += counts[ordered[end]]
+                end += 1
+
+            path = category_directory / (
+                f"synthetic_{ordered[start]}_{ordered[end - 1]}.txt"
+            )
+            write_dump(path, ordered[start:end], counts, maker)
+            written[category].append(path)
+            start = end
+
+    return written
+
+
+def write_dump(path, keys, counts, maker):
+    """Write one dump file of counts[key] of maker's facts for each key."""
+
+    with open(path, "w") as f:
+        f.write("{")
+
+        for (i, key) in enumerate(keys):
+            f.write(f'{", " if i else ""}"{key}": [')
+
+            for j in range(counts[key]):
+                f.write(f'{", " if j else ""}{json.dumps(maker.fact())}')
+
+            f.write("]")
+
+        f.write("}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from nums_api.config import DATABASE_URL, DATABASE_URL_TEST
+    from nums_api.facts_dump.scripts import dump_data
+
+    parser = argparse.ArgumentParser(
+        description="Write synthetic facts dumps, and optionally load them."
+    )
+    parser.add_argument("directory", type=Path)
+    parser.add_argument(
+        "categories",
+        nargs="*",
+        default=CATEGORIES,
+        help=f"any of {', '.join(CATEGORIES)} (default: all)",
+    )
+    parser.add_argument("--facts", type=int, default=10_000,
+                        help="facts per category (default: 10000)")
+    parser.add_argument("--keys", type=int,
+                        help="distinct math and trivia numbers "
+                             "(default: a tenth of --facts)")
+    parser.add_argument("--skew", type=float, default=1.0,
+                        help="Zipf exponent of facts per key, 0 for even "
+                             "(default: 1.0)")
+    parser.add_argument("--duplicates", type=float, default=0.01,
+                        help="share of repeated facts (default: 0.01)")
+    parser.add_argument("--files", type=int, default=4,
+                        help="files per category (default: 4)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load", action="store_true",
+                        help="load the dumps through facts_dump's loader")
+    parser.add_argument("--test-db", action="store_true",
+                        help="load into DATABASE_URL_TEST, not DATABASE_URL")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    for category in args.categories:
+        if category not in CATEGORIES:
+            parser.error(f"unknown category {category}")
+
+    written = write_dumps(
+        args.directory,
+        args.categories,
+        facts=args.facts,
+        keys=args.keys,
+        skew=args.skew,
+        duplicates=args.duplicates,
+        files=args.files,
+        seed=args.seed,
+    )
+
+    for (category, paths) in written.items():
+        print(f"{category}: wrote {len(paths)} files")
+
+    if args.load:
+        dump_data(
+            args.categories,
+            args.workers,
+            database_url=DATABASE_URL_TEST if args.test_db else DATABASE_URL,
+            force=True,
+            directory=args.directory,
+        )
@@ -0,0 +1,51 @@
+import json
+from io import StringIO
+from unittest import TestCase
+from nums_api.facts_dump.reader import read_facts
+
+DUMP = {
+    "1": [
+        {"text": "The loneliest number.", "self": False, "pos": "N"},
+        {"text": "Unicode é and \"quotes\" {}[],:", "self": True},
+    ],
+    "2": [],
+    "12345": [{"text": "Digits.", "year": -12345, "ratio": 1.5e10}],
+}
+
+
+class ReadFactsTestCase(TestCase):
+    def expected_facts(self, dump):
+        return [(key, fact) for key in dump for fact in dump[key]]
+
+    def test_read_facts(self):
+        """Makes sure facts are read in order, in any chunk size"""
+
+        for indent in [None, 4]:
+            text = json.dumps(DUMP, indent=indent)
+
+            for chunk_size in [1, 3, 7, 64, len(text) * 2]:
+                with self.subTest(indent=indent, chunk_size=chunk_size):
+                    facts = read_facts(StringIO(text), chunk_size=chunk_size)
+
+                    self.assertEqual(
+                        list(facts),
+                        self.expected_facts(DUMP)
+                    )
+
+    def test_read_facts_lazily(self):
+        """Makes sure facts are yielded before the rest of the file is read"""
+
+        dump = StringIO(json.dumps(DUMP))
+        facts = read_facts(dump, chunk_size=16)
+
+        self.assertEqual(next(facts), self.expected_facts(DUMP)[0])
+        self.assertLess(dump.tell(), len(dump.getvalue()))
+
+    def test_read_empty_dump(self):
+        self.assertEqual(list(read_facts(StringIO(" { } "))), [])
+
+    def test_read_malformed_dump(self):
+        for text in ['["1"]', '{"1": [{"text": "x"}', '{"1": {"text": "x"}}']:
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(read_facts(StringIO(text), chunk_size=4))
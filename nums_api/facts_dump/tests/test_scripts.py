@@ -0,0 +1,336 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.dates.models import Date, DateLikeCounter
+from nums_api.facts_dump.models import IngestSource
+from nums_api.facts_dump import scripts
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+def make_fact(number, text, year=None):
+    fact = {
+        "number": number,
+        "fact_fragment": text,
+        "fact_statement": f"{number} is {text}.",
+        "was_submitted": False,
+    }
+
+    if year is not None:
+        fact["year"] = year
+
+    return fact
+
+
+class InsertDataTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+        DateLikeCounter.query.delete()
+        Date.query.delete()
+        IngestSource.query.delete()
+        db.session.commit()
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+
+    def insert_data(self, category, facts):
+        with db.engine.connect() as connection:
+            return scripts.insert_data(category, facts, connection)
+
+    def test_insert_data(self):
+        inserted = self.insert_data("trivia", [
+            make_fact(1, "the loneliest number"),
+            make_fact(2, "the only even prime"),
+        ])
+
+        self.assertEqual(inserted, 2)
+        self.assertEqual(
+            Trivia.query.filter_by(number=2).one().fact_statement,
+            "2 is the only even prime."
+        )
+
+    def test_insert_data_skips_duplicates(self):
+        """Makes sure duplicates in the batch and in the table are skipped"""
+
+        self.insert_data("trivia", [make_fact(1, "the loneliest number")])
+        inserted = self.insert_data("trivia", [
+            make_fact(1, "the loneliest number"),
+            make_fact(2, "the only even prime"),
+            make_fact(2, "the only even prime"),
+        ])
+
+        self.assertEqual(inserted, 1)
+        self.assertEqual(Trivia.query.count(), 2)
+
+    def test_insert_data_skips_too_long(self):
+        """Makes sure a fact too long for its column doesn't fail the batch"""
+
+        inserted = self.insert_data("trivia", [
+            make_fact(1, "x" * 201),
+            make_fact(2, "the only even prime"),
+        ])
+
+        self.assertEqual(inserted, 1)
+        self.assertEqual(Trivia.query.one().number, 2)
+
+    def test_insert_data_batches(self):
+        """Makes sure facts are written across several batches"""
+
+        facts = [
+            make_fact(n % 366 + 1, f"the day of test fact {n}", year=2000)
+            for n in range(scripts.BATCH_SIZE * 2 + 1)
+        ]
+        facts.append(facts[0])
+
+        inserted = self.insert_data("dates", facts)
+
+        self.assertEqual(inserted, scripts.BATCH_SIZE * 2 + 1)
+        self.assertEqual(Date.query.count(), scripts.BATCH_SIZE * 2 + 1)
+
+    def test_insert_data_updates_changed(self):
+        """Makes sure only new or changed facts are written again"""
+
+        self.insert_data("trivia", [make_fact(1, "the loneliest number")])
+        t1 = Trivia.query.one()
+
+        self.assertEqual(
+            self.insert_data("trivia", [make_fact(1, "the loneliest number")]),
+            0
+        )
+
+        changed = make_fact(1, "the loneliest number")
+        changed["fact_statement"] = "One is the loneliest number."
+
+        inserted = self.insert_data("trivia", [
+            changed,
+            make_fact(2, "the loneliest number"),
+            make_fact(3, "a prime"),
+        ])
+
+        self.assertEqual(inserted, 2)
+        db.session.refresh(t1)
+        self.assertEqual(t1.number, 1)
+        self.assertEqual(t1.fact_statement, "One is the loneliest number.")
+        self.assertEqual(Trivia.query.count(), 2)
+
+    def test_insert_data_keeps_submitted(self):
+        """Makes sure facts submitted through the API aren't overwritten"""
+
+        t1 = Trivia(**make_fact(1, "the loneliest number"))
+        t1.was_submitted = True
+        db.session.add(t1)
+        db.session.commit()
+
+        changed = make_fact(1, "the loneliest number")
+        changed["fact_statement"] = "One is the loneliest number."
+
+        self.assertEqual(self.insert_data("trivia", [changed]), 0)
+        db.session.refresh(t1)
+        self.assertEqual(t1.fact_statement, "1 is the loneliest number.")
+
+    def write_dumps(self, directory, text="Fact"):
+        """Writes two trivia dump files and a dates one in directory"""
+
+        for (category, name, number) in [
+            ("trivia", "wikipedia_1.txt", "1"),
+            ("trivia", "wikipedia_2.txt", "2"),
+            ("dates", "wikipedia_1.txt", "45"),
+        ]:
+            facts = [
+                {"text": f"{text} {number}.", "self": False, "pos": "N"},
+                {"text": "Ignored fact.", "self": True, "pos": "N"},
+            ]
+            for fact in facts:
+                fact["year"] = 2000
+
+            Path(directory, category).mkdir(exist_ok=True)
+            Path(directory, category, name).write_text(
+                json.dumps({number: facts})
+            )
+
+    def dump_data(self, directory, force=False):
+        dump_directory = scripts.DUMP_DIRECTORY
+        scripts.DUMP_DIRECTORY = Path(directory)
+
+        try:
+            return scripts.dump_data(
+                ["trivia", "dates"],
+                workers=2,
+                database_url=DATABASE_URL_TEST,
+                force=force,
+            )
+        finally:
+            scripts.DUMP_DIRECTORY = dump_directory
+
+    def test_dump_data(self):
+        """Makes sure every category's files are loaded by the worker pool"""
+
+        with TemporaryDirectory() as directory:
+            self.write_dumps(directory)
+            inserted = self.dump_data(directory)
+
+        self.assertEqual(inserted, {"trivia": 2, "dates": 1})
+        self.assertEqual(Trivia.query.count(), 2)
+        self.assertEqual(Date.query.one().day_of_year, 45)
+        self.assertEqual(
+            sorted(source.path for source in IngestSource.query),
+            ["dates/wikipedia_1.txt",
+             "trivia/wikipedia_1.txt",
+             "trivia/wikipedia_2.txt"]
+        )
+
+    def test_dump_data_skips_unchanged_files(self):
+        """Makes sure a re-run only loads files changed since the last one"""
+
+        with TemporaryDirectory() as directory:
+            self.write_dumps(directory)
+            self.dump_data(directory)
+
+            self.assertEqual(
+                self.dump_data(directory),
+                {"trivia": 0, "dates": 0}
+            )
+
+            # the changed fact is written, and the one it replaced deleted
+            Path(directory, "trivia", "wikipedia_2.txt").write_text(
+                json.dumps({"2": [{"text": "Changed.", "self": False}]})
+            )
+            self.assertEqual(
+                self.dump_data(directory),
+                {"trivia": 2, "dates": 0}
+            )
+
+            # forced, every file is read again, but no fact has changed
+            self.assertEqual(
+                self.dump_data(directory, force=True),
+                {"trivia": 0, "dates": 0}
+            )
+
+        self.assertEqual(
+            sorted(trivia.fact_fragment for trivia in Trivia.query),
+            ["changed", "fact 1"]
+        )
+
+    def test_dump_data_matches_unhashed_facts(self):
+        """Makes sure facts loaded before content hashes are matched by
+        their text on the next load, not written again"""
+
+        with TemporaryDirectory() as directory:
+            self.write_dumps(directory)
+            self.dump_data(directory)
+
+            # as left by migrations 0002 and 0005
+            Trivia.query.update({"content_hash": None, "source": None})
+            Date.query.update({"content_hash": None, "source": None})
+            d1 = Date.query.one()
+            d1.fact_statement = "Old statement."
+            db.session.commit()
+
+            self.assertEqual(
+                self.dump_data(directory, force=True),
+                {"trivia": 2, "dates": 1}
+            )
+
+        self.assertEqual(Trivia.query.count(), 2)
+        self.assertEqual(Date.query.one().id, d1.id)
+        db.session.refresh(d1)
+        self.assertEqual(d1.source, "dates/wikipedia_1.txt")
+        self.assertIsNotNone(d1.content_hash)
+        self.assertNotEqual(d1.fact_statement, "Old statement.")
+
+    def test_dump_data_deletes_removed_facts(self):
+        """Makes sure facts taken out of a file go when it's reloaded, with
+        their likes, and other files' and submitted facts stay"""
+
+        with TemporaryDirectory() as directory:
+            self.write_dumps(directory)
+            self.dump_data(directory)
+
+            t1 = Trivia.query.filter_by(number=1).one()
+            db.session.add(TriviaLikeCounter(trivia_id=t1.id, num_likes=2))
+            submitted = Trivia(**make_fact(1, "the loneliest number"))
+            submitted.was_submitted = True
+            db.session.add(submitted)
+            db.session.commit()
+
+            Path(directory, "trivia", "wikipedia_1.txt").write_text("{}")
+            Path(directory, "dates", "wikipedia_1.txt").write_text(
+                json.dumps({"45": [
+                    {"text": "Changed.", "self": False, "year": 2000}
+                ]})
+            )
+
+            self.assertEqual(
+                self.dump_data(directory),
+                {"trivia": 1, "dates": 2}
+            )
+
+        self.assertEqual(
+            sorted(trivia.fact_fragment for trivia in Trivia.query),
+            ["fact 2", "the loneliest number"]
+        )
+        self.assertEqual(TriviaLikeCounter.query.count(), 0)
+        self.assertEqual(Date.query.one().fact_fragment, "changed")
+
+
+class FormatTestCase(TestCase):
+    def test_get_ordinal_suffix(self):
+        self.assertEqual(scripts.get_ordinal_suffix(1), "1st")
+        self.assertEqual(scripts.get_ordinal_suffix(12), "12th")
+        self.assertEqual(scripts.get_ordinal_suffix(22), "22nd")
+        self.assertEqual(scripts.get_ordinal_suffix(23), "23rd")
+
+    def test_normalize_fact(self):
+        fact = scripts.normalize_fact(
+            "years",
+            "1969",
+            {"text": "Humans walk on the Moon.", "self": False, "pos": "N"}
+        )
+
+        self.assertEqual(fact, {
+            "number": 1969,
+            "fact_fragment": "humans walk on the Moon",
+            "fact_statement": "1969 is the year that humans walk on the Moon.",
+            "was_submitted": False,
+        })
+
+    def test_normalize_facts(self):
+        """Makes sure unwanted and unsupported facts are dropped"""
+
+        facts = scripts.normalize_facts("trivia", scripts.filter_facts([
+            ("1", {"text": "The loneliest number.", "self": False, "pos": "N"}),
+            ("1", {"text": "Ignored fact.", "self": True, "pos": "N"}),
+            ("2", {"text": "Is it prime?", "self": False, "pos": "V"}),
+            ("3", {"text": "An odd prime", "self": False, "pos": "N"}),
+        ]))
+
+        self.assertEqual(
+            [fact["fact_statement"] for fact in facts],
+            ["1 is the loneliest number.", "3 is an odd prime."]
+        )
+
+    def test_normalize_fact_unsupported_ending(self):
+        fact = scripts.normalize_fact(
+            "trivia",
+            "1",
+            {"text": "Is it the loneliest?", "self": False, "pos": "V"}
+        )
+
+        self.assertIsNone(fact)
@@ -0,0 +1,136 @@
+import random
+from collections import Counter
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.dates.models import Date, DateLikeCounter
+from nums_api.facts_dump.models import IngestSource
+from nums_api.facts_dump.reader import read_facts
+from nums_api.facts_dump import scripts, synthetic
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+def read_dumps(paths):
+    """Return list of (key, fact) of the dump files, in order."""
+
+    facts = []
+
+    for path in paths:
+        with open(path) as f:
+            facts.extend(read_facts(f))
+
+    return facts
+
+
+class WriteDumpsTestCase(TestCase):
+    def test_key_counts(self):
+        counts = synthetic.key_counts(1000, 10, 1.0, random.Random(0))
+
+        self.assertEqual(sum(counts), 1000)
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        self.assertGreater(counts[0], 5 * counts[9])
+
+        # no skew spreads facts evenly
+        self.assertEqual(
+            synthetic.key_counts(1000, 10, 0, random.Random(0)), [100] * 10
+        )
+
+    def test_write_dumps(self):
+        """Makes sure dumps have the facts asked for, in consecutive files"""
+
+        with TemporaryDirectory() as directory:
+            written = synthetic.write_dumps(
+                directory, ["trivia", "dates"], facts=1000, files=3
+            )
+            trivia = read_dumps(written["trivia"])
+            dates = read_dumps(written["dates"])
+
+        self.assertEqual(len(trivia), 1000)
+        self.assertEqual(len(dates), 1000)
+        self.assertLessEqual(len(written["trivia"]), 3)
+
+        # keys are in order across files, small numbers having the most
+        keys = [int(key) for (key, fact) in trivia]
+        self.assertEqual(keys, sorted(keys))
+        per_key = Counter(keys)
+        self.assertEqual(per_key.most_common(1)[0][0], 0)
+        self.assertLessEqual(max(keys), 99)
+
+        self.assertTrue(all(1 <= int(key) <= 366 for (key, fact) in dates))
+        self.assertTrue(all("year" in fact for (key, fact) in dates))
+
+        # some facts repeat, and some are about the number itself
+        texts = Counter(fact["text"] for (key, fact) in trivia)
+        self.assertLess(len(texts), 1000)
+        self.assertTrue(any(fact["self"] for (key, fact) in trivia))
+
+    def test_write_dumps_seeded(self):
+        """Makes sure the same seed makes the same dumps"""
+
+        dumps = []
+
+        for seed in [1, 1, 2]:
+            with TemporaryDirectory() as directory:
+                written = synthetic.write_dumps(
+                    directory, ["math"], facts=200, seed=seed
+                )
+                dumps.append(read_dumps(written["math"]))
+
+        self.assertEqual(dumps[0], dumps[1])
+        self.assertNotEqual(dumps[0], dumps[2])
+
+
+class LoadDumpsTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+        DateLikeCounter.query.delete()
+        Date.query.delete()
+        IngestSource.query.delete()
+        db.session.commit()
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+
+    def test_load_synthetic_dumps(self):
+        """Makes sure synthetic dumps load through the ingest path, minus
+        self facts and duplicates"""
+
+        with TemporaryDirectory() as directory:
+            written = synthetic.write_dumps(
+                directory, ["trivia", "dates"], facts=500, duplicates=0.05
+            )
+            inserted = scripts.dump_data(
+                ["trivia", "dates"],
+                workers=2,
+                database_url=DATABASE_URL_TEST,
+                directory=directory,
+            )
+            trivia = read_dumps(written["trivia"])
+
+        # fact fragments are unique, so a repeated text is kept once
+        kept = {fact["text"] for (key, fact) in trivia if not fact["self"]}
+
+        self.assertEqual(inserted["trivia"], len(kept))
+        self.assertLess(inserted["trivia"], 500)
+        self.assertEqual(Trivia.query.count(), len(kept))
+        self.assertEqual(Date.query.count(), inserted["dates"])
+        self.assertEqual(
+            IngestSource.query.count(),
+            len(written["trivia"]) + len(written["dates"])
+        )
@@ -0,0 +1,71 @@
+from nums_api.database import db
+
+
+class LikeEvent(db.Model):
+    """Likes of one fact, appended when they're recorded.
+
+    Events are append-only: nothing updates them, and rolling them up
+    (see nums_api.likes.trending) moves them into like_rollups.
+    """
+
+    __tablename__ = "like_events"
+
+    id = db.Column(
+        db.BigInteger,
+        primary_key=True,
+        autoincrement=True
+    )
+
+    # the liked fact's table, like "math", and its id there
+    fact_table = db.Column(
+        db.String(20),
+        nullable=False
+    )
+
+    fact_id = db.Column(
+        db.Integer,
+        nullable=False
+    )
+
+    num_likes = db.Column(
+        db.Integer,
+        nullable=False,
+        default=1
+    )
+
+    liked_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        server_default=db.func.now()
+    )
+
+
+class LikeRollup(db.Model):
+    """A fact's likes in one hour."""
+
+    __tablename__ = "like_rollups"
+
+    __table_args__ = (
+        db.Index("ix_like_rollups_fact_table_bucket", "fact_table", "bucket"),
+    )
+
+    fact_table = db.Column(
+        db.String(20),
+        primary_key=True
+    )
+
+    fact_id = db.Column(
+        db.Integer,
+        primary_key=True
+    )
+
+    # start of the hour
+    bucket = db.Column(
+        db.DateTime(timezone=True),
+        primary_key=True
+    )
+
+    num_likes = db.Column(
+        db.Integer,
+        nullable=False
+    )
@@ -0,0 +1,75 @@
+from flask import request
+from werkzeug.exceptions import BadRequest
+
+from nums_api.batch import parse_int
+from nums_api.cache.likes import TOP_SIZE
+from nums_api.likes.trending import maybe_roll_up_likes, trending_scores
+
+# facts listed when a request doesn't give a limit
+DEFAULT_TOP_LIMIT = 10
+
+
+def parse_limit():
+    """Return the request's ?limit=N, from 1 to TOP_SIZE."""
+
+    try:
+        limit = parse_int(request.args.get("limit", str(DEFAULT_TOP_LIMIT)))
+    except ValueError as e:
+        (error_msg, ) = e.args
+        raise BadRequest(error_msg)
+
+    if not 1 <= limit <= TOP_SIZE:
+        raise BadRequest(f"Invalid data: limit must be from 1 to {TOP_SIZE}")
+
+    return limit
+
+
+def ranked_facts(model, ranking, name):
+    """Return list of model's facts in ranking, a list of (fact id, value).
+
+    Each is the fact's serialize() with the value added as name, in order.
+    Facts deleted since they were ranked are left out.
+    """
+
+    facts = {
+        fact.id: fact
+        for fact in model.query.filter(
+            model.id.in_([fact_id for (fact_id, value) in ranking])
+        )
+    }
+
+    return [
+        {**facts[fact_id].serialize(), name: value}
+        for (fact_id, value) in ranking
+        if fact_id in facts
+    ]
+
+
+def top_facts(recorder):
+    """Return list of the most liked of recorder's facts, for ?limit=N.
+
+    Each is the fact's serialize() with its "likes" added, most liked
+    first. The ranking is kept in memory (see LikeCounts), so this is one
+    query for the facts themselves, however many facts there are.
+    """
+
+    ranking = recorder.counts.top(parse_limit())
+    return ranked_facts(recorder.model, ranking, "likes")
+
+
+def trending_facts(recorder):
+    """Return list of recorder's top trending facts, for ?limit=N.
+
+    Each is the fact's serialize() with its decayed like "score" added,
+    highest first (see nums_api.likes.trending).
+    """
+
+    limit = parse_limit()
+    maybe_roll_up_likes()
+
+    ranking = [
+        (fact_id, round(score, 4))
+        for (fact_id, score)
+        in trending_scores(recorder.model.__tablename__, limit)
+    ]
+    return ranked_facts(recorder.model, ranking, "score")
@@ -0,0 +1,247 @@
+"""Record likes with one atomic statement, optionally buffered in memory.
+
+A like is an upsert-increment of the fact's like counter, plus an entry
+appended to the like event log (for trending facts), in one statement::
+
+    WITH liked AS (SELECT math.id AS fact_id, 1 AS amount
+                   FROM math WHERE math.id = :fact_id),
+    events AS (INSERT INTO like_events (fact_table, fact_id, num_likes)
+               SELECT 'math', fact_id, amount FROM liked)
+    INSERT INTO math_like_counters (math_id, num_likes)
+    SELECT fact_id, amount FROM liked
+    ON CONFLICT (math_id)
+    DO UPDATE SET num_likes = math_like_counters.num_likes + excluded.num_likes
+
+so there's a single round trip, no lost updates between concurrent likes and
+no race creating the counter. If the fact doesn't exist the SELECT is empty
+and nothing is written.
+
+When ``LIKE_FLUSH_INTERVAL`` is set, likes are instead added up in memory and
+written in batches every that many seconds, trading a short delay (and the
+likes of a crashed process) for far fewer writes.
+"""
+
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from flask import current_app
+from sqlalchemy import (
+    Integer, bindparam, cast, column, literal, select, values,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from nums_api.cache.likes import LikeCounts
+from nums_api.database import db
+from nums_api.likes.models import LikeEvent
+from nums_api.metrics import LIKES, LIKE_WRITES
+
+logger = logging.getLogger(__name__)
+
+# every LikeRecorder, so the background flusher can write them all
+_recorders = []
+_flusher = None
+_flusher_lock = threading.Lock()
+# set to stop the flusher
+_stopping = threading.Event()
+
+
+class LikeRecorder:
+    """Records likes for one category's facts."""
+
+    def __init__(self, model, like_model, sampler):
+        """Record likes of model's facts in like_model's counters.
+
+        sampler is the category's RandomFactSampler; its ids are used to
+        check buffered likes are for facts that exist, without a query for
+        facts it already has.
+
+        Likes are also added to ``counts``, the category's LikeCounts, once
+        they're written.
+        """
+
+        self.model = model
+        self.like_model = like_model
+        self.sampler = sampler
+        self.counts = LikeCounts(like_model)
+        self.pending = Counter()
+        self.lock = threading.Lock()
+        self.likes_metric = LIKES.labels(model.__tablename__)
+        self.writes_metric = LIKE_WRITES.labels(model.__tablename__)
+        self.statement = self._like_statement(
+            select(
+                self.model.id.label("fact_id"),
+                cast(bindparam("amount"), Integer).label("amount"),
+            )
+            .where(self.model.id == bindparam("fact_id"))
+        )
+        _recorders.append(self)
+
+    def _like_statement(self, new_likes):
+        """Build the statement adding new_likes to the counters and the log.
+
+        new_likes is a SELECT of (fact_id, amount) rows. Its rowcount is the
+        number of facts liked.
+        """
+
+        counters = self.like_model.__table__
+        (fact_id_column, ) = [c for c in counters.c if c.foreign_keys]
+        liked = new_likes.cte("liked")
+
+        events = insert(LikeEvent.__table__).from_select(
+            ["fact_table", "fact_id", "num_likes"],
+            select(
+                literal(self.model.__tablename__),
+                liked.c.fact_id,
+                liked.c.amount,
+            ),
+        )
+
+        statement = insert(counters).from_select(
+            [fact_id_column.name, "num_likes"],
+            select(liked.c.fact_id, liked.c.amount),
+        )
+        num_likes = counters.c.num_likes + statement.excluded.num_likes
+
+        return statement.on_conflict_do_update(
+            index_elements=[fact_id_column],
+            set_={"num_likes": num_likes},
+        ).add_cte(events.cte("events"))
+
+    def record(self, fact_id):
+        """Like the fact with this id.
+
+        Returns False if there's no such fact.
+        """
+
+        if current_app.config.get("LIKE_FLUSH_INTERVAL"):
+            # facts added by other processes aren't in the sampler until it
+            # reloads, so ask the database before turning the like away
+            if fact_id not in self.sampler and not self._exists(fact_id):
+                return False
+
+            with self.lock:
+                self.pending[fact_id] += 1
+
+            self.likes_metric.inc()
+            _start_flusher(current_app._get_current_object())
+            return True
+
+        result = db.session.execute(
+            self.statement,
+            {"fact_id": fact_id, "amount": 1},
+        )
+        db.session.commit()
+        self.writes_metric.inc()
+
+        if result.rowcount != 1:
+            return False
+
+        self.likes_metric.inc()
+        self.counts.incr(fact_id)
+        return True
+
+    def _exists(self, fact_id):
+        return db.session.execute(
+            select(self.model.id).where(self.model.id == fact_id)
+        ).first() is not None
+
+    def flush(self):
+        """Write the buffered likes with a single statement.
+
+        The likes are joined against the facts table from a VALUES list, so
+        likes for facts deleted in the meantime are dropped. Each fact gets
+        one event in the log, for all its likes since the last flush.
+        """
+
+        with self.lock:
+            (pending, self.pending) = (self.pending, Counter())
+
+        if not pending:
+            return
+
+        likes = values(
+            column("fact_id", Integer),
+            column("amount", Integer),
+            name="likes",
+        ).data(list(pending.items()))
+
+        statement = self._like_statement(
+            select(self.model.id.label("fact_id"), likes.c.amount)
+            .join(likes, self.model.id == likes.c.fact_id)
+        )
+
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(statement)
+        except Exception:
+            # keep the likes for the next flush
+            with self.lock:
+                self.pending.update(pending)
+            raise
+
+        self.writes_metric.inc()
+
+        for (fact_id, amount) in pending.items():
+            self.counts.incr(fact_id, amount)
+
+
+def flush_likes():
+    """Write every recorder's buffered likes. Needs an app context."""
+
+    for recorder in _recorders:
+        recorder.flush()
+
+
+def _start_flusher(app):
+    """Start the thread writing buffered likes, if it isn't running yet."""
+
+    global _flusher
+
+    if _flusher is not None:
+        return
+
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(
+                target=_flush_periodically,
+                args=(app,),
+                name="like-flusher",
+                daemon=True,
+            )
+            _flusher.start()
+            atexit.register(_flush_at_exit, app)
+
+
+def stop_flusher():
+    """Stop the thread writing buffered likes, if it's running.
+
+    Likes still buffered are left for flush_likes.
+    """
+
+    global _flusher
+
+    with _flusher_lock:
+        if _flusher is None:
+            return
+
+        _stopping.set()
+        _flusher.join()
+        atexit.unregister(_flush_at_exit)
+        _stopping.clear()
+        _flusher = None
+
+
+def _flush_periodically(app):
+    with app.app_context():
+        while not _stopping.wait(app.config["LIKE_FLUSH_INTERVAL"] or 1):
+            try:
+                flush_likes()
+            except Exception:
+                logger.exception("Failed to write buffered likes")
+
+
+def _flush_at_exit(app):
+    with app.app_context():
+        flush_likes()
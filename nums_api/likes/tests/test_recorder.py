@@ -0,0 +1,169 @@
+from threading import Thread
+from unittest import TestCase
+from sqlalchemy import insert
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.trivia.routes import trivia_likes
+from nums_api.likes import recorder
+from nums_api.likes.recorder import flush_likes, stop_flusher
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+THREADS = 8
+LIKES_PER_THREAD = 250
+
+
+class LikeRecorderTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+
+        self.t1 = Trivia(
+            number=1,
+            fact_fragment="the number for this t1 test fact fragment",
+            fact_statement="1 is the number for this t1 test fact statement.",
+            was_submitted=False
+        )
+
+        self.t2 = Trivia(
+            number=2,
+            fact_fragment="the number for this t2 test fact fragment",
+            fact_statement="2 is the number for this t2 test fact statement.",
+            was_submitted=False
+        )
+
+        db.session.add_all([self.t1, self.t2])
+        db.session.commit()
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+        stop_flusher()
+        app.config["LIKE_FLUSH_INTERVAL"] = 0
+
+    def num_likes(self, trivia_id):
+        counter = TriviaLikeCounter.query.filter_by(trivia_id=trivia_id).one()
+        db.session.refresh(counter)
+        return counter.num_likes
+
+    def like_concurrently(self):
+        """Like t1 and t2 from THREADS threads, LIKES_PER_THREAD times each."""
+
+        ids = [self.t1.id, self.t2.id]
+        recorded = []
+
+        def like_many():
+            with app.app_context():
+                for i in range(LIKES_PER_THREAD):
+                    recorded.append(trivia_likes.record(ids[i % 2]))
+
+        threads = [Thread(target=like_many) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(recorded, [True] * THREADS * LIKES_PER_THREAD)
+
+    def test_record(self):
+        self.assertTrue(trivia_likes.record(self.t1.id))
+        self.assertEqual(self.num_likes(self.t1.id), 1)
+
+        self.assertTrue(trivia_likes.record(self.t1.id))
+        self.assertEqual(self.num_likes(self.t1.id), 2)
+
+    def test_record_missing_fact(self):
+        self.assertFalse(trivia_likes.record(-1))
+        self.assertEqual(TriviaLikeCounter.query.count(), 0)
+
+    def test_concurrent_likes(self):
+        """Makes sure no likes are lost when they arrive at the same time"""
+
+        self.like_concurrently()
+
+        expected = THREADS * LIKES_PER_THREAD // 2
+        self.assertEqual(self.num_likes(self.t1.id), expected)
+        self.assertEqual(self.num_likes(self.t2.id), expected)
+
+    def test_buffered_likes(self):
+        """Makes sure buffered likes are all written by a flush"""
+
+        app.config["LIKE_FLUSH_INTERVAL"] = 60
+
+        self.assertFalse(trivia_likes.record(-1))
+        self.like_concurrently()
+
+        self.assertEqual(TriviaLikeCounter.query.count(), 0)
+
+        flush_likes()
+
+        expected = THREADS * LIKES_PER_THREAD // 2
+        self.assertEqual(self.num_likes(self.t1.id), expected)
+        self.assertEqual(self.num_likes(self.t2.id), expected)
+
+    def test_buffered_likes_of_deleted_fact(self):
+        """Makes sure buffered likes of a fact deleted since are dropped"""
+
+        app.config["LIKE_FLUSH_INTERVAL"] = 60
+
+        self.assertTrue(trivia_likes.record(self.t1.id))
+        self.assertTrue(trivia_likes.record(self.t2.id))
+
+        db.session.delete(self.t1)
+        db.session.commit()
+
+        flush_likes()
+
+        self.assertEqual(TriviaLikeCounter.query.count(), 1)
+        self.assertEqual(self.num_likes(self.t2.id), 1)
+
+    def test_buffered_like_of_fact_from_elsewhere(self):
+        """Makes sure a fact another process added can be liked before the
+        sampler reloads"""
+
+        app.config["LIKE_FLUSH_INTERVAL"] = 60
+        trivia_likes.sampler.ensure_loaded()
+
+        with db.engine.begin() as connection:
+            fact_id = connection.execute(
+                insert(Trivia.__table__).values(
+                    number=3,
+                    fact_fragment="the number for this t3 test fact fragment",
+                    fact_statement="3 is the number for this t3 test fact.",
+                    was_submitted=False,
+                )
+            ).inserted_primary_key[0]
+
+        self.assertNotIn(fact_id, trivia_likes.sampler)
+        self.assertTrue(trivia_likes.record(fact_id))
+
+        flush_likes()
+
+        self.assertEqual(self.num_likes(fact_id), 1)
+
+    def test_stop_flusher(self):
+        """Makes sure the flusher a buffered like starts can be stopped"""
+
+        app.config["LIKE_FLUSH_INTERVAL"] = 60
+        trivia_likes.record(self.t1.id)
+        flusher = recorder._flusher
+
+        self.assertTrue(flusher.is_alive())
+
+        stop_flusher()
+
+        self.assertFalse(flusher.is_alive())
+        self.assertIsNone(recorder._flusher)
+        flush_likes()
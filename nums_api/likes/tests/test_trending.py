@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.trivia.routes import trivia_likes
+from nums_api.likes.models import LikeEvent, LikeRollup
+from nums_api.likes.recorder import flush_likes
+from nums_api.likes.trending import roll_up_likes, trending_scores
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+class TrendingTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        LikeEvent.query.delete()
+        LikeRollup.query.delete()
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+
+        self.facts = [
+            Trivia(
+                number=n,
+                fact_fragment=f"the number for this t{n} test fact fragment",
+                fact_statement=f"{n} is the number for this t{n} test fact.",
+                was_submitted=False
+            )
+            for n in range(1, 4)
+        ]
+        db.session.add_all(self.facts)
+        db.session.commit()
+
+        (self.t1, self.t2, self.t3) = [fact.id for fact in self.facts]
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+        app.config["LIKE_FLUSH_INTERVAL"] = 0
+
+    def roll_up(self):
+        with db.engine.begin() as connection:
+            return roll_up_likes(connection, 24)
+
+    def test_likes_logged(self):
+        """Makes sure each like, or flush of buffered likes, is an event"""
+
+        trivia_likes.record(self.t1)
+        trivia_likes.record(self.t1)
+        trivia_likes.record(-1)
+
+        app.config["LIKE_FLUSH_INTERVAL"] = 60
+        for _ in range(3):
+            trivia_likes.record(self.t2)
+        flush_likes()
+
+        self.assertEqual(
+            sorted(
+                (event.fact_table, event.fact_id, event.num_likes)
+                for event in LikeEvent.query
+            ),
+            sorted([
+                ("trivia", self.t1, 1),
+                ("trivia", self.t1, 1),
+                ("trivia", self.t2, 3),
+            ])
+        )
+
+    def test_roll_up(self):
+        """Makes sure events are moved into hourly buckets, adding up"""
+
+        for _ in range(3):
+            trivia_likes.record(self.t1)
+        trivia_likes.record(self.t2)
+
+        self.assertEqual(self.roll_up(), 2)
+        self.assertEqual(LikeEvent.query.count(), 0)
+
+        trivia_likes.record(self.t1)
+        self.assertEqual(self.roll_up(), 1)
+
+        rollups = {
+            rollup.fact_id: rollup.num_likes for rollup in LikeRollup.query
+        }
+        self.assertEqual(rollups, {self.t1: 4, self.t2: 1})
+
+    def test_roll_up_prunes_old_buckets(self):
+        """Makes sure buckets decayed out of the window are dropped"""
+
+        long_ago = datetime.now(timezone.utc) - timedelta(days=30)
+        db.session.add(LikeRollup(
+            fact_table="trivia", fact_id=self.t1, bucket=long_ago, num_likes=5
+        ))
+        db.session.commit()
+
+        self.roll_up()
+
+        self.assertEqual(LikeRollup.query.count(), 0)
+
+    def test_scores_decay(self):
+        """Makes sure recent likes outweigh more, older likes"""
+
+        now = datetime.now(timezone.utc)
+        db.session.add_all([
+            # a day old: half as much
+            LikeRollup(fact_table="trivia", fact_id=self.t1,
+                       bucket=now - timedelta(hours=24), num_likes=6),
+            LikeRollup(fact_table="trivia", fact_id=self.t2,
+                       bucket=now - timedelta(hours=1), num_likes=2),
+            LikeRollup(fact_table="math", fact_id=self.t3,
+                       bucket=now, num_likes=100),
+        ])
+        db.session.commit()
+
+        # not rolled up yet, so straight from the events
+        trivia_likes.record(self.t2)
+        trivia_likes.record(self.t2)
+
+        with app.app_context():
+            scores = trending_scores("trivia", 10)
+
+        self.assertEqual([fact_id for (fact_id, score) in scores],
+                         [self.t2, self.t1])
+        self.assertAlmostEqual(scores[0][1], 2 * 0.5 ** (1 / 24) + 2,
+                               places=2)
+        self.assertAlmostEqual(scores[1][1], 3, places=2)
+
+        with app.app_context():
+            self.assertEqual(len(trending_scores("trivia", 1)), 1)
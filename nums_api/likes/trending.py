@@ -0,0 +1,161 @@
+"""Trending facts: likes scored with exponential time decay.
+
+Every like also appends a row to ``like_events``, in the same statement that
+bumps its counter (see LikeRecorder), so trending costs no extra round trip
+per like. Events are rolled up into hourly ``like_rollups`` buckets by
+``roll_up_likes``, in one statement that deletes them and adds them to their
+buckets::
+
+    WITH moved AS (DELETE FROM like_events RETURNING ...)
+    INSERT INTO like_rollups ...
+    SELECT fact_table, fact_id, date_trunc('hour', liked_at), sum(num_likes)
+    FROM moved GROUP BY ...
+    ON CONFLICT ... DO UPDATE SET num_likes = like_rollups.num_likes + ...
+
+so however many likes a fact gets, it's one row per hour, and the event log
+only ever holds the likes since the last rollup. Rollups run lazily from
+trending requests, at most every ``LIKE_ROLLUP_INTERVAL`` seconds per
+process, or from cron with ``python -m nums_api.likes.trending``.
+
+A like's weight halves every ``TRENDING_HALF_LIFE`` hours. Scores are summed
+in the database over the rollups and the events not rolled up yet; buckets
+older than WINDOW_HALF_LIVES half-lives add under 0.1% and are pruned.
+"""
+
+import math
+import threading
+import time
+from datetime import timedelta
+
+from flask import current_app
+from sqlalchemy import (
+    Float, cast, delete, extract, func, literal, select, union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from nums_api.database import db
+from nums_api.likes.models import LikeEvent, LikeRollup
+
+# likes older than this many half-lives are left out of scores
+WINDOW_HALF_LIVES = 10
+
+_last_rollup = 0.0
+_rollup_lock = threading.Lock()
+
+
+def roll_up_likes(connection, half_life):
+    """Move the like events into their hourly buckets.
+
+    Also drops buckets that have decayed out of the trending window, for
+    half_life in hours. Returns the number of (fact, hour) buckets added to.
+    """
+
+    events = LikeEvent.__table__
+    rollups = LikeRollup.__table__
+
+    moved = delete(events).returning(
+        events.c.fact_table,
+        events.c.fact_id,
+        events.c.num_likes,
+        events.c.liked_at,
+    ).cte("moved")
+    bucket = func.date_trunc("hour", moved.c.liked_at)
+
+    statement = insert(rollups).from_select(
+        ["fact_table", "fact_id", "bucket", "num_likes"],
+        select(
+            moved.c.fact_table,
+            moved.c.fact_id,
+            bucket,
+            func.sum(moved.c.num_likes),
+        )
+        .group_by(moved.c.fact_table, moved.c.fact_id, bucket),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[rollups.c.fact_table, rollups.c.fact_id,
+                        rollups.c.bucket],
+        set_={"num_likes": rollups.c.num_likes + statement.excluded.num_likes},
+    )
+
+    result = connection.execute(statement)
+    connection.execute(
+        delete(rollups).where(rollups.c.bucket < _window_start(half_life))
+    )
+
+    return result.rowcount
+
+
+def _window_start(half_life):
+    return func.now() - timedelta(hours=half_life * WINDOW_HALF_LIVES)
+
+
+def maybe_roll_up_likes():
+    """Roll up the like events if this process hasn't for a while."""
+
+    global _last_rollup
+
+    interval = current_app.config["LIKE_ROLLUP_INTERVAL"]
+
+    if time.monotonic() - _last_rollup < interval:
+        return
+
+    with _rollup_lock:
+        if time.monotonic() - _last_rollup < interval:
+            return
+
+        with db.engine.begin() as connection:
+            roll_up_likes(connection, current_app.config["TRENDING_HALF_LIFE"])
+
+        _last_rollup = time.monotonic()
+
+
+def trending_scores(fact_table, limit):
+    """Return list of (fact id, score) of the limit top trending facts.
+
+    fact_table is the facts' table name, like "math". A score is the fact's
+    likes, each weighed by 0.5 ** (its age in half-lives), counting a
+    rolled up like as liked at the start of its hour. Highest first, and by
+    id among equal scores.
+    """
+
+    half_life = current_app.config["TRENDING_HALF_LIFE"]
+    events = LikeEvent.__table__
+    rollups = LikeRollup.__table__
+    window_start = _window_start(half_life)
+
+    likes = union_all(
+        select(
+            rollups.c.fact_id,
+            rollups.c.num_likes,
+            rollups.c.bucket.label("liked_at"),
+        )
+        .where(rollups.c.fact_table == fact_table)
+        .where(rollups.c.bucket >= window_start),
+        select(events.c.fact_id, events.c.num_likes, events.c.liked_at)
+        .where(events.c.fact_table == fact_table)
+        .where(events.c.liked_at >= window_start),
+    ).subquery("likes")
+
+    age = cast(extract("epoch", func.now() - likes.c.liked_at), Float)
+    decay = func.exp(literal(math.log(0.5) / (half_life * 3600)) * age)
+    score = func.sum(likes.c.num_likes * decay).label("score")
+
+    query = (
+        select(likes.c.fact_id, score)
+        .group_by(likes.c.fact_id)
+        .order_by(score.desc(), likes.c.fact_id)
+        .limit(limit)
+    )
+
+    return [(fact_id, score) for (fact_id, score) in db.session.execute(query)]
+
+
+if __name__ == "__main__":
+    from sqlalchemy import create_engine
+
+    from nums_api.config import DATABASE_URL, TRENDING_HALF_LIFE
+
+    with create_engine(DATABASE_URL).begin() as connection:
+        buckets = roll_up_likes(connection, TRENDING_HALF_LIFE)
+
+    print(f"rolled up likes into {buckets} buckets")
@@ -0,0 +1,20 @@
+from flask import request
+from werkzeug.exceptions import BadRequest
+
+
+def like_weights(recorder):
+    """Return recorder's LikeCounts if the request has ?weighted=likes.
+
+    Returns None when the request doesn't ask for weighting, so facts are
+    picked uniformly; raises BadRequest for any other weighting.
+    """
+
+    weighted = request.args.get("weighted")
+
+    if weighted is None:
+        return None
+
+    if weighted != "likes":
+        raise BadRequest("Invalid data: weighted must be likes")
+
+    return recorder.counts
@@ -1,9 +1,24 @@
+from flask import current_app
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
+# registers the sqlite:// storage scheme with limits
+import nums_api.limiter_storage  # noqa: F401
+from nums_api.metrics import count_rate_limited
+
+# storage, strategy and default limits come from RATELIMIT_STORAGE_URI,
+# RATELIMIT_STRATEGY and RATELIMIT_DEFAULT; rejections are counted in metrics
 limiter = Limiter(
     key_func=get_remote_address,
-    default_limits=["200/day", "50/hour"],
-    storage_uri="memory://",
-    strategy="fixed-window",
+    on_breach=count_rate_limited,
 )
+
+
+def api_rate_limit():
+    """Return the limit on each fact API route, from RATELIMIT_API.
+
+    Read per request, so it can be changed per environment (tests set a
+    small one) after the blueprints are declared.
+    """
+
+    return current_app.config["RATELIMIT_API"]
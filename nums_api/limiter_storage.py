@@ -0,0 +1,224 @@
+"""Rate limit storage shared by every worker process on a host.
+
+With ``memory://`` each gunicorn worker counts requests on its own, so a
+client gets the limit once per worker. ``SQLiteStorage`` keeps the counters
+in a SQLite file instead, which every process on the host opens, so they all
+count against the same limits without a network round trip:
+
+    RATELIMIT_STORAGE_URI = "sqlite:////var/run/nums_api/ratelimits.sqlite3"
+
+The file is in WAL mode and isn't synced to disk on commit: losing the last
+counts in a power cut is fine, and it keeps a limit check to tens of
+microseconds.
+
+It supports the fixed window strategies and, through the log of hits in the
+entries table, the moving (sliding) window one.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from limits.storage import MovingWindowSupport, Storage
+
+# expired rows of other keys are deleted every this many writes
+PURGE_INTERVAL = 1000
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS counters (
+        key TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_counters_expires_at ON counters (expires_at);
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT NOT NULL,
+        at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_entries_key_at ON entries (key, at);
+    CREATE INDEX IF NOT EXISTS ix_entries_expires_at ON entries (expires_at);
+"""
+
+
+class SQLiteStorage(Storage, MovingWindowSupport):
+    """Rate limit storage in a SQLite file, for ``sqlite:///path`` URIs."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri=None, **options):
+        """Store counters in the file at the URI's path.
+
+        The path follows SQLAlchemy's convention: "sqlite:///limits.db" is
+        relative to the working directory, "sqlite:////tmp/limits.db" is
+        absolute. Nothing is created until the first limit check; then a
+        missing file, and its directory, are made readable by this user
+        only.
+        """
+
+        self.path = uri.split("://", 1)[1][1:]
+        self.local = threading.local()
+        self.writes = 0
+        super().__init__(uri, **options)
+
+    def create(self):
+        """Create the file (and directory) if missing, private to this user."""
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+
+    @property
+    def connection(self):
+        """This thread's connection, opened again after a fork."""
+
+        if getattr(self.local, "pid", None) != os.getpid():
+            self.create()
+            connection = sqlite3.connect(
+                self.path,
+                timeout=5,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.executescript(SCHEMA)
+
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+
+        return self.local.connection
+
+    @contextmanager
+    def transaction(self):
+        """Run the block in a write transaction, yielding the connection.
+
+        BEGIN IMMEDIATE takes the write lock up front, so two processes
+        can't both read a count and then both add to it.
+        """
+
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+    def purge(self, connection, now):
+        """Every PURGE_INTERVAL writes, delete all expired rows."""
+
+        self.writes += 1
+
+        if self.writes % PURGE_INTERVAL == 0:
+            connection.execute(
+                "DELETE FROM counters WHERE expires_at <= ?", (now, )
+            )
+            connection.execute(
+                "DELETE FROM entries WHERE expires_at <= ?", (now, )
+            )
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        now = time.time()
+
+        with self.transaction() as connection:
+            connection.execute(
+                "DELETE FROM counters WHERE key = ? AND expires_at <= ?",
+                (key, now),
+            )
+            (count, ) = connection.execute(
+                """
+                INSERT INTO counters (key, count, expires_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    count = count + excluded.count,
+                    expires_at = CASE WHEN ? THEN excluded.expires_at
+                                 ELSE expires_at END
+                RETURNING count
+                """,
+                (key, amount, now + expiry, elastic_expiry),
+            ).fetchone()
+            self.purge(connection, now)
+
+        return count
+
+    def get(self, key):
+        row = self.connection.execute(
+            "SELECT count FROM counters WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self.connection.execute(
+            "SELECT expires_at FROM counters WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+
+        return int(row[0] if row else now)
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        now = time.time()
+
+        with self.transaction() as connection:
+            connection.execute(
+                "DELETE FROM entries WHERE key = ? AND at <= ?",
+                (key, now - expiry),
+            )
+            (acquired, ) = connection.execute(
+                "SELECT count(*) FROM entries WHERE key = ?", (key, )
+            ).fetchone()
+
+            if acquired + amount > limit:
+                return False
+
+            connection.executemany(
+                "INSERT INTO entries (key, at, expires_at) VALUES (?, ?, ?)",
+                [(key, now, now + expiry)] * amount,
+            )
+            self.purge(connection, now)
+
+        return True
+
+    def get_moving_window(self, key, limit, expiry):
+        now = time.time()
+        (start, acquired) = self.connection.execute(
+            "SELECT min(at), count(*) FROM entries WHERE key = ? AND at > ?",
+            (key, now - expiry),
+        ).fetchone()
+
+        return (int(start if start is not None else now), acquired)
+
+    def check(self):
+        try:
+            self.connection.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+
+        return True
+
+    def reset(self):
+        with self.transaction() as connection:
+            (count, ) = connection.execute(
+                "SELECT (SELECT count(*) FROM counters) + "
+                "(SELECT count(DISTINCT key) FROM entries)"
+            ).fetchone()
+            connection.execute("DELETE FROM counters")
+            connection.execute("DELETE FROM entries")
+
+        return count
+
+    def clear(self, key):
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM counters WHERE key = ?", (key, ))
+            connection.execute("DELETE FROM entries WHERE key = ?", (key, ))
+
@@ -1,18 +1,52 @@
-from flask import Blueprint, jsonify
+from decimal import Decimal
+from flask import Blueprint, jsonify, request, current_app
 from nums_api.maths.models import Math,MathLikeCounter
-import random
+from nums_api.cache.sampler import RandomFactSampler
+from nums_api.cache.index import FactIndex
+from nums_api.cache.keys import SortedFactKeys, CLOSEST_MODES
+from nums_api.likes.recorder import LikeRecorder
+from nums_api.likes.weighted import like_weights
+from nums_api.likes.ranking import top_facts, trending_facts
+from nums_api.batch import parse_batch, parse_decimal
 from werkzeug.exceptions import BadRequest
-from nums_api.database import db
+
+
+def exact_number(number):
+    """
+    Converts a math fact's number to the Decimal it's keyed by
+
+    Floats go through their shortest repr, so 2.22 is Decimal("2.22"),
+    not the binary value closest to it. Decimals that are equal (like
+    Decimal("1") and Decimal("1.00")) hash the same.
+    """
+
+    if isinstance(number, Decimal):
+        return number
+
+    return Decimal(str(number))
+
+
+def format_number(number):
+    """Formats a Decimal without exponent or trailing zeros, like "10" """
+
+    return f"{number.normalize():f}"
 
 
 math = Blueprint("math", __name__)
 
+math_sampler = RandomFactSampler(Math)
+math_likes = LikeRecorder(Math, MathLikeCounter, math_sampler)
+math_keys = SortedFactKeys(Math, Math.number, normalize_key=exact_number)
+math_index = FactIndex(
+    Math, Math.number, normalize_key=exact_number, keys=math_keys
+)
+
 
 @math.get("/<number>")
 def get_math_fact(number):
     """
     Get math fact about specific number
-        Input: number (int or float)
+        Input: number (int or decimal)
         Output: JSON like
         {
             "fact": {
@@ -23,6 +57,13 @@ def get_math_fact(number):
             }
         }
 
+        With query string notfound=floor, ceil or nearest, a number without
+        a fact gets the fact of the closest number below it, above it or
+        either side instead (its "number" says which).
+
+        With query string weighted=likes, a number with several facts gets
+        one picked in proportion to their likes.
+
         OR If number is not found...
         Output: JSON like
         {
@@ -34,13 +75,28 @@ def get_math_fact(number):
     """
 
     try:
-        num_as_float = float(number)
+        exact = parse_decimal(number)
     except ValueError:
-        raise BadRequest("Invalid data: number must be an integer or float")
+        raise BadRequest(
+            "Invalid data: number must be a finite integer or decimal"
+        )
 
-    math_facts = Math.query.filter(Math.number == num_as_float).all()
+    notfound = request.args.get("notfound")
 
-    if not math_facts:
+    if notfound is not None and notfound not in CLOSEST_MODES:
+        raise BadRequest(
+            "Invalid data: notfound must be floor, ceil or nearest"
+        )
+
+    like_counts = like_weights(math_likes)
+    fact_data = math_index.choice(exact, like_counts)
+
+    if not fact_data and notfound:
+        fact_data = math_keys.closest_fact(
+            exact, notfound, lambda key: math_index.choice(key, like_counts)
+        )
+
+    if not fact_data:
         error = {
             "message": f"A math fact for { number } not found",
             "status": 404
@@ -48,16 +104,129 @@ def get_math_fact(number):
 
         return (jsonify(error=error), 404)
 
-    fact = random.choice(math_facts)
+    return jsonify(fact=fact_data)
+
 
-    fact_data = {
-        "fragment": fact.fact_fragment,
-        "statement": fact.fact_statement,
-        "number": float(fact.number),
-        "type": "math"
+@math.get("/<batch:numbers>")
+def get_math_facts_batch(numbers):
+    """
+    Get math facts about many numbers in one request
+        Input: numbers (str) like "1,2.5,3" or "1..10" or "1..5,7"
+        Output: JSON like
+        {
+            "facts": {
+                "1": {
+                    "fragment": "the first odd number",
+                    "statement": "1 is the first odd number.",
+                    "number": 1,
+                    "type": "math"
+                },
+                "2.5": {...}
+            }
+        }
+
+        Numbers without a fact are left out. Ranges must be whole numbers.
+
+        OR If none of the numbers are found...
+        Output: JSON like
+        {
+            error: {
+                    "message": f"No math facts for { numbers } found",
+                    "status": 404
+                    }
+        }
+    """
+
+    try:
+        keys = parse_batch(numbers, parse_decimal)
+    except ValueError as e:
+        (error_msg, ) = e.args
+        raise BadRequest(error_msg)
+
+    facts = math_index.choices(keys.values())
+    facts_data = {
+        label: facts[key] for (label, key) in keys.items() if key in facts
     }
 
-    return jsonify(fact=fact_data)
+    if not facts_data:
+        error = {
+            "message": f"No math facts for { numbers } found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts_data)
+
+
+@math.get("/range")
+def get_math_facts_range():
+    """
+    Get math facts about every number in a range
+        Input: query string min and/or max (int or decimal), inclusive,
+            like "?min=1&max=2.5"
+        Output: JSON like
+        {
+            "facts": {
+                "1": {
+                    "fragment": "the first odd number",
+                    "statement": "1 is the first odd number.",
+                    "number": 1,
+                    "type": "math"
+                },
+                "2.5": {...}
+            }
+        }
+
+        At most MAX_BATCH_SIZE numbers can be in the range.
+
+        OR If there are no facts in the range...
+        Output: JSON like
+        {
+            error: {
+                    "message": f"No math facts from { min } to { max } found",
+                    "status": 404
+                    }
+        }
+    """
+
+    try:
+        bounds = {
+            name: parse_decimal(request.args[name])
+            for name in ["min", "max"]
+            if name in request.args
+        }
+    except ValueError as e:
+        (error_msg, ) = e.args
+        raise BadRequest(error_msg)
+
+    if not bounds:
+        raise BadRequest("Invalid data: min or max is required")
+
+    max_size = current_app.config["MAX_BATCH_SIZE"]
+    numbers = math_index.keys_between(
+        bounds.get("min"),
+        bounds.get("max"),
+        limit=max_size + 1,
+    )
+
+    if len(numbers) > max_size:
+        raise BadRequest(f"Range exceeds {max_size} numbers")
+
+    facts = math_index.choices(numbers)
+    facts_data = {format_number(number): facts[number] for number in facts}
+
+    if not facts_data:
+        low = request.args.get("min", "")
+        high = request.args.get("max", "")
+        error = {
+            "message": f"No math facts from { low } to { high } found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts_data)
 
 
 @math.get("/random")
@@ -73,19 +242,118 @@ def get_math_fact_random():
                 "type": "math"
             }
         }
+
+        With query string weighted=likes, facts are picked in proportion to
+        their likes, so only liked facts are picked, unless none has likes
+        yet.
     """
 
-    math_facts = Math.query.all()
-    fact = random.choice(math_facts)
+    like_counts = like_weights(math_likes)
 
-    fact_data = {
-        "fragment": fact.fact_fragment,
-        "statement": fact.fact_statement,
-        "number": float(fact.number),
-        "type": "math"
-    }
+    fact = None
 
-    return jsonify(fact=fact_data)
+    if like_counts is not None:
+        fact = math_sampler.sample_liked(like_counts)
+
+    if fact is None:
+        # none has likes yet, so any fact will do
+        fact = math_sampler.sample()
+
+    if not fact:
+        error = {
+            "message": "No math facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(fact=fact.serialize())
+
+
+@math.get("/top")
+def get_math_facts_top():
+    """
+    Get the most liked math facts
+        Input: optional query string limit, how many (default 10, at most
+            100), like "?limit=3"
+        Output: JSON like
+        {
+            "facts": [
+                {
+                    "fragment": "...",
+                    "statement": "...",
+                    "number": 145,
+                    "type": "math",
+                    "likes": 12
+                },
+                {...}
+            ]
+        }
+
+        OR If no math fact has likes...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No liked math facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    facts = top_facts(math_likes)
+
+    if not facts:
+        error = {
+            "message": "No liked math facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts)
+
+
+@math.get("/trending")
+def get_math_facts_trending():
+    """
+    Get the trending math facts, scored by recent likes
+        Input: optional query string limit, how many (default 10, at most
+            100), like "?limit=3"
+        Output: JSON like
+        {
+            "facts": [
+                {
+                    "fragment": "...",
+                    "statement": "...",
+                    "number": 145,
+                    "type": "math",
+                    "score": 7.5
+                },
+                {...}
+            ]
+        }
+
+        OR If no math fact has likes lately...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No trending math facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    facts = trending_facts(math_likes)
+
+    if not facts:
+        error = {
+            "message": "No trending math facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts)
 
 
 @math.post("/like/<int:id>")
@@ -105,23 +373,11 @@ def add_math_like(id):
         }
     """
 
-    fact = Math.query.get(id)
-
-    if not fact:
+    if not math_likes.record(id):
         error = {
             "message": f"A math fact for id { id } not found",
             "status": 404
         }
         return (jsonify(error), 404)
 
-    like_counter = MathLikeCounter.query.filter_by(math_id=fact.id).first()
-
-    if not like_counter:
-        like_counter = MathLikeCounter(math_id=id)
-        db.session.add(like_counter)
-        db.session.commit()
-
-    like_counter.increment_likes()
-    db.session.commit()
-
     return ("You have liked this fact.", 200)
@@ -55,6 +55,14 @@ class MathModelTestCase(TestCase):
         self.assertEqual(Math.query.count(), 1)
         self.assertEqual(Math.query.filter_by(number=1.5).one().number, 1.5)
 
+    def test_serialize(self):
+        self.assertEqual(self.m1.serialize(), {
+            "fragment": "the number for this m1 test fact fragment",
+            "statement": "1.5 is the number for m1 this test fact statement.",
+            "number": 1.5,
+            "type": "math",
+        })
+
     def test_add_likes(self):
         """Makes sure the like feature works"""
 
@@ -110,6 +110,34 @@ class MathRouteTestCase(MathBaseRouteTestCase):
             self.assertEqual(resp.status_code, 404)
             self.assertEqual(resp.json, expected_resp)
 
+    def test_get_math_fact_notfound(self):
+        """Makes sure a missing number can fall back to the closest one"""
+
+        with self.client as c:
+            cases = [
+                ("2?notfound=floor", 1),
+                ("2?notfound=ceil", 2.22),
+                ("2?notfound=nearest", 2.22),
+                ("1.5?notfound=nearest", 1),
+                ("-5?notfound=nearest", 1),
+                ("1e100?notfound=floor", 2.22),
+                ("2.22?notfound=floor", 2.22),
+            ]
+
+            for (url, number) in cases:
+                resp = c.get(f"/api/math/{url}")
+                self.assertEqual(resp.status_code, 200, url)
+                self.assertEqual(resp.json["fact"]["number"], number, url)
+
+            resp = c.get("/api/math/0.5?notfound=floor")
+            self.assertEqual(resp.status_code, 404)
+
+            resp = c.get("/api/math/3?notfound=ceil")
+            self.assertEqual(resp.status_code, 404)
+
+            resp = c.get("/api/math/1?notfound=closest")
+            self.assertEqual(resp.status_code, 400)
+
     def test_get_math_fact_invalid_number(self):
         with self.client as c:
 
@@ -117,6 +145,22 @@ class MathRouteTestCase(MathBaseRouteTestCase):
 
             self.assertEqual(resp.status_code, 400)
 
+    def test_get_math_fact_exact(self):
+        """Makes sure numbers match exactly, and only finite ones are valid"""
+
+        with self.client as c:
+
+            resp = c.get("/api/math/2.220")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json["fact"]["number"], 2.22)
+
+            resp = c.get("/api/math/2.2200000000000001")
+            self.assertEqual(resp.status_code, 404)
+
+            for number in ["nan", "inf", "-Infinity", "1e999999"]:
+                resp = c.get(f"/api/math/{number}")
+                self.assertEqual(resp.status_code, 400)
+
     def test_get_math_fact_random(self):
         with self.client as c:
 
@@ -165,3 +209,73 @@ class MathRouteTestCase(MathBaseRouteTestCase):
 
             resp = c.post(f"api/math/like/{-1}")
             self.assertEqual(resp.status_code, 404)
+
+    def test_get_math_facts_batch(self):
+        with self.client as c:
+
+            resp = c.get("/api/math/1,2.22,3")
+            expected_resp = {
+                "facts": {
+                    "1": self.m1.serialize(),
+                    "2.22": self.m2.serialize(),
+                }
+            }
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json, expected_resp)
+
+            resp = c.get("/api/math/0..2")
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(list(resp.json["facts"]), ["1"])
+
+    def test_get_math_facts_range(self):
+        with self.client as c:
+
+            resp = c.get("/api/math/range?min=0&max=2")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(list(resp.json["facts"]), ["1"])
+
+            resp = c.get("/api/math/range?min=1.5")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(list(resp.json["facts"]), ["2.22"])
+            self.assertEqual(
+                resp.json["facts"]["2.22"]["statement"],
+                "2.22 is the number for this m2 test fact statement."
+            )
+
+            resp = c.get("/api/math/range?max=2.22")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(sorted(resp.json["facts"]), ["1", "2.22"])
+
+            resp = c.get("/api/math/range?min=3&max=4")
+            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(
+                resp.json["error"]["message"],
+                "No math facts from 3 to 4 found"
+            )
+
+    def test_get_math_facts_range_invalid(self):
+        with self.client as c:
+
+            for query in ["", "?min=one", "?min=0&max=inf", "?max=nan"]:
+                resp = c.get(f"/api/math/range{query}")
+                self.assertEqual(resp.status_code, 400)
+
+            max_size = app.config["MAX_BATCH_SIZE"]
+            app.config["MAX_BATCH_SIZE"] = 1
+            try:
+                resp = c.get("/api/math/range?min=0")
+            finally:
+                app.config["MAX_BATCH_SIZE"] = max_size
+
+            self.assertEqual(resp.status_code, 400)
+
+    def test_get_math_facts_batch_invalid(self):
+        with self.client as c:
+
+            resp = c.get("/api/math/1,one")
+            self.assertEqual(resp.status_code, 400)
+
+            resp = c.get("/api/math/1.5..3")
+            self.assertEqual(resp.status_code, 400)
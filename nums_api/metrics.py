@@ -0,0 +1,162 @@
+"""Prometheus metrics, served at /metrics.
+
+- ``nums_api_requests_total{blueprint, method, status}``: requests handled,
+  by blueprint ("trivia", "math", "dates", "years", "random_facts",
+  "root", or "app" outside any). Misses are the ``status="404"`` ones.
+- ``nums_api_request_duration_seconds{blueprint}``: latency histogram.
+- ``nums_api_likes_total{category}`` and
+  ``nums_api_like_writes_total{category}``: likes recorded, and statements
+  writing them (fewer than likes when LIKE_FLUSH_INTERVAL buffers them).
+- ``nums_api_rate_limited_total{blueprint}``: requests rejected by a limit.
+- ``nums_api_db_connections{state}``: database pool connections "open" and
+  "checked_out", kept up to date by pool events.
+
+Updating a metric is an increment under the metric's own lock, so there's no
+shared lock across requests. Under a multi-process server like gunicorn, set
+``PROMETHEUS_MULTIPROC_DIR`` to an empty directory (cleared at each start):
+each worker then keeps its values in its own memory-mapped file there, and
+/metrics adds them up across workers. The server should also mark exited
+workers dead, e.g. in gunicorn.conf.py::
+
+    from prometheus_client import multiprocess
+
+    def child_exit(server, worker):
+        multiprocess.mark_process_dead(worker.pid)
+"""
+
+import os
+import time
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+    Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+REQUESTS = Counter(
+    "nums_api_requests",
+    "HTTP requests handled",
+    ["blueprint", "method", "status"],
+)
+
+REQUEST_DURATION = Histogram(
+    "nums_api_request_duration_seconds",
+    "Time taken to handle HTTP requests",
+    ["blueprint"],
+    buckets=(
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5,
+    ),
+)
+
+LIKES = Counter(
+    "nums_api_likes",
+    "Likes recorded",
+    ["category"],
+)
+
+LIKE_WRITES = Counter(
+    "nums_api_like_writes",
+    "Statements writing likes to the database",
+    ["category"],
+)
+
+RATE_LIMITED = Counter(
+    "nums_api_rate_limited",
+    "Requests rejected by a rate limit",
+    ["blueprint"],
+)
+
+DB_CONNECTIONS = Gauge(
+    "nums_api_db_connections",
+    "Database pool connections",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+
+def blueprint_label():
+    """Return the current request's blueprint, for labels."""
+
+    return request.blueprint or "app"
+
+
+def count_rate_limited(limit):
+    """Count a rejected request (Limiter's on_breach callback)."""
+
+    RATE_LIMITED.labels(blueprint_label()).inc()
+
+
+class Metrics:
+    """Flask extension counting and timing requests, serving /metrics."""
+
+    def init_app(self, app):
+        """Add the request hooks and the /metrics route.
+
+        Must come before the limiter's init_app, so rate limited requests
+        are timed too.
+        """
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.add_url_rule("/metrics", "metrics", metrics_route)
+
+    def _start(self):
+        g.metrics_started = time.perf_counter()
+
+    def _finish(self, response):
+        blueprint = blueprint_label()
+
+        REQUESTS.labels(
+            blueprint, request.method, str(response.status_code)
+        ).inc()
+
+        started = g.get("metrics_started")
+        if started is not None:
+            REQUEST_DURATION.labels(blueprint).observe(
+                time.perf_counter() - started
+            )
+
+        return response
+
+
+def metrics_route():
+    """
+    Get the metrics, in Prometheus' text format
+
+    Added up across worker processes when PROMETHEUS_MULTIPROC_DIR is set.
+    """
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return Response(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
+
+
+@event.listens_for(Pool, "connect")
+def _connected(dbapi_connection, connection_record):
+    DB_CONNECTIONS.labels("open").inc()
+
+
+@event.listens_for(Pool, "close")
+def _closed(dbapi_connection, connection_record):
+    DB_CONNECTIONS.labels("open").dec()
+
+
+@event.listens_for(Pool, "checkout")
+def _checked_out(dbapi_connection, connection_record, connection_proxy):
+    DB_CONNECTIONS.labels("checked_out").inc()
+
+
+@event.listens_for(Pool, "checkin")
+def _checked_in(dbapi_connection, connection_record):
+    DB_CONNECTIONS.labels("checked_out").dec()
+
+
+metrics = Metrics()
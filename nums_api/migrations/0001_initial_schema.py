@@ -0,0 +1,106 @@
+"""The schema seed.py created before there were migrations.
+
+Tables are only created if they're missing, so databases made back then can
+be migrated from here.
+"""
+
+from sqlalchemy import text
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS dates (
+        id SERIAL NOT NULL,
+        day_of_year INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        fact_fragment VARCHAR(200) NOT NULL,
+        fact_statement VARCHAR(250) NOT NULL,
+        added_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        was_submitted BOOLEAN NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS math (
+        id SERIAL NOT NULL,
+        number NUMERIC NOT NULL,
+        fact_fragment VARCHAR(200) NOT NULL,
+        fact_statement VARCHAR(250) NOT NULL,
+        added_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        was_submitted BOOLEAN NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (fact_fragment),
+        UNIQUE (fact_statement)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS trivia (
+        id SERIAL NOT NULL,
+        number INTEGER NOT NULL,
+        fact_fragment VARCHAR(200) NOT NULL,
+        fact_statement VARCHAR(250) NOT NULL,
+        added_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        was_submitted BOOLEAN NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (fact_fragment),
+        UNIQUE (fact_statement)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS years (
+        id SERIAL NOT NULL,
+        year INTEGER NOT NULL,
+        fact_fragment VARCHAR(200) NOT NULL,
+        fact_statement VARCHAR(250) NOT NULL,
+        added_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        was_submitted BOOLEAN NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (fact_fragment),
+        UNIQUE (fact_statement)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS date_like_counters (
+        id SERIAL NOT NULL,
+        date_id INTEGER NOT NULL,
+        num_likes INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (date_id),
+        FOREIGN KEY(date_id) REFERENCES dates (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS math_like_counters (
+        id SERIAL NOT NULL,
+        math_id INTEGER NOT NULL,
+        num_likes INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (math_id),
+        FOREIGN KEY(math_id) REFERENCES math (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS trivia_like_counters (
+        id SERIAL NOT NULL,
+        trivia_id INTEGER NOT NULL,
+        num_likes INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (trivia_id),
+        FOREIGN KEY(trivia_id) REFERENCES trivia (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS year_like_counters (
+        id SERIAL NOT NULL,
+        year_id INTEGER NOT NULL,
+        num_likes INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (year_id),
+        FOREIGN KEY(year_id) REFERENCES years (id)
+    )
+    """,
+]
+
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
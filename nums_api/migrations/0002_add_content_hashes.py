@@ -0,0 +1,28 @@
+"""Content hashes for incremental facts_dump loads.
+
+Adds each fact table's content_hash column and the ingest_sources table.
+"""
+
+from sqlalchemy import text
+
+FACT_TABLES = ["dates", "math", "trivia", "years"]
+
+
+def upgrade(connection):
+    for table in FACT_TABLES:
+        connection.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN content_hash VARCHAR(32)"
+        ))
+        connection.execute(text(
+            f"ALTER TABLE {table} "
+            f"ADD CONSTRAINT {table}_content_hash_key UNIQUE (content_hash)"
+        ))
+
+    connection.execute(text("""
+        CREATE TABLE ingest_sources (
+            path VARCHAR(200) NOT NULL,
+            content_hash VARCHAR(64) NOT NULL,
+            loaded_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (path)
+        )
+    """))
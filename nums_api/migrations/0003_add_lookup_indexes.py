@@ -0,0 +1,18 @@
+"""Indexes on the columns facts are looked up by."""
+
+from sqlalchemy import text
+
+INDEXES = [
+    ("math", "number"),
+    ("trivia", "number"),
+    ("years", "year"),
+    ("dates", "day_of_year"),
+    ("dates", "year"),
+]
+
+
+def upgrade(connection):
+    for (table, column) in INDEXES:
+        connection.execute(text(
+            f"CREATE INDEX ix_{table}_{column} ON {table} ({column})"
+        ))
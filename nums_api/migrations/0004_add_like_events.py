@@ -0,0 +1,29 @@
+"""The like event log and its hourly rollups, for trending facts."""
+
+from sqlalchemy import text
+
+
+def upgrade(connection):
+    connection.execute(text("""
+        CREATE TABLE like_events (
+            id BIGSERIAL NOT NULL,
+            fact_table VARCHAR(20) NOT NULL,
+            fact_id INTEGER NOT NULL,
+            num_likes INTEGER NOT NULL,
+            liked_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id)
+        )
+    """))
+    connection.execute(text("""
+        CREATE TABLE like_rollups (
+            fact_table VARCHAR(20) NOT NULL,
+            fact_id INTEGER NOT NULL,
+            bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+            num_likes INTEGER NOT NULL,
+            PRIMARY KEY (fact_table, fact_id, bucket)
+        )
+    """))
+    connection.execute(text(
+        "CREATE INDEX ix_like_rollups_fact_table_bucket "
+        "ON like_rollups (fact_table, bucket)"
+    ))
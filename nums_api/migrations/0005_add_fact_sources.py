@@ -0,0 +1,16 @@
+"""The dump file each fact was loaded from, so reloading a file can delete
+the facts no longer in it."""
+
+from sqlalchemy import text
+
+FACT_TABLES = ["dates", "math", "trivia", "years"]
+
+
+def upgrade(connection):
+    for table in FACT_TABLES:
+        connection.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN source VARCHAR(200)"
+        ))
+        connection.execute(text(
+            f"CREATE INDEX ix_{table}_source ON {table} (source)"
+        ))
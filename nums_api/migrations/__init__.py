@@ -0,0 +1,94 @@
+"""Schema migrations.
+
+Every module in this package named like ``0002_add_lookup_indexes.py`` is a
+migration: its ``upgrade(connection)`` takes the schema from the previous
+version to this one. The versions applied to a database are recorded in its
+``schema_migrations`` table, and ``migrate`` applies the others in order,
+each in its own transaction (Postgres DDL is transactional, so a failed
+migration leaves nothing half done).
+
+The models stay the source of truth for new databases: ``seed.py`` builds
+the schema with ``create_all`` and then stamps every migration as applied.
+A migration has to bring an existing database to the same schema, with the
+constraint and index names ``create_all`` would have used.
+
+Apply pending migrations to DATABASE_URL with::
+
+    python -m nums_api.migrations
+"""
+
+import importlib
+import pkgutil
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select
+from sqlalchemy.dialects.postgresql import insert
+
+# kept out of db.Model's metadata, so drop_all doesn't forget what's applied
+metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("version", String(100), primary_key=True),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+def migrations():
+    """Return list of (version, module) for every migration, in order."""
+
+    versions = sorted(
+        name
+        for (finder, name, is_package) in pkgutil.iter_modules(__path__)
+        if not is_package and name[:4].isdigit()
+    )
+
+    return [
+        (version, importlib.import_module(f"{__name__}.{version}"))
+        for version in versions
+    ]
+
+
+def applied_versions(connection):
+    """Return set of the versions applied to the database."""
+
+    schema_migrations.create(connection, checkfirst=True)
+
+    query = select(schema_migrations.c.version)
+    return set(connection.execute(query).scalars())
+
+
+def migrate(engine):
+    """Apply pending migrations in order; return list of versions applied."""
+
+    with engine.begin() as connection:
+        applied = applied_versions(connection)
+
+    versions = []
+
+    for (version, module) in migrations():
+        if version in applied:
+            continue
+
+        with engine.begin() as connection:
+            module.upgrade(connection)
+            connection.execute(
+                schema_migrations.insert().values(version=version)
+            )
+
+        versions.append(version)
+
+    return versions
+
+
+def stamp(engine):
+    """Record every migration as applied, for a schema made by create_all."""
+
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+
+        rows = [{"version": version} for (version, module) in migrations()]
+        connection.execute(
+            insert(schema_migrations).values(rows).on_conflict_do_nothing()
+        )
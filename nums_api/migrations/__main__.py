@@ -0,0 +1,12 @@
+from sqlalchemy import create_engine
+
+from nums_api.config import DATABASE_URL
+from nums_api.migrations import migrate
+
+versions = migrate(create_engine(DATABASE_URL))
+
+for version in versions:
+    print(f"applied {version}")
+
+if not versions:
+    print("database is up to date")
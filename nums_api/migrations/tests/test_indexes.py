@@ -0,0 +1,146 @@
+from unittest import TestCase
+from sqlalchemy import event, text
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.__init__ import limiter
+from nums_api.maths.models import Math, MathLikeCounter
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.years.models import Year, YearLikeCounter
+from nums_api.dates.models import Date, DateLikeCounter
+from nums_api.cache.base import invalidate_caches
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+# route -> (table, index its query should use)
+LOOKUP_ROUTES = {
+    "/api/math/1": ("math", "ix_math_number"),
+    "/api/math/1,2.5": ("math", "ix_math_number"),
+    "/api/math/range?min=0&max=2": ("math", "ix_math_number"),
+    "/api/trivia/1": ("trivia", "ix_trivia_number"),
+    "/api/trivia/1..3": ("trivia", "ix_trivia_number"),
+    "/api/years/1969": ("years", "ix_years_year"),
+    "/api/years/1969,1970": ("years", "ix_years_year"),
+    "/api/dates/2/14": ("dates", "ix_dates_day_of_year"),
+    "/api/dates/2/14,2/15": ("dates", "ix_dates_day_of_year"),
+}
+
+
+class LookupIndexTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        for model in [
+            MathLikeCounter, Math,
+            TriviaLikeCounter, Trivia,
+            YearLikeCounter, Year,
+            DateLikeCounter, Date,
+        ]:
+            model.query.delete()
+
+        db.session.add_all([
+            Math(
+                number=1,
+                fact_fragment="the number for this math test fact",
+                fact_statement="1 is the number for this math test fact.",
+                was_submitted=False,
+            ),
+            Trivia(
+                number=1,
+                fact_fragment="the number for this trivia test fact",
+                fact_statement="1 is the number for this trivia test fact.",
+                was_submitted=False,
+            ),
+            Year(
+                year=1969,
+                fact_fragment="the year of this test fact",
+                fact_statement="1969 is the year of this test fact.",
+                was_submitted=False,
+            ),
+            Date(
+                day_of_year=45,
+                year=2000,
+                fact_fragment="the day of this test fact",
+                fact_statement="February 14th is the day of this test fact.",
+                was_submitted=False,
+            ),
+        ])
+        db.session.commit()
+
+        # make the routes query the database rather than the in-memory index
+        self.max_bytes = app.config["FACT_INDEX_MAX_BYTES"]
+        app.config["FACT_INDEX_MAX_BYTES"] = 0
+        for model in [Math, Trivia, Year, Date]:
+            invalidate_caches(model)
+
+        self.client = app.test_client()
+
+        limiter.enabled = False
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+
+        db.session.rollback()
+        app.config["FACT_INDEX_MAX_BYTES"] = self.max_bytes
+        for model in [Math, Trivia, Year, Date]:
+            invalidate_caches(model)
+
+    def route_queries(self, url, table):
+        """Return list of (statement, parameters) the route runs on table."""
+
+        queries = []
+
+        def capture(conn, cursor, statement, parameters, context, many):
+            if f"FROM {table}" in statement:
+                queries.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            resp = self.client.get(url)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+
+        self.assertEqual(resp.status_code, 200)
+
+        return queries
+
+    def explain(self, statement, parameters):
+        """Return the plan of a query, with sequential scans discouraged.
+
+        The test tables are tiny, and Postgres would rightly scan them;
+        this checks there's an index it can use when the table is big.
+        """
+
+        with db.engine.connect() as connection:
+            with connection.begin():
+                connection.execute(text("SET LOCAL enable_seqscan = off"))
+                plan = connection.exec_driver_sql(
+                    f"EXPLAIN {statement}",
+                    parameters,
+                ).scalars().all()
+
+        return "\n".join(plan)
+
+    def test_lookups_use_indexes(self):
+        """Makes sure every lookup route's query is an index scan"""
+
+        for (url, (table, index)) in LOOKUP_ROUTES.items():
+            with self.subTest(url=url):
+                queries = self.route_queries(url, table)
+
+                self.assertTrue(queries)
+                for (statement, parameters) in queries:
+                    plan = self.explain(statement, parameters)
+
+                    self.assertRegex(
+                        plan, rf"Index (Only )?Scan (using|on) {index} "
+                    )
+                    self.assertNotIn("Seq Scan", plan)
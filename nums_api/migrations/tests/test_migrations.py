@@ -0,0 +1,81 @@
+from unittest import TestCase
+from sqlalchemy import inspect
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.facts_dump.models import IngestSource
+from nums_api.migrations import migrate, migrations, schema_migrations, stamp
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+class MigrationsTestCase(TestCase):
+    def setUp(self):
+        """Start from an empty database"""
+
+        db.session.remove()
+        db.drop_all()
+        schema_migrations.drop(db.engine, checkfirst=True)
+
+    def tearDown(self):
+        """Put back the schema the other tests expect"""
+
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+        schema_migrations.drop(db.engine, checkfirst=True)
+
+    def test_migrate_matches_models(self):
+        """Makes sure migrating builds the same schema as create_all"""
+
+        versions = [version for (version, module) in migrations()]
+
+        self.assertEqual(migrate(db.engine), versions)
+        self.assertEqual(migrate(db.engine), [])
+
+        inspector = inspect(db.engine)
+
+        # the loader's table is migrated too, though the app never uses it
+        self.assertIn(IngestSource.__tablename__, inspector.get_table_names())
+
+        for table in db.metadata.sorted_tables:
+            with self.subTest(table=table.name):
+                self.assertEqual(
+                    {
+                        column["name"]
+                        for column in inspector.get_columns(table.name)
+                    },
+                    set(table.c.keys())
+                )
+                self.assertEqual(
+                    {
+                        index["name"]
+                        for index in inspector.get_indexes(table.name)
+                        if "duplicates_constraint" not in index
+                    },
+                    {index.name for index in table.indexes}
+                )
+                self.assertEqual(
+                    sorted(
+                        constraint["column_names"]
+                        for constraint
+                        in inspector.get_unique_constraints(table.name)
+                    ),
+                    sorted([column.name] for column in table.c if column.unique)
+                )
+
+    def test_stamp(self):
+        """Makes sure a database made by create_all isn't migrated again"""
+
+        db.create_all()
+        stamp(db.engine)
+
+        self.assertEqual(migrate(db.engine), [])
@@ -0,0 +1,128 @@
+import random
+
+from flask import Blueprint, jsonify, request
+from nums_api.maths.routes import math_sampler, math_likes
+from nums_api.trivia.routes import trivia_sampler, trivia_likes
+from nums_api.years.routes import year_sampler, year_likes
+from nums_api.dates.routes import date_sampler, date_likes
+from werkzeug.exceptions import BadRequest
+
+random_facts = Blueprint("random_facts", __name__)
+
+# fact type -> (sampler, like recorder) of each category
+CATEGORIES = {
+    "math": (math_sampler, math_likes),
+    "trivia": (trivia_sampler, trivia_likes),
+    "year": (year_sampler, year_likes),
+    "date": (date_sampler, date_likes),
+}
+
+# how a category is picked: in proportion to its facts, evenly, or in
+# proportion to its likes
+WEIGHTS = ("fact", "category", "likes")
+
+
+def category_weights(weight):
+    """
+    Returns dict of fact type -> weight of picking that category
+
+    The counts come from the categories' samplers and like counts, which are
+    kept in memory, so no table is counted.
+    """
+
+    if weight == "likes":
+        return {
+            name: likes.counts.total_likes()
+            for (name, (sampler, likes)) in CATEGORIES.items()
+        }
+
+    if weight == "category":
+        return {
+            name: 1 if len(sampler) else 0
+            for (name, (sampler, likes)) in CATEGORIES.items()
+        }
+
+    return {
+        name: len(sampler)
+        for (name, (sampler, likes)) in CATEGORIES.items()
+    }
+
+
+@random_facts.get("")
+def get_random_fact():
+    """
+    Get a random fact of any category
+        Input: optional query string weight, one of
+            "fact" (default): every fact is equally likely
+            "category": every category is equally likely
+            "likes": every like is equally likely to pick its fact, unless
+                no fact has likes yet; weighted=likes, as on each
+                category's random route, is the same
+        Output: JSON like
+        {
+            "fact": {
+                "fragment": "the atomic number of Unquadpentium",
+                "statement": "145 is the atomic number of Unquadpentium.",
+                "number": 145,
+                "type": "trivia"
+            }
+        }
+
+        OR If there are no facts...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    weight = request.args.get("weight")
+    weighted = request.args.get("weighted")
+
+    if weighted is not None:
+        if weighted != "likes":
+            raise BadRequest("Invalid data: weighted must be likes")
+        if weight not in (None, "likes"):
+            raise BadRequest(
+                "Invalid data: weighted=likes can't go with another weight"
+            )
+
+        weight = "likes"
+
+    weight = weight or "fact"
+
+    if weight not in WEIGHTS:
+        raise BadRequest(
+            "Invalid data: weight must be fact, category or likes"
+        )
+
+    weights = category_weights(weight)
+
+    if weight == "likes" and not any(weights.values()):
+        # none has likes yet, so any fact will do
+        weight = "fact"
+        weights = category_weights(weight)
+
+    fact = None
+
+    if any(weights.values()):
+        (name, ) = random.choices(list(weights), list(weights.values()))
+        (sampler, likes) = CATEGORIES[name]
+
+        if weight == "likes":
+            fact = sampler.sample_liked(likes.counts)
+
+        if fact is None:
+            fact = sampler.sample()
+
+    if not fact:
+        error = {
+            "message": "No facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(fact=fact.serialize())
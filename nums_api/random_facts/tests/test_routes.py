@@ -0,0 +1,175 @@
+from unittest import TestCase
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.__init__ import limiter
+from nums_api.maths.models import Math, MathLikeCounter
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.years.models import Year, YearLikeCounter
+from nums_api.dates.models import Date, DateLikeCounter
+from nums_api.random_facts.routes import category_weights
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+REQUESTS = 40
+
+# the two ways to ask for facts weighted by likes
+LIKES_URLS = ["/api/random?weight=likes", "/api/random?weighted=likes"]
+
+
+class RandomFactBaseRouteTestCase(TestCase):
+    """
+        Houses setup functionality.
+        Should be subclassed for any random fact route classes utilized
+    """
+
+    def setUp(self):
+        """Set up test data here"""
+
+        for model in [
+            MathLikeCounter, TriviaLikeCounter, YearLikeCounter,
+            DateLikeCounter, Math, Trivia, Year, Date,
+        ]:
+            model.query.delete()
+
+        self.m1 = Math(
+            number=1,
+            fact_fragment="the number for this m1 test fact fragment",
+            fact_statement="1 is the number for this m1 test fact statement.",
+            was_submitted=False,
+        )
+
+        self.trivia = [
+            Trivia(
+                number=n,
+                fact_fragment=f"the number for this t{n} test fact fragment",
+                fact_statement=f"{n} is the number for this t{n} test fact.",
+                was_submitted=False,
+            )
+            for n in range(1, 4)
+        ]
+
+        self.y1 = Year(
+            year=2019,
+            fact_fragment="is the year COVID was detected",
+            fact_statement="2019 is the year COVID was first detected.",
+            was_submitted=False
+        )
+
+        self.d1 = Date(
+            day_of_year=1,
+            year=2023,
+            fact_fragment="the test case",
+            fact_statement="January 1st is the test case.",
+            was_submitted=True,
+        )
+
+        db.session.add_all([self.m1, self.y1, self.d1, *self.trivia])
+        db.session.commit()
+
+        self.client = app.test_client()
+
+        # disable API rate limits for tests
+        limiter.enabled = False
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+
+
+class RandomFactRouteTestCase(RandomFactBaseRouteTestCase):
+    def test_category_weights(self):
+        """Makes sure categories are weighted by facts, evenly or by likes"""
+
+        with app.test_request_context():
+            self.assertEqual(
+                category_weights("fact"),
+                {"math": 1, "trivia": 3, "year": 1, "date": 1}
+            )
+            self.assertEqual(
+                category_weights("category"),
+                {"math": 1, "trivia": 1, "year": 1, "date": 1}
+            )
+            self.assertEqual(
+                category_weights("likes"),
+                {"math": 0, "trivia": 0, "year": 0, "date": 0}
+            )
+
+        with self.client as c:
+            for _ in range(3):
+                c.post(f"/api/trivia/like/{self.trivia[0].id}")
+            c.post(f"/api/math/like/{self.m1.id}")
+
+        with app.test_request_context():
+            self.assertEqual(
+                category_weights("likes"),
+                {"math": 1, "trivia": 3, "year": 0, "date": 0}
+            )
+
+    def test_get_random_fact(self):
+        with self.client as c:
+            types = set()
+
+            for _ in range(REQUESTS):
+                resp = c.get("/api/random?weight=category")
+                self.assertEqual(resp.status_code, 200)
+                types.add(resp.json["fact"]["type"])
+
+            self.assertEqual(types, {"math", "trivia", "year", "date"})
+
+            resp = c.get("/api/random")
+            self.assertEqual(resp.status_code, 200)
+
+    def test_get_random_fact_by_likes(self):
+        with self.client as c:
+            c.post(f"/api/years/like/{self.y1.id}")
+
+            for url in LIKES_URLS:
+                for _ in range(REQUESTS):
+                    resp = c.get(url)
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual(resp.json["fact"]["type"], "year")
+
+            resp = c.get("/api/random?weighted=views")
+            self.assertEqual(resp.status_code, 400)
+
+            resp = c.get("/api/random?weight=category&weighted=likes")
+            self.assertEqual(resp.status_code, 400)
+
+    def test_get_random_fact_by_likes_none_liked(self):
+        """Makes sure facts are picked evenly while none has likes"""
+
+        with self.client as c:
+            for url in LIKES_URLS:
+                types = set()
+
+                for _ in range(REQUESTS):
+                    resp = c.get(url)
+                    self.assertEqual(resp.status_code, 200)
+                    types.add(resp.json["fact"]["type"])
+
+                self.assertGreater(len(types), 1)
+
+    def test_get_random_fact_invalid_weight(self):
+        with self.client as c:
+            resp = c.get("/api/random?weight=views")
+            self.assertEqual(resp.status_code, 400)
+
+    def test_get_random_fact_no_facts(self):
+        Trivia.query.delete()
+        Math.query.delete()
+        Year.query.delete()
+        Date.query.delete()
+        db.session.commit()
+
+        with self.client as c:
+            resp = c.get("/api/random")
+            self.assertEqual(resp.status_code, 404)
@@ -0,0 +1,80 @@
+"""The API docs page, rendered once and served from memory.
+
+The page only changes when the markdown docs or the template do, so it's
+rendered once and kept as bytes, along with gzip (and, if the brotli
+package is installed, brotli) compressed copies and a strong ETag for each.
+It's rendered on the first request (the template builds URLs with url_for,
+which needs one), and every request after checks the source files'
+modification times and renders the page again if one has changed.
+"""
+
+import gzip
+import hashlib
+import threading
+
+from flask import render_template
+from markdown import markdown
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class DocsPage:
+    """The docs page, rendered from a markdown file into a template."""
+
+    def __init__(self, docs_path, template_path, template_name):
+        self.docs_path = docs_path
+        self.template_path = template_path
+        self.template_name = template_name
+        self.lock = threading.Lock()
+
+        # (source mtimes, {content coding: (etag, body)}), swapped as a whole
+        self.rendered = (None, {})
+
+    def source_mtimes(self):
+        return (
+            self.docs_path.stat().st_mtime_ns,
+            self.template_path.stat().st_mtime_ns,
+        )
+
+    def render(self):
+        """Render the page; return dict of content coding -> (etag, body)."""
+
+        with open(self.docs_path, "r") as f:
+            api_docs = markdown(f.read())
+
+        html = render_template(self.template_name, api_docs=api_docs)
+        bodies = {"identity": html.encode()}
+
+        # mtime=0 keeps the gzip bytes (and so their ETag) the same each time
+        bodies["gzip"] = gzip.compress(bodies["identity"], 9, mtime=0)
+
+        if brotli is not None:
+            bodies["br"] = brotli.compress(bodies["identity"])
+
+        return {
+            coding: (hashlib.sha256(body).hexdigest()[:32], body)
+            for (coding, body) in bodies.items()
+        }
+
+    def variants(self):
+        """Return dict of content coding -> (etag, body).
+
+        Renders the page first if it hasn't been yet or a source file has
+        changed. Needs a request context.
+        """
+
+        mtimes = self.source_mtimes()
+        (rendered_mtimes, variants) = self.rendered
+
+        if mtimes != rendered_mtimes:
+            with self.lock:
+                (rendered_mtimes, variants) = self.rendered
+
+                if mtimes != rendered_mtimes:
+                    variants = self.render()
+                    self.rendered = (mtimes, variants)
+
+        return variants
@@ -1,6 +1,6 @@
-from flask import Blueprint, render_template
-from markdown import markdown
+from flask import Blueprint, Response, request
 from pathlib import Path
+from nums_api.root.docs import DocsPage
 
 # get the absolute path to the nums_api package directory
 # it's two levels up from the location of this module
@@ -8,12 +8,36 @@ nums_api_path = Path(__file__).parent.parent.absolute()
 
 root = Blueprint("root", __name__)
 
+docs_page = DocsPage(
+    nums_api_path / "static" / "docs" / "api-documentation.md",
+    nums_api_path / "templates" / "index.html",
+    "index.html",
+)
+
+
 @root.get("/")
 def root_route():
-    """Render html with API docs from markdown file."""
+    """
+    Serve html with API docs from markdown file.
+
+    The page is pre-rendered (see DocsPage): it's sent compressed if the
+    client accepts it, and a request with a matching If-None-Match gets an
+    empty 304.
+    """
+
+    variants = docs_page.variants()
+    coding = request.accept_encodings.best_match(
+        [coding for coding in ["br", "gzip"] if coding in variants],
+        default="identity",
+    )
+    (etag, body) = variants[coding]
+
+    response = Response(body, mimetype="text/html")
+    response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.no_cache = True
 
-    with open(f"{nums_api_path}/static/docs/api-documentation.md", "r") as f:
-        text = f.read()
-        api_docs = markdown(text)
+    if coding != "identity":
+        response.content_encoding = coding
 
-    return render_template("index.html", api_docs=api_docs)
+    return response.make_conditional(request)
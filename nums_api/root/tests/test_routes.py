@@ -1,5 +1,8 @@
+import gzip
+import os
 from unittest import TestCase
 from nums_api import app
+from nums_api.root.routes import docs_page
 
 # Make Flask errors be real errors, not HTML pages with error info
 app.config["TESTING"] = True
@@ -30,3 +33,55 @@ class RootRouteTestCase(TestCase):
             self.assertIn(
                 "<!-- API Documentation - Comment for testing purposes -->", html
             )
+
+    def test_root_route_gzip(self):
+        """Makes sure the page is sent gzipped to clients that accept it"""
+
+        with self.client as client:
+            plain = client.get("/")
+            response = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+            self.assertEqual(response.content_encoding, "gzip")
+            self.assertEqual(gzip.decompress(response.data), plain.data)
+            self.assertNotEqual(response.get_etag(), plain.get_etag())
+            self.assertIn("Accept-Encoding", response.vary)
+
+    def test_root_route_not_modified(self):
+        """Makes sure a request with the page's ETag gets an empty 304"""
+
+        with self.client as client:
+            response = client.get("/")
+            (etag, is_weak) = response.get_etag()
+
+            self.assertFalse(is_weak)
+
+            response = client.get("/", headers={"If-None-Match": f'"{etag}"'})
+
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b"")
+
+    def test_root_route_rerenders_on_change(self):
+        """Makes sure the page is rendered again when the docs change"""
+
+        with self.client as client:
+            (etag, is_weak) = client.get("/").get_etag()
+
+            stat = docs_page.docs_path.stat()
+            os.utime(
+                docs_page.docs_path,
+                ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000),
+            )
+            try:
+                (new_etag, is_weak) = client.get("/").get_etag()
+            finally:
+                os.utime(
+                    docs_page.docs_path,
+                    ns=(stat.st_atime_ns, stat.st_mtime_ns),
+                )
+
+            # same content, so the same ETag, but rendered again
+            self.assertEqual(new_etag, etag)
+            self.assertNotEqual(
+                docs_page.rendered[0][0],
+                stat.st_mtime_ns
+            )
@@ -4,8 +4,14 @@ from nums_api.trivia.models import Trivia
 from nums_api.maths.models import Math
 from nums_api.dates.models import Date
 from nums_api.years.models import Year
+from nums_api.facts_dump.models import IngestSource
+from nums_api.likes.models import LikeEvent, LikeRollup
+from nums_api.migrations import stamp
 
 # import all models - necessary for create_all()
 
 db.drop_all()
 db.create_all()
+
+# create_all made the latest schema, so there's nothing to migrate
+stamp(db.engine)
@@ -0,0 +1,178 @@
+"""Log slow SQL statements, with their query plan.
+
+Any statement taking over ``SLOW_QUERY_MS`` is logged with its parameters,
+the route it ran for and its plan, from a second cursor on the same
+connection (so in the same transaction, seeing the same rows):
+
+- a SELECT is re-run with ``EXPLAIN (ANALYZE, BUFFERS)``, for real row
+  counts, timings and cache hits;
+- anything else gets a plain ``EXPLAIN``, since ANALYZE would write again.
+
+The EXPLAIN runs in a savepoint, so if it fails the transaction carries on.
+Plans are Postgres EXPLAIN output, from the psycopg2 connection.
+
+So the log can't become a hotspot itself, each statement is logged at most
+once every ``SLOW_QUERY_LOG_INTERVAL`` seconds (with how many times it was
+slow in between), and only one plan is captured at a time per process; a
+slow statement arriving meanwhile is just counted.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+
+from flask import (
+    current_app, has_app_context, has_request_context, request,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# distinct statements remembered for rate limiting before starting afresh
+MAX_TRACKED_STATEMENTS = 1000
+
+
+class SlowQueryLog:
+    """Flask extension logging statements slower than SLOW_QUERY_MS."""
+
+    def __init__(self):
+        # statement -> when it was last logged (time.monotonic())
+        self.last_logged = {}
+        # statement -> times it was slow since
+        self.suppressed = Counter()
+        self.lock = threading.Lock()
+        self.explaining = threading.Lock()
+
+    def init_app(self, app):
+        if not event.contains(
+            Engine, "before_cursor_execute", self._query_start
+        ):
+            event.listen(Engine, "before_cursor_execute", self._query_start)
+            event.listen(Engine, "after_cursor_execute", self._query_end)
+            event.listen(Engine, "handle_error", self._query_failed)
+
+    def _query_start(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if has_app_context() and current_app.config["SLOW_QUERY_MS"]:
+            conn.info.setdefault("slow_query_start", []).append(
+                time.perf_counter()
+            )
+
+    def _query_end(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        starts = conn.info.get("slow_query_start")
+
+        if not starts:
+            return
+
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        threshold = current_app.config["SLOW_QUERY_MS"]
+
+        if threshold and elapsed_ms > threshold and self._should_log(
+            statement
+        ):
+            try:
+                self._log(cursor, statement, parameters, executemany,
+                          elapsed_ms)
+            finally:
+                self.explaining.release()
+
+    def _query_failed(self, context):
+        # a statement that raises never gets to after_cursor_execute, so its
+        # start would be left for the next statement on the connection
+        conn = context.connection
+
+        if conn is not None and context.execution_context is not None:
+            starts = conn.info.get("slow_query_start")
+
+            if starts:
+                starts.pop()
+
+    def _should_log(self, statement):
+        """Return whether to log the statement now, counting it if not.
+
+        If so, the caller holds the ``explaining`` lock and must release it.
+        """
+
+        now = time.monotonic()
+        interval = current_app.config["SLOW_QUERY_LOG_INTERVAL"]
+
+        with self.lock:
+            last = self.last_logged.get(statement)
+
+            if (
+                (last is not None and now - last < interval)
+                or not self.explaining.acquire(blocking=False)
+            ):
+                self.suppressed[statement] += 1
+                return False
+
+            if len(self.last_logged) >= MAX_TRACKED_STATEMENTS:
+                self.last_logged.clear()
+                self.suppressed.clear()
+
+            self.last_logged[statement] = now
+            return True
+
+    def _log(self, cursor, statement, parameters, executemany, elapsed_ms):
+        if has_request_context():
+            rule = request.url_rule.rule if request.url_rule else request.path
+            route = f"{request.method} {rule}"
+        else:
+            route = "no request"
+
+        with self.lock:
+            suppressed = self.suppressed.pop(statement, 0)
+
+        if executemany:
+            plan = "(no plan for executemany)"
+        else:
+            plan = explain(cursor, statement, parameters)
+
+        logger.warning(
+            "Slow query (%.1f ms) for %s, %d more times since last logged:"
+            "\n%s\nparameters: %r\n%s",
+            elapsed_ms, route, suppressed, statement, parameters, plan,
+        )
+
+
+def explain(cursor, statement, parameters):
+    """Return the statement's query plan as text, run on cursor's connection.
+
+    SELECTs are analyzed (so run again); other statements aren't run.
+    """
+
+    if statement.lstrip()[:6].upper() == "SELECT":
+        options = "(ANALYZE, BUFFERS) "
+    else:
+        options = ""
+
+    connection = cursor.connection
+    # outside a transaction (autocommit) a failure has nothing to abort
+    savepoint = not connection.autocommit
+
+    with connection.cursor() as explain_cursor:
+        if savepoint:
+            explain_cursor.execute("SAVEPOINT slow_query_explain")
+
+        try:
+            explain_cursor.execute(f"EXPLAIN {options}{statement}", parameters)
+            plan = "\n".join(line for (line, ) in explain_cursor.fetchall())
+        except Exception as e:
+            if savepoint:
+                explain_cursor.execute(
+                    "ROLLBACK TO SAVEPOINT slow_query_explain"
+                )
+            plan = f"(EXPLAIN failed: {e})"
+
+        if savepoint:
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+
+    return plan
+
+
+slow_query_log = SlowQueryLog()
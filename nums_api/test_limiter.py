@@ -1,3 +1,4 @@
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from nums_api import app
 from nums_api.database import db, connect_db
@@ -10,6 +11,7 @@ from nums_api.__init__ import limiter
 
 app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
 app.config["TESTING"] = True
+app.config["RATELIMIT_API"] = "5 per minute"
 app.config["SQLALCHEMY_ECHO"] = False
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
@@ -19,6 +21,22 @@ db.drop_all()
 db.create_all()
 
 
+def setUpModule():
+    """Count against throwaway storage, not the app's real counters"""
+
+    global storage_directory
+    storage_directory = TemporaryDirectory()
+
+    app.config["RATELIMIT_STORAGE_URI"] = (
+        f"sqlite:///{storage_directory.name}/ratelimits.sqlite3"
+    )
+    limiter.init_app(app)
+
+
+def tearDownModule():
+    storage_directory.cleanup()
+
+
 class LimiterBaseTestCase(TestCase):
     """
         Houses setup functionality.
@@ -66,6 +84,7 @@ class LimiterBaseTestCase(TestCase):
         self.client = app.test_client()
 
         limiter.enabled = True
+        limiter.reset()
 
     def tearDown(self):
         """Clean up any fouled transaction."""
@@ -235,3 +254,28 @@ class LimiterTestCase(LimiterBaseTestCase):
             # Send a req that exceeds the rate limit after different route req
             resp = c.get("/api/math/random")
             self.assertEqual(resp.status_code, 429)
+
+    def test_batch_counts_once(self):
+        with self.client as c:
+            # A batch of many numbers is one request against the limit
+            for i in range(5):
+                resp = c.get("/api/trivia/1..50")
+                self.assertEqual(resp.status_code, 200)
+
+            resp = c.get("/api/trivia/1..50")
+            self.assertEqual(resp.status_code, 429)
+
+    def test_routes_counted_separately(self):
+        with self.client as c:
+            for i in range(5):
+                resp = c.get("/api/trivia/1")
+                self.assertEqual(resp.status_code, 200)
+
+            resp = c.get("/api/trivia/1")
+            self.assertEqual(resp.status_code, 429)
+
+            # other routes, in this blueprint or another, have their own count
+            resp = c.get("/api/trivia/random")
+            self.assertEqual(resp.status_code, 200)
+            resp = c.get("/api/years/2019")
+            self.assertEqual(resp.status_code, 200)
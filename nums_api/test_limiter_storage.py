@@ -0,0 +1,124 @@
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest import TestCase
+
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter
+
+from nums_api.limiter_storage import SQLiteStorage
+
+
+def hit_shared_limit(uri, hits):
+    """Hit a 50 per minute limit in a fresh process; return hits allowed."""
+
+    # the limiter only keeps a weak reference to its storage
+    storage = storage_from_string(uri)
+    limiter = MovingWindowRateLimiter(storage)
+    item = RateLimitItemPerMinute(50)
+
+    return sum(limiter.hit(item, "client") for _ in range(hits))
+
+
+class SQLiteStorageTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "limits.sqlite3"
+        self.uri = f"sqlite:///{self.path}"
+        self.storage = storage_from_string(self.uri)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_storage_from_uri(self):
+        self.assertIsInstance(self.storage, SQLiteStorage)
+        self.assertEqual(self.storage.path, str(self.path))
+        self.assertTrue(self.storage.check())
+
+    def test_created_private(self):
+        """Makes sure the file and its directory are made on first use, and
+        only readable by this user"""
+
+        path = Path(self.directory.name) / "nums_api" / "limits.sqlite3"
+        storage = storage_from_string(f"sqlite:///{path}")
+
+        self.assertFalse(path.parent.exists())
+
+        storage.incr("key", 60)
+
+        self.assertEqual(path.parent.stat().st_mode & 0o777, 0o700)
+        self.assertEqual(path.stat().st_mode & 0o777, 0o600)
+
+    def test_incr_and_get(self):
+        self.assertEqual(self.storage.get("key"), 0)
+        self.assertEqual(self.storage.incr("key", 60), 1)
+        self.assertEqual(self.storage.incr("key", 60, amount=2), 3)
+        self.assertEqual(self.storage.get("key"), 3)
+        self.assertEqual(self.storage.get("other"), 0)
+
+        expiry = self.storage.get_expiry("key")
+        self.assertTrue(time.time() + 58 <= expiry <= time.time() + 60)
+
+    def test_incr_after_expiry(self):
+        self.storage.incr("key", 0.05)
+        time.sleep(0.1)
+
+        self.assertEqual(self.storage.get("key"), 0)
+        self.assertEqual(self.storage.incr("key", 60), 1)
+
+    def test_fixed_window(self):
+        limiter = FixedWindowRateLimiter(self.storage)
+        item = RateLimitItemPerMinute(5)
+
+        allowed = [limiter.hit(item, "client") for _ in range(7)]
+
+        self.assertEqual(allowed, [True] * 5 + [False] * 2)
+        self.assertTrue(limiter.hit(item, "other client"))
+
+    def test_moving_window(self):
+        limiter = MovingWindowRateLimiter(self.storage)
+        item = RateLimitItemPerMinute(5)
+
+        allowed = [limiter.hit(item, "client") for _ in range(7)]
+
+        self.assertEqual(allowed, [True] * 5 + [False] * 2)
+        self.assertEqual(limiter.get_window_stats(item, "client")[1], 0)
+        self.assertTrue(limiter.hit(item, "other client"))
+
+    def test_moving_window_slides(self):
+        self.assertTrue(self.storage.acquire_entry("key", 2, 0.2))
+        time.sleep(0.1)
+        self.assertTrue(self.storage.acquire_entry("key", 2, 0.2))
+        self.assertFalse(self.storage.acquire_entry("key", 2, 0.2))
+
+        # only the first hit has left the window
+        time.sleep(0.15)
+        self.assertTrue(self.storage.acquire_entry("key", 2, 0.2))
+        self.assertFalse(self.storage.acquire_entry("key", 2, 0.2))
+        self.assertEqual(self.storage.get_moving_window("key", 2, 0.2)[1], 2)
+
+    def test_clear_and_reset(self):
+        self.storage.incr("a", 60)
+        self.storage.incr("b", 60)
+        self.storage.acquire_entry("c", 5, 60)
+
+        self.storage.clear("a")
+        self.assertEqual(self.storage.get("a"), 0)
+        self.assertEqual(self.storage.get("b"), 1)
+
+        self.assertEqual(self.storage.reset(), 2)
+        self.assertEqual(self.storage.get("b"), 0)
+        self.assertEqual(self.storage.get_moving_window("c", 5, 60)[1], 0)
+
+    def test_shared_across_processes(self):
+        with ProcessPoolExecutor(4) as executor:
+            allowed = list(
+                executor.map(hit_shared_limit, [self.uri] * 4, [30] * 4)
+            )
+
+        self.assertEqual(sum(allowed), 50)
+        self.assertEqual(self.storage.get_moving_window(
+            "LIMITER/client/50/1/minute", 50, 60
+        )[1], 50)
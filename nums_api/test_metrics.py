@@ -0,0 +1,180 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.__init__ import limiter
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+def setUpModule():
+    """Count against throwaway storage, not the app's real counters"""
+
+    app.config["RATELIMIT_STORAGE_URI"] = "memory://"
+    limiter.init_app(app)
+
+# a worker process adding to the metrics, for the multi-process test
+WORKER = """
+from nums_api.metrics import LIKES, REQUESTS
+LIKES.labels("trivia").inc(2)
+REQUESTS.labels("trivia", "GET", "404").inc()
+"""
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        TriviaLikeCounter.query.delete()
+        Trivia.query.delete()
+
+        self.t1 = Trivia(
+            number=1,
+            fact_fragment="the loneliest number",
+            fact_statement="1 is the loneliest number.",
+            was_submitted=True,
+        )
+        db.session.add(self.t1)
+        db.session.commit()
+
+        self.client = app.test_client()
+        limiter.enabled = False
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+        limiter.enabled = False
+        app.config["RATELIMIT_API"] = "200 per day"
+
+    def test_requests_counted(self):
+        labels = {"blueprint": "trivia", "method": "GET"}
+        found = sample("nums_api_requests_total", status="200", **labels)
+        missed = sample("nums_api_requests_total", status="404", **labels)
+        timed = sample(
+            "nums_api_request_duration_seconds_count", blueprint="trivia"
+        )
+
+        with self.client as c:
+            c.get("/api/trivia/1")
+            c.get("/api/trivia/2")
+            c.get("/api/trivia/2")
+
+        self.assertEqual(
+            sample("nums_api_requests_total", status="200", **labels),
+            found + 1
+        )
+        self.assertEqual(
+            sample("nums_api_requests_total", status="404", **labels),
+            missed + 2
+        )
+        self.assertEqual(
+            sample(
+                "nums_api_request_duration_seconds_count", blueprint="trivia"
+            ),
+            timed + 3
+        )
+
+    def test_likes_counted(self):
+        likes = sample("nums_api_likes_total", category="trivia")
+        writes = sample("nums_api_like_writes_total", category="trivia")
+
+        with self.client as c:
+            c.post(f"/api/trivia/like/{self.t1.id}")
+            c.post(f"/api/trivia/like/{self.t1.id}")
+
+        self.assertEqual(
+            sample("nums_api_likes_total", category="trivia"), likes + 2
+        )
+        self.assertEqual(
+            sample("nums_api_like_writes_total", category="trivia"),
+            writes + 2
+        )
+
+    def test_rate_limited_counted(self):
+        app.config["RATELIMIT_API"] = "1 per minute"
+        limiter.enabled = True
+        limiter.reset()
+        limited = sample("nums_api_rate_limited_total", blueprint="trivia")
+
+        with self.client as c:
+            c.get("/api/trivia/1")
+            resp = c.get("/api/trivia/1")
+            self.assertEqual(resp.status_code, 429)
+
+            # /metrics itself is never limited
+            for _ in range(3):
+                resp = c.get("/metrics")
+                self.assertEqual(resp.status_code, 200)
+
+        self.assertEqual(
+            sample("nums_api_rate_limited_total", blueprint="trivia"),
+            limited + 1
+        )
+
+    def test_db_connections(self):
+        with db.engine.connect():
+            self.assertGreaterEqual(
+                sample("nums_api_db_connections", state="checked_out"), 1
+            )
+            self.assertGreaterEqual(
+                sample("nums_api_db_connections", state="open"), 1
+            )
+
+    def test_metrics_route(self):
+        with self.client as c:
+            c.get("/api/trivia/1")
+            resp = c.get("/metrics")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.content_type.startswith("text/plain"))
+        self.assertIn(
+            'nums_api_requests_total{blueprint="trivia",method="GET",'
+            'status="200"}',
+            resp.text
+        )
+
+    def test_multiple_processes(self):
+        """Makes sure workers' metrics are added up"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": directory}
+
+            for _ in range(2):
+                subprocess.run(
+                    [sys.executable, "-c", WORKER], env=env, check=True
+                )
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry, path=directory)
+
+            self.assertEqual(
+                registry.get_sample_value(
+                    "nums_api_likes_total", {"category": "trivia"}
+                ),
+                4
+            )
+            self.assertEqual(
+                registry.get_sample_value(
+                    "nums_api_requests_total",
+                    {"blueprint": "trivia", "method": "GET", "status": "404"}
+                ),
+                2
+            )
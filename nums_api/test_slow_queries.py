@@ -0,0 +1,116 @@
+from unittest import TestCase
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.years.models import Year
+from nums_api.__init__ import limiter
+from nums_api.slow_queries import slow_query_log
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+SLEEP = "SELECT pg_sleep(0.02), :n AS n"
+
+
+class SlowQueryLogTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        Year.query.delete()
+        db.session.commit()
+
+        self.threshold = app.config["SLOW_QUERY_MS"]
+        app.config["SLOW_QUERY_MS"] = 10
+        app.config["SLOW_QUERY_LOG_INTERVAL"] = 60
+        slow_query_log.last_logged.clear()
+        slow_query_log.suppressed.clear()
+
+        self.client = app.test_client()
+        limiter.enabled = False
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+        app.config["SLOW_QUERY_MS"] = self.threshold
+
+    def test_slow_select_explained(self):
+        """Makes sure a slow SELECT is logged with its analyzed plan"""
+
+        with self.assertLogs("nums_api.slow_queries") as logs:
+            db.session.execute(text(SLEEP), {"n": 1})
+
+        (message, ) = logs.output
+        self.assertIn("pg_sleep", message)
+        self.assertIn("'n': 1", message)
+        self.assertIn("no request", message)
+        self.assertIn("actual time=", message)
+
+        # the transaction is still usable
+        self.assertEqual(db.session.execute(text("SELECT 1")).scalar(), 1)
+
+    def test_fast_queries_not_logged(self):
+        app.config["SLOW_QUERY_MS"] = 1000
+
+        with self.assertNoLogs("nums_api.slow_queries"):
+            db.session.execute(text(SLEEP), {"n": 1})
+
+    def test_rate_limited(self):
+        """Makes sure a statement is logged once per interval, then counted"""
+
+        with self.assertLogs("nums_api.slow_queries") as logs:
+            for n in range(3):
+                db.session.execute(text(SLEEP), {"n": n})
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertEqual(slow_query_log.suppressed[SLEEP.replace(
+            ":n", "%(n)s"
+        )], 2)
+
+        app.config["SLOW_QUERY_LOG_INTERVAL"] = 0
+
+        with self.assertLogs("nums_api.slow_queries") as logs:
+            db.session.execute(text(SLEEP), {"n": 3})
+
+        self.assertIn("2 more times since last logged", logs.output[0])
+
+    def test_writes_not_analyzed(self):
+        """Makes sure a slow write isn't run again to explain it"""
+
+        statement = text(
+            "INSERT INTO years (year, fact_fragment, fact_statement, "
+            "was_submitted, added_at) "
+            "SELECT 1, 'slow', 'slow.', false, now() FROM pg_sleep(0.02)"
+        )
+
+        with self.assertLogs("nums_api.slow_queries") as logs:
+            db.session.execute(statement)
+        db.session.commit()
+
+        self.assertNotIn("actual time=", logs.output[0])
+        self.assertEqual(Year.query.count(), 1)
+
+    def test_route_logged(self):
+        with self.assertLogs("nums_api.slow_queries") as logs:
+            with app.test_request_context("/api/years/2019"):
+                db.session.execute(text(SLEEP), {"n": 1})
+
+        self.assertIn("for GET /api/years/<int:year>", logs.output[0])
+
+    def test_failed_query_start_dropped(self):
+        """Makes sure a statement that raises doesn't leave its start time
+        for the next statement on the connection"""
+
+        with db.engine.connect() as conn:
+            with self.assertRaises(ProgrammingError):
+                conn.execute(text("SELECT no_such_column"))
+
+            self.assertEqual(conn.info["slow_query_start"], [])
@@ -0,0 +1,107 @@
+from unittest import TestCase
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from nums_api import app
+from nums_api.database import db, connect_db
+from nums_api.config import DATABASE_URL_TEST
+from nums_api.trivia.models import Trivia
+from nums_api.__init__ import limiter
+from nums_api.timing import Timings, _current, request_timing
+
+app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL_TEST
+app.config["TESTING"] = True
+app.config["SQLALCHEMY_ECHO"] = False
+app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+
+connect_db(app)
+
+db.drop_all()
+db.create_all()
+
+
+class RequestTimingTestCase(TestCase):
+    def setUp(self):
+        """Set up test data here"""
+
+        Trivia.query.delete()
+
+        self.t1 = Trivia(
+            number=1,
+            fact_fragment="the loneliest number",
+            fact_statement="1 is the loneliest number.",
+            was_submitted=True,
+        )
+        db.session.add(self.t1)
+        db.session.commit()
+
+        self.client = app.test_client()
+        limiter.enabled = False
+
+        app.config["REQUEST_TIMING"] = True
+        request_timing.reset()
+
+    def tearDown(self):
+        """Clean up any fouled transaction."""
+        db.session.rollback()
+        app.config["REQUEST_TIMING"] = False
+
+    def test_server_timing_header(self):
+        with self.client as c:
+            resp = c.get("/api/trivia/1")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertRegex(
+            resp.headers["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$'
+        )
+
+    def test_off(self):
+        app.config["REQUEST_TIMING"] = False
+
+        with self.client as c:
+            resp = c.get("/api/trivia/1")
+            self.assertNotIn("Server-Timing", resp.headers)
+
+            resp = c.get("/timing")
+            self.assertEqual(resp.status_code, 404)
+
+        self.assertEqual(request_timing.report(), [])
+
+    def test_report(self):
+        with self.client as c:
+            for _ in range(3):
+                c.get("/api/trivia/1")
+            c.get("/api/trivia/random")
+
+            resp = c.get("/timing")
+
+        routes = {r["route"]: r for r in resp.json["routes"]}
+
+        self.assertEqual(
+            routes.keys(),
+            {"GET /api/trivia/<int:number>", "GET /api/trivia/random"}
+        )
+
+        number = routes["GET /api/trivia/<int:number>"]
+        self.assertEqual(number["requests"], 3)
+        self.assertEqual(
+            number["mean_queries"], round(number["queries"] / 3, 2)
+        )
+        self.assertLessEqual(number["db_ms"], number["handler_ms"])
+
+    def test_failed_query_ended(self):
+        """Makes sure a statement that raises doesn't leave its start time
+        for the next statement on the connection"""
+
+        timings = Timings()
+        token = _current.set(timings)
+
+        try:
+            with db.engine.connect() as conn:
+                with self.assertRaises(ProgrammingError):
+                    conn.execute(text("SELECT no_such_column"))
+
+                self.assertEqual(conn.info["query_start"], [])
+                self.assertEqual(timings.queries, 1)
+        finally:
+            _current.reset(token)
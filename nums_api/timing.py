@@ -0,0 +1,189 @@
+"""Per-request SQL and handler timings.
+
+With ``REQUEST_TIMING`` on, each request counts the SQL statements it runs
+and the time spent in them (from SQLAlchemy cursor events) and in its
+handler, and answers with them in a Server-Timing header::
+
+    Server-Timing: db;dur=1.83;desc="3 queries", app;dur=4.10
+
+which browsers' dev tools show with the request. The same numbers are added
+up per route, for this process, in ``request_timing.report()`` and at
+``/timing``. None of it echoes SQL (that's ``SQLALCHEMY_ECHO``).
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+
+from flask import current_app, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# the timings of the request being handled, if it's being timed
+_current = ContextVar("request_timings", default=None)
+
+
+class Timings:
+    """Queries and time taken, by one request or added up over many."""
+
+    __slots__ = (
+        "requests", "queries", "db_time", "handler_time", "started",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        # seconds
+        self.db_time = 0.0
+        self.handler_time = 0.0
+        self.started = None
+
+    def add(self, other):
+        self.requests += other.requests
+        self.queries += other.queries
+        self.db_time += other.db_time
+        self.handler_time += other.handler_time
+
+    def server_timing(self):
+        """Return the Server-Timing header value, durations in ms."""
+
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"'
+            f", app;dur={self.handler_time * 1000:.2f}"
+        )
+
+
+class RequestTiming:
+    """Flask extension timing requests and the SQL they run."""
+
+    def __init__(self):
+        # "GET /api/trivia/<int:number>" -> Timings
+        self.routes = {}
+        self.lock = threading.Lock()
+
+    def init_app(self, app):
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._clear)
+        app.add_url_rule("/timing", "timing_report", self._report_route)
+
+        if not event.contains(Engine, "before_cursor_execute", _query_start):
+            event.listen(Engine, "before_cursor_execute", _query_start)
+            event.listen(Engine, "after_cursor_execute", _query_end)
+            event.listen(Engine, "handle_error", _query_failed)
+
+    def _start(self):
+        if current_app.config["REQUEST_TIMING"]:
+            timings = Timings()
+            timings.requests = 1
+            timings.started = time.perf_counter()
+            _current.set(timings)
+
+    def _finish(self, response):
+        timings = _current.get()
+
+        if timings is not None:
+            timings.handler_time = time.perf_counter() - timings.started
+            response.headers["Server-Timing"] = timings.server_timing()
+
+            rule = request.url_rule.rule if request.url_rule else "<no route>"
+            route = f"{request.method} {rule}"
+
+            with self.lock:
+                if route not in self.routes:
+                    self.routes[route] = Timings()
+                self.routes[route].add(timings)
+
+        return response
+
+    def _clear(self, exc):
+        _current.set(None)
+
+    def report(self):
+        """Return list of each route's timings, most time taken first.
+
+        Times are in ms: totals, and means per request.
+        """
+
+        with self.lock:
+            routes = list(self.routes.items())
+
+        routes.sort(key=lambda item: item[1].handler_time, reverse=True)
+
+        return [
+            {
+                "route": route,
+                "requests": t.requests,
+                "queries": t.queries,
+                "db_ms": round(t.db_time * 1000, 2),
+                "handler_ms": round(t.handler_time * 1000, 2),
+                "mean_queries": round(t.queries / t.requests, 2),
+                "mean_db_ms": round(t.db_time * 1000 / t.requests, 2),
+                "mean_handler_ms": round(
+                    t.handler_time * 1000 / t.requests, 2
+                ),
+            }
+            for (route, t) in routes
+        ]
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+    def _report_route(self):
+        """
+        Get this process's request timings, per route
+            Output: JSON like
+            {
+                "routes": [
+                    {
+                        "route": "GET /api/trivia/<int:number>",
+                        "requests": 20,
+                        "queries": 20,
+                        "db_ms": 12.5,
+                        "handler_ms": 30.1,
+                        "mean_queries": 1.0,
+                        "mean_db_ms": 0.62,
+                        "mean_handler_ms": 1.5
+                    },
+                    {...}
+                ]
+            }
+
+            OR If REQUEST_TIMING is off, a 404
+        """
+
+        if not current_app.config["REQUEST_TIMING"]:
+            error = {
+                "message": "Request timing is off",
+                "status": 404
+            }
+
+            return (jsonify(error=error), 404)
+
+        return jsonify(routes=self.report())
+
+
+def _query_start(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _query_end(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+
+    if timings is not None and conn.info.get("query_start"):
+        timings.queries += 1
+        timings.db_time += time.perf_counter() - conn.info["query_start"].pop()
+
+
+def _query_failed(context):
+    # a statement that raises never gets to after_cursor_execute, so end it
+    # here, or its start is left for the next statement on the connection
+    conn = context.connection
+
+    if conn is not None and context.execution_context is not None:
+        _query_end(conn, None, None, None, None, None)
+
+
+request_timing = RequestTiming()
@@ -16,6 +16,7 @@ class Trivia(db.Model):
     number = db.Column(
         db.Integer,
         nullable=False,
+        index=True,
     )
 
     # fact with no prefix, first word lowercase, no punctuation at the end
@@ -43,6 +44,30 @@ class Trivia(db.Model):
         nullable=False,
     )
 
+    # digest of the fact's content when loaded from the facts dump, so a
+    # re-run of the loader can tell unchanged facts from changed ones
+    content_hash = db.Column(
+        db.String(32),
+        unique=True,
+    )
+
+    # dump file the fact was loaded from, like "years/wikipedia_1_100.txt",
+    # so facts taken out of it can be deleted when it's loaded again
+    source = db.Column(
+        db.String(200),
+        index=True,
+    )
+
+    def serialize(self):
+        """Serialize to dictionary."""
+
+        return {
+            "fragment": self.fact_fragment,
+            "statement": self.fact_statement,
+            "number": self.number,
+            "type": "trivia",
+        }
+
 
 class TriviaLikeCounter(db.Model):
     """Keeps track of amount of likes per fact"""
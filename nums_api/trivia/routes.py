@@ -1,10 +1,21 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from nums_api.trivia.models import Trivia, TriviaLikeCounter
-import random
-from nums_api.database import db
+from nums_api.cache.sampler import RandomFactSampler
+from nums_api.cache.index import FactIndex
+from nums_api.cache.keys import SortedFactKeys, CLOSEST_MODES
+from nums_api.likes.recorder import LikeRecorder
+from nums_api.likes.weighted import like_weights
+from nums_api.likes.ranking import top_facts, trending_facts
+from nums_api.batch import parse_batch, parse_int
+from werkzeug.exceptions import BadRequest
 
 trivia = Blueprint("trivia", __name__)
 
+trivia_sampler = RandomFactSampler(Trivia)
+trivia_likes = LikeRecorder(Trivia, TriviaLikeCounter, trivia_sampler)
+trivia_keys = SortedFactKeys(Trivia, Trivia.number, typecode="q")
+trivia_index = FactIndex(Trivia, Trivia.number, keys=trivia_keys)
+
 
 @trivia.get("/<int:number>")
 def get_trivia_fact(number):
@@ -21,6 +32,13 @@ def get_trivia_fact(number):
             }
         }
 
+        With query string notfound=floor, ceil or nearest, a number without
+        a fact gets the fact of the closest number below it, above it or
+        either side instead (its "number" says which).
+
+        With query string weighted=likes, a number with several facts gets
+        one picked in proportion to their likes.
+
         OR If number is not found...
         Output: JSON like
         {
@@ -30,9 +48,23 @@ def get_trivia_fact(number):
                     }
         }
     """
-    trivia_facts = Trivia.query.filter(Trivia.number == number).all()
 
-    if not trivia_facts:
+    notfound = request.args.get("notfound")
+
+    if notfound is not None and notfound not in CLOSEST_MODES:
+        raise BadRequest(
+            "Invalid data: notfound must be floor, ceil or nearest"
+        )
+
+    like_counts = like_weights(trivia_likes)
+    fact_data = trivia_index.choice(number, like_counts)
+
+    if not fact_data and notfound:
+        fact_data = trivia_keys.closest_fact(
+            number, notfound, lambda key: trivia_index.choice(key, like_counts)
+        )
+
+    if not fact_data:
         error = {
             "message": f"A trivia fact for { number } not found",
             "status": 404
@@ -40,16 +72,59 @@ def get_trivia_fact(number):
 
         return (jsonify(error=error), 404)
 
-    fact = random.choice(trivia_facts)
+    return jsonify(fact=fact_data)
+
+
+@trivia.get("/<batch:numbers>")
+def get_trivia_facts_batch(numbers):
+    """
+    Get trivia facts about many numbers in one request
+        Input: numbers (str) like "1,2,3" or "1..100" or "1..5,7"
+        Output: JSON like
+        {
+            "facts": {
+                "1": {
+                    "fragment": "the loneliest number",
+                    "statement": "1 is the loneliest number.",
+                    "number": 1,
+                    "type": "trivia"
+                },
+                "2": {...}
+            }
+        }
+
+        Numbers without a fact are left out.
+
+        OR If none of the numbers are found...
+        Output: JSON like
+        {
+            error: {
+                    "message": f"No trivia facts for { numbers } found",
+                    "status": 404
+                    }
+        }
+    """
 
-    fact_data = {
-        "fragment": fact.fact_fragment,
-        "statement": fact.fact_statement,
-        "number": fact.number,
-        "type": "trivia"
+    try:
+        keys = parse_batch(numbers, parse_int)
+    except ValueError as e:
+        (error_msg, ) = e.args
+        raise BadRequest(error_msg)
+
+    facts = trivia_index.choices(keys.values())
+    facts_data = {
+        label: facts[key] for (label, key) in keys.items() if key in facts
     }
 
-    return jsonify(fact=fact_data)
+    if not facts_data:
+        error = {
+            "message": f"No trivia facts for { numbers } found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts_data)
 
 
 @trivia.get("/random")
@@ -65,19 +140,118 @@ def get_trivia_fact_random():
                "type": "trivia"
            }
        }
+
+        With query string weighted=likes, facts are picked in proportion to
+        their likes, so only liked facts are picked, unless none has likes
+        yet.
     """
 
-    trivia_facts = Trivia.query.all()
-    fact = random.choice(trivia_facts)
+    like_counts = like_weights(trivia_likes)
 
-    fact_data = {
-        "fragment": fact.fact_fragment,
-        "statement": fact.fact_statement,
-        "number": fact.number,
-        "type": "trivia",
-    }
+    fact = None
 
-    return jsonify(fact=fact_data)
+    if like_counts is not None:
+        fact = trivia_sampler.sample_liked(like_counts)
+
+    if fact is None:
+        # none has likes yet, so any fact will do
+        fact = trivia_sampler.sample()
+
+    if not fact:
+        error = {
+            "message": "No trivia facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(fact=fact.serialize())
+
+
+@trivia.get("/top")
+def get_trivia_facts_top():
+    """
+    Get the most liked trivia facts
+        Input: optional query string limit, how many (default 10, at most
+            100), like "?limit=3"
+        Output: JSON like
+        {
+            "facts": [
+                {
+                    "fragment": "...",
+                    "statement": "...",
+                    "number": 145,
+                    "type": "trivia",
+                    "likes": 12
+                },
+                {...}
+            ]
+        }
+
+        OR If no trivia fact has likes...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No liked trivia facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    facts = top_facts(trivia_likes)
+
+    if not facts:
+        error = {
+            "message": "No liked trivia facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts)
+
+
+@trivia.get("/trending")
+def get_trivia_facts_trending():
+    """
+    Get the trending trivia facts, scored by recent likes
+        Input: optional query string limit, how many (default 10, at most
+            100), like "?limit=3"
+        Output: JSON like
+        {
+            "facts": [
+                {
+                    "fragment": "...",
+                    "statement": "...",
+                    "number": 145,
+                    "type": "trivia",
+                    "score": 7.5
+                },
+                {...}
+            ]
+        }
+
+        OR If no trivia fact has likes lately...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No trending trivia facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    facts = trending_facts(trivia_likes)
+
+    if not facts:
+        error = {
+            "message": "No trending trivia facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts)
 
 
 @trivia.post("/like/<int:id>")
@@ -97,23 +271,11 @@ def add_trivia_like(id):
         }
     """
 
-    fact = Trivia.query.get(id)
-
-    if not fact:
+    if not trivia_likes.record(id):
         error = {
             "message": f"A trivia fact for id { id } not found",
             "status": 404
         }
         return (jsonify(error), 404)
 
-    like_counter = TriviaLikeCounter.query.filter_by(trivia_id=fact.id).first()
-
-    if not like_counter:
-        like_counter = TriviaLikeCounter(trivia_id=id)
-        db.session.add(like_counter)
-        db.session.commit()
-
-    like_counter.increment_likes()
-    db.session.commit()
-
     return ("You have liked this fact.", 200)
@@ -55,6 +55,14 @@ class TriviaModelTestCase(TestCase):
         self.assertEqual(Trivia.query.count(), 1)
         self.assertEqual(Trivia.query.filter_by(number=1).one().number, 1)
 
+    def test_serialize(self):
+        self.assertEqual(self.t1.serialize(), {
+            "fragment": "the number for this t1 test fact fragment",
+            "statement": "1 is the number for this t1 test fact statement.",
+            "number": 1,
+            "type": "trivia",
+        })
+
     def test_add_likes(self):
         """Makes sure the like feature works"""
 
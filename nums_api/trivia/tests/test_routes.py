@@ -2,6 +2,7 @@ from unittest import TestCase
 from nums_api import app
 from nums_api.database import db, connect_db
 from nums_api.trivia.models import Trivia, TriviaLikeCounter
+from nums_api.likes.models import LikeEvent, LikeRollup
 from nums_api.config import DATABASE_URL_TEST
 from nums_api.__init__ import limiter
 
@@ -84,6 +85,150 @@ class TriviaRouteTestCase(TriviaBaseRouteTestCase):
             self.assertEqual(resp.status_code, 404)
             self.assertEqual(resp.json, expected_resp)
 
+    def test_get_trivia_fact_notfound(self):
+        """Makes sure a missing number can fall back to the closest one"""
+
+        t2 = Trivia(
+            number=10,
+            fact_fragment="the number of fingers",
+            fact_statement="10 is the number of fingers.",
+            was_submitted=False,
+        )
+        db.session.add(t2)
+        db.session.commit()
+
+        with self.client as c:
+            cases = [
+                ("5?notfound=floor", 1),
+                ("5?notfound=ceil", 10),
+                ("5?notfound=nearest", 1),
+                ("6?notfound=nearest", 10),
+                ("10?notfound=floor", 10),
+                ("0?notfound=ceil", 1),
+                ("100?notfound=nearest", 10),
+            ]
+
+            for (url, number) in cases:
+                resp = c.get(f"/api/trivia/{url}")
+                self.assertEqual(resp.status_code, 200, url)
+                self.assertEqual(resp.json["fact"]["number"], number, url)
+
+            resp = c.get("/api/trivia/0?notfound=floor")
+            self.assertEqual(resp.status_code, 404)
+
+            resp = c.get("/api/trivia/5")
+            self.assertEqual(resp.status_code, 404)
+
+            resp = c.get("/api/trivia/1?notfound=default")
+            self.assertEqual(resp.status_code, 400)
+
+    def test_get_trivia_fact_weighted_by_likes(self):
+        """Makes sure ?weighted=likes only picks liked facts"""
+
+        t2 = Trivia(
+            number=1,
+            fact_fragment="the first positive integer",
+            fact_statement="1 is the first positive integer.",
+            was_submitted=False,
+        )
+        db.session.add(t2)
+        db.session.commit()
+
+        with self.client as c:
+            # with no likes, facts are picked evenly
+            resp = c.get("/api/trivia/random?weighted=likes")
+            self.assertEqual(resp.status_code, 200)
+
+            resp = c.get("/api/trivia/1?weighted=likes")
+            self.assertEqual(resp.status_code, 200)
+
+            c.post(f"/api/trivia/like/{t2.id}")
+
+            for url in ["/api/trivia/1", "/api/trivia/random"]:
+                for _ in range(20):
+                    resp = c.get(f"{url}?weighted=likes")
+                    self.assertEqual(
+                        resp.json["fact"]["fragment"],
+                        "the first positive integer"
+                    )
+
+            resp = c.get("/api/trivia/1?weighted=views")
+            self.assertEqual(resp.status_code, 400)
+
+            resp = c.get("/api/trivia/random?weighted=views")
+            self.assertEqual(resp.status_code, 400)
+
+    def test_get_trivia_facts_top(self):
+        t2 = Trivia(
+            number=2,
+            fact_fragment="the only even prime",
+            fact_statement="2 is the only even prime.",
+            was_submitted=False,
+        )
+        db.session.add(t2)
+        db.session.commit()
+
+        with self.client as c:
+            resp = c.get("/api/trivia/top")
+            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(
+                resp.json["error"]["message"],
+                "No liked trivia facts found"
+            )
+
+            c.post(f"/api/trivia/like/{self.t1.id}")
+            c.post(f"/api/trivia/like/{t2.id}")
+            c.post(f"/api/trivia/like/{t2.id}")
+
+            resp = c.get("/api/trivia/top")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(
+                [(f["number"], f["likes"]) for f in resp.json["facts"]],
+                [(2, 2), (1, 1)]
+            )
+            self.assertEqual(
+                resp.json["facts"][1],
+                {
+                    "fragment": "the loneliest number",
+                    "statement": "1 is the loneliest number.",
+                    "number": 1,
+                    "type": "trivia",
+                    "likes": 1,
+                }
+            )
+
+            resp = c.get("/api/trivia/top?limit=1")
+            self.assertEqual(len(resp.json["facts"]), 1)
+
+            for limit in ["0", "101", "ten"]:
+                resp = c.get(f"/api/trivia/top?limit={limit}")
+                self.assertEqual(resp.status_code, 400)
+
+    def test_get_trivia_facts_trending(self):
+        LikeEvent.query.delete()
+        LikeRollup.query.delete()
+        db.session.commit()
+
+        with self.client as c:
+            resp = c.get("/api/trivia/trending")
+            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(
+                resp.json["error"]["message"],
+                "No trending trivia facts found"
+            )
+
+            c.post(f"/api/trivia/like/{self.t1.id}")
+            c.post(f"/api/trivia/like/{self.t1.id}")
+
+            resp = c.get("/api/trivia/trending")
+            self.assertEqual(resp.status_code, 200)
+            ((fact, ), ) = [resp.json["facts"]]
+            self.assertEqual(fact["number"], 1)
+            self.assertAlmostEqual(fact["score"], 2, places=2)
+
+            resp = c.get("/api/trivia/trending?limit=101")
+            self.assertEqual(resp.status_code, 400)
+
     def test_get_trivia_fact_not_valid_number(self):
         with self.client as c:
 
@@ -129,3 +274,54 @@ class TriviaRouteTestCase(TriviaBaseRouteTestCase):
 
             resp = c.post(f"api/trivia/like/{-1}")
             self.assertEqual(resp.status_code, 404)
+
+    def test_get_trivia_facts_batch(self):
+        with self.client as c:
+
+            resp = c.get("/api/trivia/1,2")
+            expected_resp = {
+                "facts": {
+                    "1": {
+                        "fragment": "the loneliest number",
+                        "statement": "1 is the loneliest number.",
+                        "number": 1,
+                        "type": "trivia",
+                    }
+                }
+            }
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json, expected_resp)
+
+            resp = c.get("/api/trivia/0..5")
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json, expected_resp)
+
+    def test_get_trivia_facts_batch_not_found(self):
+        with self.client as c:
+
+            resp = c.get("/api/trivia/10..12")
+            expected_resp = {
+                "error": {
+                    "message": "No trivia facts for 10..12 found",
+                    "status": 404
+                }
+            }
+
+            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(resp.json, expected_resp)
+
+    def test_get_trivia_facts_batch_invalid(self):
+        with self.client as c:
+
+            resp = c.get("/api/trivia/1,a")
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn("a is not an integer", resp.get_data(as_text=True))
+
+            resp = c.get("/api/trivia/5..1")
+            self.assertEqual(resp.status_code, 400)
+
+            resp = c.get("/api/trivia/1..1000")
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn("Batch exceeds 100 keys", resp.get_data(as_text=True))
@@ -1,10 +1,21 @@
 from flask import Blueprint, jsonify
 from nums_api.years.models import Year, YearLikeCounter
-import random
-from nums_api.database import db
+from nums_api.cache.sampler import RandomFactSampler
+from nums_api.cache.index import FactIndex
+from nums_api.cache.keys import FactKeyBitmap
+from nums_api.likes.recorder import LikeRecorder
+from nums_api.likes.weighted import like_weights
+from nums_api.likes.ranking import top_facts, trending_facts
+from nums_api.batch import parse_batch, parse_int
+from werkzeug.exceptions import BadRequest
 
 years = Blueprint("years", __name__)
 
+year_sampler = RandomFactSampler(Year)
+year_likes = LikeRecorder(Year, YearLikeCounter, year_sampler)
+year_keys = FactKeyBitmap(Year, Year.year)
+year_index = FactIndex(Year, Year.year, keys=year_keys)
+
 @years.get("/<int:year>")
 def get_year_facts(year):
     """
@@ -20,6 +31,9 @@ def get_year_facts(year):
             }
         }
 
+        With query string weighted=likes, a year with several facts gets
+        one picked in proportion to their likes.
+
         OR If number is not found...
         Output: JSON like
         {
@@ -29,9 +43,10 @@ def get_year_facts(year):
                     }
         }
     """
-    year_facts = Year.query.filter(Year.year == year).all()
+    like_counts = like_weights(year_likes)
+    fact_data = year_index.choice(year, like_counts)
 
-    if not year_facts:
+    if not fact_data:
         error = {
             "message": f"A fact for { year } not found",
             "status": 404
@@ -39,16 +54,59 @@ def get_year_facts(year):
 
         return (jsonify(error=error), 404)
 
-    fact = random.choice(year_facts)
+    return jsonify(fact=fact_data)
+
+
+@years.get("/<batch:years_list>")
+def get_year_facts_batch(years_list):
+    """
+    Get facts about many years in one request
+        Input: years_list (str) like "1989,2022" or "1900..1999"
+        Output: JSON like
+        {
+            "facts": {
+                "1989": {
+                    "fragment": "the year the Berlin Wall fell",
+                    "statement": "1989 is the year the Berlin Wall fell.",
+                    "year": 1989,
+                    "type": "year"
+                },
+                "2022": {...}
+            }
+        }
+
+        Years without a fact are left out.
 
-    fact_data = {
-        "fragment": fact.fact_fragment,
-        "statement": fact.fact_statement,
-        "year": fact.year,
-        "type": "year"
+        OR If none of the years are found...
+        Output: JSON like
+        {
+            error: {
+                    "message": f"No facts for { years_list } found",
+                    "status": 404
+                    }
+        }
+    """
+
+    try:
+        keys = parse_batch(years_list, parse_int)
+    except ValueError as e:
+        (error_msg, ) = e.args
+        raise BadRequest(error_msg)
+
+    facts = year_index.choices(keys.values())
+    facts_data = {
+        label: facts[key] for (label, key) in keys.items() if key in facts
     }
 
-    return jsonify(fact=fact_data)
+    if not facts_data:
+        error = {
+            "message": f"No facts for { years_list } found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts_data)
 
 
 @years.get("/random")
@@ -64,18 +122,117 @@ def get_year_facts_random():
                 "type": "year"
             }
         }
+
+        With query string weighted=likes, facts are picked in proportion to
+        their likes, so only liked facts are picked, unless none has likes
+        yet.
     """
-    year_facts = Year.query.all()
-    fact = random.choice(year_facts)
-
-    fact_data = {
-        "fragment": fact.fact_fragment,
-        "statement": fact.fact_statement,
-        "year": fact.year,
-        "type": "year"
-    }
+    like_counts = like_weights(year_likes)
 
-    return jsonify(fact=fact_data)
+    fact = None
+
+    if like_counts is not None:
+        fact = year_sampler.sample_liked(like_counts)
+
+    if fact is None:
+        # none has likes yet, so any fact will do
+        fact = year_sampler.sample()
+
+    if not fact:
+        error = {
+            "message": "No year facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(fact=fact.serialize())
+
+
+@years.get("/top")
+def get_year_facts_top():
+    """
+    Get the most liked year facts
+        Input: optional query string limit, how many (default 10, at most
+            100), like "?limit=3"
+        Output: JSON like
+        {
+            "facts": [
+                {
+                    "fragment": "...",
+                    "statement": "...",
+                    "year": 2022,
+                    "type": "year",
+                    "likes": 12
+                },
+                {...}
+            ]
+        }
+
+        OR If no year fact has likes...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No liked year facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    facts = top_facts(year_likes)
+
+    if not facts:
+        error = {
+            "message": "No liked year facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts)
+
+
+@years.get("/trending")
+def get_year_facts_trending():
+    """
+    Get the trending year facts, scored by recent likes
+        Input: optional query string limit, how many (default 10, at most
+            100), like "?limit=3"
+        Output: JSON like
+        {
+            "facts": [
+                {
+                    "fragment": "...",
+                    "statement": "...",
+                    "year": 2022,
+                    "type": "year",
+                    "score": 7.5
+                },
+                {...}
+            ]
+        }
+
+        OR If no year fact has likes lately...
+        Output: JSON like
+        {
+            error: {
+                    "message": "No trending year facts found",
+                    "status": 404
+                    }
+        }
+    """
+
+    facts = trending_facts(year_likes)
+
+    if not facts:
+        error = {
+            "message": "No trending year facts found",
+            "status": 404
+        }
+
+        return (jsonify(error=error), 404)
+
+    return jsonify(facts=facts)
 
 
 @years.post("/like/<int:id>")
@@ -95,23 +252,11 @@ def add_year_like(id):
         }
     """
 
-    fact = Year.query.get(id)
-
-    if not fact:
+    if not year_likes.record(id):
         error = {
             "message": f"A year fact for id { id } not found",
             "status": 404
         }
         return (jsonify(error), 404)
 
-    like_counter = YearLikeCounter.query.filter_by(year_id=fact.id).first()
-
-    if not like_counter:
-        like_counter = YearLikeCounter(year_id=id)
-        db.session.add(like_counter)
-        db.session.commit()
-
-    like_counter.increment_likes()
-    db.session.commit()
-
     return ("You have liked this fact.", 200)
@@ -65,6 +65,15 @@ class YearModelTestCase(TestCase):
                          "2023 is the year for this y1 test fact statement.")
         self.assertEqual(year_obj.was_submitted, False)
 
+    def test_serialize(self):
+        """Test serializing to dictionary"""
+        self.assertEqual(self.y1.serialize(), {
+            "fragment": "the year for this y1 test fact_fragment",
+            "statement": "2023 is the year for this y1 test fact statement.",
+            "year": 2023,
+            "type": "year",
+        })
+
     def test_model_invalid_data(self):
         """Test invalid data"""
         self.assertEqual(Year.query.count(), 0)
@@ -130,3 +130,19 @@ class YearRouteTestCase(YearBaseRouteTestCase):
 
             resp = c.post(f"api/years/like/{-1}")
             self.assertEqual(resp.status_code, 404)
+
+    def test_get_year_facts_batch(self):
+        with self.client as c:
+
+            resp = c.get("/api/years/2000..2019,2200")
+            expected_resp = {"facts": {"2019": self.y1.serialize()}}
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json, expected_resp)
+
+    def test_get_year_facts_batch_not_found(self):
+        with self.client as c:
+
+            resp = c.get("/api/years/2200,2201")
+
+            self.assertEqual(resp.status_code, 404)